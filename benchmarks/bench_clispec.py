@@ -0,0 +1,56 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Benchmarks of CLI specification parsing and argument building'''
+
+import os
+
+import pytest
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.clispec import parse
+from .conftest import SPEC_FILES
+
+
+@pytest.mark.benchmark(group='clispec.parse')
+@pytest.mark.parametrize('path', SPEC_FILES, ids=os.path.basename)
+def bench_parse(benchmark, path):
+    spec = benchmark(parse, path)
+    assert spec.cmds
+
+
+@pytest.mark.benchmark(group='SVCCommand.process_args')
+def bench_process_args_listing(benchmark, svc_spec):
+    cmd = svc_spec.svcinfo.lsvdisk
+    kwargs = {'filtervalue': 'mdisk_grp_name=pool*', 'bytes': True}
+    args, _ = benchmark(cmd.process_args, kwargs)
+    assert '-filtervalue' in args
+
+
+@pytest.mark.benchmark(group='SVCCommand.process_args')
+def bench_process_args_task(benchmark, svc_spec):
+    cmd = svc_spec.svctask.mkvdisk
+    kwargs = {'name': 'volume with space', 'mdiskgrp': 'pool0', 'iogrp': 0,
+              'size': 100, 'unit': 'gb', 'rsize': '2%', 'autoexpand': True,
+              'warning': '80%', 'easytier': 'on', 'cache': 'readwrite'}
+    args, _ = benchmark(cmd.process_args, kwargs)
+    assert '-mdiskgrp' in args
+
+
+@pytest.mark.benchmark(group='UnifiedSSHClient.__getattr__')
+def bench_command_lookup(benchmark, svc_spec):
+    conn = UnifiedSSHClient()
+    conn.specification = svc_spec
+    proxy = benchmark(lambda: conn.svcinfo.lsvdisk)
+    assert proxy.referent is svc_spec.svcinfo.lsvdisk
@@ -0,0 +1,84 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Benchmarks of bulk provisioning of volumes and host mappings against the
+   local fake SVC, which returns METADATA_RC_BUSY on a share of the commands.
+   The throughput of every round is reported in extra_info as
+   ops_per_second. The volumes are created by mkvdisk, since the CLI
+   specification of the fake SVC predates mkvolume.'''
+
+import itertools
+
+import pytest
+from pysvc.unified.client import connect
+from pysvc.unified.fakeserver import FakeSVCServer, Inventory
+from pysvc.unified.provision import AdaptiveBackoff, provision
+from pysvc.unified.retry import METADATA_RC_BUSY
+
+VOLUMES = 200
+HOSTS = 4
+BUSY_PROBABILITY = (0.0, 0.1)
+
+
+@pytest.fixture(scope='module')
+def server():
+    with FakeSVCServer(inventory=Inventory(vdisks=0, hosts=HOSTS, pools=2),
+                       seed=0) as s:
+        yield s
+
+
+@pytest.mark.benchmark(group='provision')
+@pytest.mark.parametrize('busy', BUSY_PROBABILITY,
+                         ids=['idle', 'busy'])
+def bench_provision(benchmark, server, busy):
+    svc = server.svc
+    with svc.lock:
+        del svc.faults[:]
+    if busy:
+        svc.inject(r'^mkvdisk(hostmap)?\b',
+                   rc=METADATA_RC_BUSY,
+                   message='CMMVC6527E The command cannot be initiated '
+                           'because the system is busy.',
+                   probability=busy)
+    conn = connect(server.host, port=server.port, username=server.username,
+                   password=server.password)
+    rounds = itertools.count()
+    rates = []
+
+    def setup():
+        prefix = 'b%s_%d_' % (int(busy * 100), next(rounds))
+        names = [prefix + str(i) for i in range(VOLUMES)]
+        volumes = [dict(name=n, mdiskgrp='pool%d' % (i % 2), iogrp=0,
+                        size=1, unit='gb') for i, n in enumerate(names)]
+        mappings = [dict(host='host%d' % (i % HOSTS), vdisk=n)
+                    for i, n in enumerate(names)]
+        return (conn, volumes, mappings), {}
+
+    def run(client, volumes, mappings):
+        report = provision(client, volumes, mappings, max_attempts=20,
+                           volume_command='mkvdisk',
+                           backoff=AdaptiveBackoff(initial=0.01, maximum=0.2))
+        rates.append(report.ops_per_second)
+        return report
+
+    try:
+        report = benchmark.pedantic(run, setup=setup, rounds=3)
+    finally:
+        conn.close()
+    assert report.ok, report.failed[:3]
+    assert len(report.succeeded) == 2 * VOLUMES
+    assert bool(report.retries) == bool(busy)
+    benchmark.extra_info['ops_per_second'] = max(rates)
+    benchmark.extra_info['retries'] = report.retries
@@ -0,0 +1,59 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Benchmarks of CLI response parsing'''
+
+import pytest
+from pysvc.unified.response import CLIResponse
+from .conftest import ROW_COUNTS, lsvdisk_output, lsvdisk_detail_output
+
+KWARGS = {'delim': ','}
+# as_single_element merges all rows, which is too slow for 100k rows to run
+# by default
+SINGLE_ELEMENT_COUNTS = [
+    pytest.param(n, marks=pytest.mark.slow) if n > 10000 else n
+    for n in ROW_COUNTS]
+
+
+@pytest.mark.benchmark(group='CLIResponse.parse')
+@pytest.mark.parametrize('rows', ROW_COUNTS)
+def bench_parse(benchmark, rows):
+    output = lsvdisk_output(rows).encode()
+    resp = benchmark(CLIResponse, (output, b''), KWARGS)
+    assert len(resp.result) == rows
+
+
+@pytest.mark.benchmark(group='CLIResponse.parse')
+def bench_parse_detail(benchmark):
+    output = lsvdisk_detail_output(8).encode()
+    resp = benchmark(CLIResponse, (output, b''), dict(KWARGS,
+                                                      with_header=False))
+    assert len(resp.result) == 9
+
+
+@pytest.mark.benchmark(group='CLIResponse.as_dict')
+@pytest.mark.parametrize('rows', ROW_COUNTS)
+def bench_as_dict(benchmark, rows):
+    resp = CLIResponse((lsvdisk_output(rows), ''), KWARGS)
+    result = benchmark(resp.as_dict, 'name')
+    assert len(result) == rows
+
+
+@pytest.mark.benchmark(group='CLIResponse.as_single_element')
+@pytest.mark.parametrize('rows', SINGLE_ELEMENT_COUNTS)
+def bench_as_single_element(benchmark, rows):
+    resp = CLIResponse((lsvdisk_output(rows), ''), KWARGS)
+    result = benchmark.pedantic(lambda: resp.as_single_element, rounds=3)
+    assert len(result.name) == rows
@@ -0,0 +1,41 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Benchmarks of SCP receiving'''
+
+import pytest
+from pysvc.unified.scp_cli_client import ScpClient
+from .conftest import FakeScpTransport
+
+MB = 1024 * 1024
+
+
+def iostats_dump(size):
+    line = b'<vdsk idx="%d" ro="1024" wo="2048" rb="8192" wb="16384"/>\n'
+    lines, total, i = [], 0, 0
+    while total < size:
+        lines.append(line % i)
+        total += len(lines[-1])
+        i += 1
+    return b''.join(lines)[:size]
+
+
+@pytest.mark.benchmark(group='ScpClient.receive')
+@pytest.mark.parametrize('size', [1 * MB, 4 * MB, 16 * MB],
+                         ids=['1MB', '4MB', '16MB'])
+def bench_receive(benchmark, size):
+    client = ScpClient(FakeScpTransport(iostats_dump(size)))
+    data = benchmark(client.receive, '/dumps/iostats/Nv_stats')
+    assert len(data) == size
@@ -0,0 +1,40 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Benchmarks of small commands through a channel per command and through a
+   persistent shell session, against the local fake SVC'''
+
+import pytest
+from pysvc.unified.client import connect
+from pysvc.unified.fakeserver import FakeSVCServer, Inventory
+
+
+@pytest.fixture(scope='module')
+def server():
+    with FakeSVCServer(inventory=Inventory(vdisks=100)) as s:
+        yield s
+
+
+@pytest.mark.benchmark(group='send_command.lsvdisk_object')
+@pytest.mark.parametrize('shell_session', [False, True],
+                         ids=['exec', 'shell'])
+def bench_lsvdisk_object(benchmark, server, shell_session):
+    conn = connect(server.host, port=server.port, username=server.username,
+                   password=server.password, shell_session=shell_session)
+    try:
+        resp = benchmark(conn.svcinfo.lsvdisk, object='7')
+        assert resp.as_single_element.name == 'vdisk7'
+    finally:
+        conn.close()
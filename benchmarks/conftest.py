@@ -0,0 +1,94 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Synthetic fixtures of benchmarks'''
+
+import glob
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNIFIED = os.path.join(ROOT, 'pysvc', 'unified')
+SPEC_FILES = sorted(
+    glob.glob(os.path.join(UNIFIED, 'tests', 'response', 'svc-*.xml')) +
+    [os.path.join(UNIFIED, 'xsf-1.0.xml')])
+SVC_SPEC = os.path.join(UNIFIED, 'tests', 'response', 'svc-6.3.xml')
+ROW_COUNTS = (1000, 10000, 100000)
+LSVDISK_HEADER = ('id,name,IO_group_id,IO_group_name,status,mdisk_grp_id,'
+                  'mdisk_grp_name,capacity,type,FC_id,FC_name,RC_id,RC_name,'
+                  'vdisk_UID,fc_map_count,copy_count,fast_write_state,'
+                  'se_copy_count,compressed_copy_count')
+LSVDISK_ROW = ('%d,vdisk%d,0,io_grp0,online,5,mdiskgrp2,100.00MB,striped,0,'
+               'fcmap0,0,rcrel8,60050768019C0367F%015X,1,1,empty,0,0')
+
+
+def lsvdisk_output(rows):
+    '''Return the output of "lsvdisk -delim ," listing `rows` volumes.'''
+    return '\n'.join([LSVDISK_HEADER] + [LSVDISK_ROW % (i, i, i)
+                                         for i in range(rows)]) + '\n'
+
+
+def lsvdisk_detail_output(copies):
+    '''Return the detailed view of a volume with `copies` copies, which
+       repeats the copy attributes.'''
+    lines = ['id,0', 'name,vdisk0', 'capacity,100.00MB']
+    for i in range(copies):
+        lines.extend(['', 'copy_id,%d' % i, 'status,online', 'sync,yes',
+                      'mdisk_grp_name,mdiskgrp%d' % i])
+    return '\n'.join(lines) + '\n'
+
+
+class FakeScpChannel(object):
+    '''Server side of "scp -f" sending one file. Every acknowledgement of
+       the client releases the next message.'''
+
+    def __init__(self, data):
+        super(FakeScpChannel, self).__init__()
+        self.messages = [b'C0644 %d dump\n' % len(data), data + b'\x00']
+        self.buf = b''
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        pass
+
+    def sendall(self, data):
+        if self.messages:
+            self.buf += self.messages.pop(0)
+
+    def recv(self, size):
+        chunk, self.buf = self.buf[:size], self.buf[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeScpTransport(object):
+    def __init__(self, data):
+        super(FakeScpTransport, self).__init__()
+        self.data = data
+
+    def open_session(self):
+        return FakeScpChannel(self.data)
+
+
+@pytest.fixture(scope='session')
+def svc_spec():
+    from pysvc.unified.clispec import parse
+    return parse(SVC_SPEC)
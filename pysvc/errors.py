@@ -33,8 +33,10 @@ class StorageArrayClientException(Exception):
         if self.my_message:
             response += str(self.my_message)
         if self.original_exception is not None:
-            response += "::" + "::".join(str(ex)
-                                         for ex in self.original_exception)
+            exs = self.original_exception
+            if not isinstance(exs, (list, tuple)):
+                exs = [exs]
+            response += "::" + "::".join(str(ex) for ex in exs)
 
         return response
 
@@ -199,6 +201,14 @@ class ConnectionTimedoutException(UnableToConnectException):
     pass
 
 
+class CommandTimeoutError(ConnectionTimedoutException):
+    """
+    Raised when a command does not complete in time. Only the channel of
+    the command is closed, and the connection is kept.
+    """
+    pass
+
+
 class ProtocolMismatchException(UnableToConnectException):
     pass
 
@@ -0,0 +1,339 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+"""
+Instrumentation of CLI calls
+
+The client emits a :py:class:`.Span` for every stage of a CLI call:
+
+* command: :py:meth:`pysvc.unified.clispec.CLICommand.__call__`, including
+  the retries and parsing.
+* client.send:
+  :py:meth:`pysvc.unified.client.UnifiedSSHClient.send_raw_command`.
+* transport.open, transport.exec and transport.transfer: opening the SSH
+  channel, starting the command and reading its output in
+  :py:meth:`pysvc.transports.ssh_transport.SSHTransport.send_command`. The
+  transfer includes the remote execution, and its "first_byte" mark tells
+  when the output starts.
+* response.parse: the constructor of
+  :py:class:`pysvc.unified.response.CLIResponse`.
+
+and an event for every retry. Nothing is measured unless a listener is
+registered.
+
+Example:
+
+>>> from pysvc import instrumentation
+>>> histograms = instrumentation.HistogramAggregator()
+>>> instrumentation.add_listener(histograms)
+>>> conn.svcinfo.lsvdisk()
+>>> histograms.stats()[('transport.transfer', 'lsvdisk')]
+{'count': 1, 'errors': 0, 'bytes': 2048, 'sum': 0.12, 'max': 0.12,
+ 'p50': 0.12, 'p95': 0.12, 'p99': 0.12}
+"""
+
+import bisect
+import threading
+import time
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+
+__all__ = ['add_listener', 'remove_listener', 'span', 'event', 'Listener',
+           'Span', 'HistogramAggregator']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+# upper bounds of latency buckets in seconds, from 0.5ms to about 2 minutes
+DEFAULT_BUCKETS = tuple(0.0005 * 2 ** i for i in range(19))
+
+# replaced, not modified, so the hot path reads it without lock
+_listeners = ()
+_listeners_lock = threading.Lock()
+_local = threading.local()
+
+
+def add_listener(listener):
+    '''Register a listener of spans and events.
+
+    :param listener: The listener.
+    :type listener: :py:class:`.Listener`
+    '''
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener):
+    global _listeners
+    with _listeners_lock:
+        _listeners = tuple(lsn for lsn in _listeners if lsn is not listener)
+
+
+def enabled():
+    return bool(_listeners)
+
+
+def command_name(cmd):
+    '''Return the CLI name (e.g. "lsvdisk") of a command line, or "batch"
+       for the commands sent by :py:class:`pysvc.unified.batch.Batch`.'''
+    if not cmd:
+        return None
+    parts = [p for p in cmd.split(';') if not p.lstrip().startswith('echo ')]
+    if len(parts) > 1:
+        return 'batch'
+    # pysvc.unified.clispec imports this module
+    from pysvc.unified.clispec import command_name as cli_name
+    return cli_name(parts[0] if parts else cmd) or None
+
+
+class Listener(object):
+    '''Base class of listeners.'''
+
+    def on_span(self, span):
+        '''Called when a span ends.'''
+        pass
+
+    def on_event(self, name, command, host, attrs):
+        '''Called for a point in time event, e.g. "retry".'''
+        pass
+
+
+def _notify(method, *args):
+    for listener in _listeners:
+        try:
+            getattr(listener, method)(*args)
+        except Exception:
+            xlog.exception('The instrumentation listener %r failed.' %
+                           listener)
+
+
+class Span(object):
+    '''The timing of a stage of CLI call.
+
+    * name: The stage, e.g. "transport.transfer".
+    * command: The CLI name, e.g. "lsvdisk", inherited from the enclosing
+      span if not given.
+    * host: The storage array, inherited like command, and passed to the
+      enclosing spans without host.
+    * duration: The elapsed seconds.
+    * error: The exception raised in the span, or None.
+    * attrs: The other measurements, e.g. "bytes".
+    '''
+
+    __slots__ = ('name', 'cmd', '_command', 'host', 'start', 'end', 'error',
+                 'attrs', 'parent')
+
+    def __init__(self, name, cmd=None, host=None):
+        self.name = name
+        self.cmd = cmd
+        self._command = None
+        self.host = host
+        self.start = self.end = None
+        self.error = None
+        self.attrs = {}
+        self.parent = None
+
+    @property
+    def command(self):
+        if self._command is None:
+            if self.cmd is not None:
+                self._command = command_name(self.cmd)
+            elif self.parent is not None:
+                self._command = self.parent.command
+        return self._command
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def mark(self, name):
+        '''Record the seconds elapsed since the start as attribute.'''
+        self.attrs[name] = time.time() - self.start
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        if stack:
+            self.parent = stack[-1]
+            if self.host is None:
+                self.host = self.parent.host
+            else:
+                # e.g. the command span learns the host from the client
+                for sp in reversed(stack):
+                    if sp.host is not None:
+                        break
+                    sp.host = self.host
+        stack.append(self)
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.end = time.time()
+        self.error = exc_value
+        _local.stack.pop()
+        _notify('on_span', self)
+
+
+class _NoopSpan(object):
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def mark(self, name):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        pass
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def span(name, cmd=None, host=None):
+    '''Return a context manager measuring a stage, which is a no-op if no
+       listener is registered.
+
+    :param name: The stage.
+    :type name: str
+    :param cmd: (optional) The command line or CLI name.
+    :type cmd: str
+    :param host: (optional) The storage array.
+    :type host: str
+    '''
+    if not _listeners:
+        return NOOP_SPAN
+    return Span(name, cmd, host)
+
+
+def event(name, cmd=None, host=None, **attrs):
+    '''Emit a point in time event, e.g. "retry".'''
+    if not _listeners:
+        return
+    parent = getattr(_local, 'stack', None)
+    parent = parent[-1] if parent else None
+    command = command_name(cmd) if cmd else (
+        parent.command if parent is not None else None)
+    if host is None and parent is not None:
+        host = parent.host
+    _notify('on_event', name, command, host, attrs)
+
+
+class _Histogram(object):
+    def __init__(self, buckets):
+        super(_Histogram, self).__init__()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.bytes = 0
+
+    def add(self, value, error=False, nbytes=0):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        if error:
+            self.errors += 1
+        self.bytes += nbytes
+
+    def quantile(self, q):
+        '''Estimate the quantile by linear interpolation in its bucket.'''
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = self.buckets[i - 1] if i else 0.0
+                high = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, low + (high - low) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'sum': self.sum,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class HistogramAggregator(Listener):
+    '''Keep a latency histogram and the error and byte counts per stage and
+       command, and the event counts.
+
+    :param buckets: (optional) The sorted upper bounds of buckets in
+                    seconds.
+    :type buckets: tuple
+    :param by_host: (optional) Indicates whether to keep the storage array
+                    in keys, it is False by default.
+    :type by_host: bool
+    '''
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, by_host=False):
+        super(HistogramAggregator, self).__init__()
+        self.buckets = tuple(buckets)
+        self.by_host = by_host
+        self.histograms = {}
+        self.events = {}
+        self.lock = threading.Lock()
+
+    def _key(self, name, command, host):
+        return (name, command, host) if self.by_host else (name, command)
+
+    def on_span(self, span):
+        key = self._key(span.name, span.command, span.host)
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = _Histogram(self.buckets)
+            hist.add(span.duration, span.error is not None,
+                     span.attrs.get('bytes', 0))
+
+    def on_event(self, name, command, host, attrs):
+        key = self._key(name, command, host)
+        with self.lock:
+            self.events[key] = self.events.get(key, 0) + 1
+
+    def stats(self):
+        '''Return the statistics keyed by (stage, command), or by (stage,
+           command, host) if by_host is set.'''
+        with self.lock:
+            return dict((k, h.as_dict()) for k, h in self.histograms.items())
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.events.clear()
@@ -0,0 +1,332 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+"""
+OpenMetrics exporter of client-side metrics
+
+The exporter listens to :py:mod:`pysvc.instrumentation` and publishes, per
+storage array and command:
+
+* pysvc_cli_duration_seconds: the latency histogram of every stage, e.g.
+  stage="client.send".
+* pysvc_cli_errors_total and pysvc_cli_bytes_total: the failures and the
+  bytes transferred per stage.
+* pysvc_retries_total and pysvc_reconnects_total.
+
+and samples the tracked connections at every scrape:
+
+* pysvc_cache_*: the hits, misses, hit ratio, size and evictions of
+  :py:class:`pysvc.unified.cache.CommandCache`.
+* pysvc_admission_*: the occupancy, queue length and queue wait time of
+  :py:class:`pysvc.unified.limiter.AdmissionLimiter`.
+
+Example:
+
+>>> from pysvc.metrics import MetricsExporter
+>>> exporter = MetricsExporter().install()
+>>> exporter.track(conn)
+>>> exporter.serve(9464)  # GET http://127.0.0.1:9464/metrics
+>>> # or for the textfile collector of node exporter
+>>> exporter.start_textfile('/var/lib/node_exporter/pysvc.prom')
+"""
+
+import os
+import tempfile
+import threading
+import weakref
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc import instrumentation
+
+__all__ = ['MetricsExporter']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+CONTENT_TYPE_OPENMETRICS = ('application/openmetrics-text; version=1.0.0; '
+                            'charset=utf-8')
+CONTENT_TYPE_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+EVENT_METRICS = {
+    'retry': ('pysvc_retries', 'The retries of transient CLI failures.'),
+    'reconnect': ('pysvc_reconnects', 'The reconnections of SSH transport.'),
+}
+
+
+def escape_label(value):
+    if isinstance(value, float):
+        value = format_value(value)
+    return ('' if value is None else str(value)).replace(
+        '\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class _Family(object):
+    '''Samples of a metric family.'''
+
+    def __init__(self, name, kind, help_, unit=''):
+        super(_Family, self).__init__()
+        self.name = name
+        self.kind = kind
+        self.help = help_
+        self.unit = unit
+        self.samples = []
+
+    def add(self, suffix, labels, value):
+        self.samples.append((suffix, labels, value))
+
+    def render(self, openmetrics=True):
+        lines = []
+        # Prometheus text format names a counter with its suffix "_total"
+        name = (self.name + '_total' if self.kind == 'counter'
+                and not openmetrics else self.name)
+        lines.append('# HELP %s %s' % (name, self.help))
+        lines.append('# TYPE %s %s' % (name, self.kind))
+        if self.unit and openmetrics:
+            lines.append('# UNIT %s %s' % (self.name, self.unit))
+        for suffix, labels, value in self.samples:
+            lines.append('%s%s%s %s' % (
+                self.name, suffix, '{%s}' % ','.join(
+                    '%s="%s"' % (k, escape_label(v)) for k, v in labels)
+                if labels else '', format_value(value)))
+        return lines
+
+
+class MetricsExporter(object):
+    '''Export the client-side metrics in OpenMetrics text format.
+
+    :param buckets: (optional) The upper bounds of latency buckets in
+                    seconds.
+    :type buckets: tuple
+    '''
+
+    def __init__(self, buckets=instrumentation.DEFAULT_BUCKETS):
+        super(MetricsExporter, self).__init__()
+        self.aggregator = instrumentation.HistogramAggregator(
+            buckets, by_host=True)
+        self.clients = weakref.WeakSet()
+        self.lock = threading.Lock()
+        self.server = None
+        self.textfile_thread = None
+        self.stopping = threading.Event()
+
+    def install(self):
+        '''Start listening to the instrumentation.'''
+        instrumentation.add_listener(self.aggregator)
+        return self
+
+    def uninstall(self):
+        instrumentation.remove_listener(self.aggregator)
+
+    def track(self, client):
+        '''Sample the cache and limiter of the connection at every scrape
+           until it is garbage collected.
+
+        :param client: The connection.
+        :type client: :py:class:`pysvc.unified.client.UnifiedSSHClient`
+        '''
+        with self.lock:
+            self.clients.add(client)
+
+    def collect(self):
+        '''Return the metric families.'''
+        families = []
+        families.extend(self._collect_spans())
+        families.extend(self._collect_events())
+        families.extend(self._collect_clients())
+        return families
+
+    def _collect_spans(self):
+        duration = _Family('pysvc_cli_duration_seconds', 'histogram',
+                           'The latency of CLI call stages.', 'seconds')
+        errors = _Family('pysvc_cli_errors', 'counter',
+                         'The failed CLI call stages.')
+        nbytes = _Family('pysvc_cli_bytes', 'counter',
+                         'The bytes of CLI output per stage.', 'bytes')
+        agg = self.aggregator
+        with agg.lock:
+            items = sorted(((k, h) for k, h in agg.histograms.items()),
+                           key=lambda kh: tuple(str(x) for x in kh[0]))
+            for (stage, command, host), hist in items:
+                labels = [('host', host), ('command', command),
+                          ('stage', stage)]
+                cumulative = 0
+                for le, n in zip(agg.buckets + (float('inf'),),
+                                 hist.counts):
+                    cumulative += n
+                    duration.add('_bucket', labels + [('le', le)],
+                                 cumulative)
+                duration.add('_count', labels, hist.count)
+                duration.add('_sum', labels, hist.sum)
+                errors.add('_total', labels, hist.errors)
+                if hist.bytes:
+                    nbytes.add('_total', labels, hist.bytes)
+        return [duration, errors, nbytes]
+
+    def _collect_events(self):
+        families = dict((k, _Family(name, 'counter', help_))
+                        for k, (name, help_) in EVENT_METRICS.items())
+        other = _Family('pysvc_events', 'counter',
+                        'The other instrumentation events.')
+        agg = self.aggregator
+        with agg.lock:
+            for (name, command, host), n in sorted(
+                    agg.events.items(),
+                    key=lambda kv: tuple(str(x) for x in kv[0])):
+                labels = [('host', host), ('command', command)]
+                if name in families:
+                    families[name].add('_total', labels, n)
+                else:
+                    other.add('_total', labels + [('event', name)], n)
+        return [families[k] for k in sorted(families)] + [other]
+
+    def _collect_clients(self):
+        hits = _Family('pysvc_cache_hits', 'counter',
+                       'The responses served from cache.')
+        misses = _Family('pysvc_cache_misses', 'counter',
+                         'The cache lookups sent to storage array.')
+        ratio = _Family('pysvc_cache_hit_ratio', 'gauge',
+                        'The ratio of cache hits to lookups.')
+        size = _Family('pysvc_cache_size_bytes', 'gauge',
+                       'The estimated memory held by cache.', 'bytes')
+        evictions = _Family('pysvc_cache_evictions', 'counter',
+                            'The responses evicted from cache.')
+        in_flight = _Family('pysvc_admission_in_flight', 'gauge',
+                            'The commands in flight to storage array.')
+        capacity = _Family('pysvc_admission_max_in_flight', 'gauge',
+                           'The max commands in flight to storage array.')
+        queued = _Family('pysvc_admission_queued', 'gauge',
+                         'The commands waiting for admission.')
+        waited = _Family('pysvc_admission_wait_seconds', 'counter',
+                         'The time waiting for admission.', 'seconds')
+        caches, limiters = {}, {}
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            host = getattr(client.transport, 'host', None)
+            if client.cache is not None:
+                caches.setdefault(host, {})[id(client.cache)] = client.cache
+            if client.limiter is not None:
+                limiters[host] = client.limiter
+        for host in sorted(caches, key=str):
+            labels = [('host', host)]
+            values = list(caches[host].values())
+            h = sum(c.hits for c in values)
+            m = sum(c.misses for c in values)
+            hits.add('_total', labels, h)
+            misses.add('_total', labels, m)
+            ratio.add('', labels, float(h) / (h + m) if h + m else 0.0)
+            size.add('', labels, sum(c.size for c in values))
+            evictions.add('_total', labels, sum(c.evictions for c in values))
+        for host in sorted(limiters, key=str):
+            labels = [('host', host)]
+            stats = limiters[host].stats()
+            in_flight.add('', labels, stats.pop('in_flight'))
+            capacity.add('', labels, limiters[host].max_in_flight)
+            for lane in sorted(stats):
+                lane_labels = labels + [('lane', lane)]
+                queued.add('', lane_labels, stats[lane]['queued'])
+                waited.add('_total', lane_labels, stats[lane]['wait_total'])
+        return [hits, misses, ratio, size, evictions, in_flight, capacity,
+                queued, waited]
+
+    def render(self, openmetrics=True):
+        '''Return the metrics in OpenMetrics text format, or in Prometheus
+           text format 0.0.4 if openmetrics is False.'''
+        lines = []
+        for family in self.collect():
+            lines.extend(family.render(openmetrics))
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        '''Write the metrics in Prometheus text format atomically, e.g. for
+           the textfile collector of node exporter.'''
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix='.pysvc', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.render(openmetrics=False))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def start_textfile(self, path, interval=15.0):
+        '''Write the metrics to path every interval seconds in a background
+           thread.'''
+        def run():
+            while not self.stopping.wait(interval):
+                try:
+                    self.write_textfile(path)
+                except Exception:
+                    xlog.exception('Fail to write metrics to %s.' % path)
+        self.write_textfile(path)
+        self.textfile_thread = threading.Thread(target=run)
+        self.textfile_thread.daemon = True
+        self.textfile_thread.start()
+
+    def serve(self, port=9464, addr='127.0.0.1'):
+        '''Serve the metrics through HTTP in a background thread.
+
+        :return: The listening port.
+        :rtype: int
+        '''
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in \
+                    self.headers.get('Accept', '')
+                body = exporter.render(openmetrics).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE_OPENMETRICS
+                                 if openmetrics else CONTENT_TYPE_PROMETHEUS)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                xlog.debug(format % args)
+
+        self.server = ThreadingHTTPServer((addr, port), Handler)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self.server.server_address[1]
+
+    def close(self):
+        '''Stop serving and writing, and stop listening.'''
+        self.stopping.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.textfile_thread is not None:
+            self.textfile_thread.join(5)
+            self.textfile_thread = None
+        self.uninstall()
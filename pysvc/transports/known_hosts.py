@@ -0,0 +1,217 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+"""
+Known hosts store shared by the SSH transports in process
+
+A known hosts file is read once by the first
+:py:class:`pysvc.transports.ssh_transport.SSHTransport` checking host keys
+against it. The host keys added by connections are kept in memory, and
+written in batches after a short delay, and when the process exits. A
+batch is merged with the file under a lock file, so the processes
+sharing the file do not lose the keys added by each other, and the file
+is replaced atomically.
+"""
+
+import atexit
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.transports.ssh_transport import import_paramiko
+
+try:
+    import fcntl
+except ImportError:
+    # no lock between processes, e.g. on Windows
+    fcntl = None
+
+__all__ = ['KnownHostsStore', 'KnownHostsPolicy', 'get_known_hosts']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+paramiko = import_paramiko()
+
+# seconds to wait for more host keys before writing the file
+DEFAULT_FLUSH_DELAY = 1.0
+
+
+@contextmanager
+def _file_lock(path):
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class KnownHostsStore(object):
+    '''The host keys of a known hosts file.
+
+    :param path: The known hosts file.
+    :type path: str
+    :param flush_delay: (optional) The seconds to wait for more host keys
+                        before writing the file.
+    :type flush_delay: float
+    '''
+
+    def __init__(self, path, flush_delay=DEFAULT_FLUSH_DELAY):
+        super(KnownHostsStore, self).__init__()
+        self.path = path
+        self.flush_delay = flush_delay
+        self.host_keys = None
+        self.pending = []
+        self.timer = None
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.loads = 0
+        self.flushes = 0
+
+    def load(self):
+        '''Read the file unless it is read.
+
+        :raise IOError: if the file cannot be read.
+        '''
+        with self.lock:
+            if self.host_keys is None:
+                host_keys = paramiko.HostKeys()
+                if os.path.isfile(self.path):
+                    host_keys.load(self.path)
+                self.host_keys = host_keys
+                self.loads += 1
+
+    def lookup(self, hostname, key_type):
+        '''Return the known key of the host, or None.'''
+        self.load()
+        with self.lock:
+            keys = self.host_keys.lookup(hostname)
+            return keys.get(key_type) if keys is not None else None
+
+    def add(self, hostname, key):
+        '''Add a host key, which is written to the file in the next
+           batch.'''
+        self.load()
+        with self.lock:
+            self.host_keys.add(hostname, key.get_name(), key)
+            self.pending.append((hostname, key))
+            if self.timer is None:
+                self.timer = threading.Timer(self.flush_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        '''Write the pending host keys to the file now.'''
+        with self.flush_lock:
+            with self.lock:
+                pending, self.pending = self.pending, []
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+            if not pending:
+                return
+            try:
+                on_disk = self._write(pending)
+            except (IOError, OSError) as ex:
+                xlog.warning('Fail to save known hosts to %s: %s' %
+                             (self.path, ex))
+                with self.lock:
+                    self.pending[:0] = pending
+                return
+            with self.lock:
+                # learn the host keys added by the other processes
+                for hostname in on_disk.keys():
+                    for key_type, key in on_disk[hostname].items():
+                        keys = self.host_keys.lookup(hostname)
+                        if keys is None or key_type not in keys:
+                            self.host_keys.add(hostname, key_type, key)
+                self.flushes += 1
+
+    def _write(self, pending):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with _file_lock(self.path + '.lock'):
+            host_keys = paramiko.HostKeys()
+            mode = 0o644
+            if os.path.isfile(self.path):
+                host_keys.load(self.path)
+                mode = os.stat(self.path).st_mode & 0o777
+            for hostname, key in pending:
+                host_keys.add(hostname, key.get_name(), key)
+            fd, tmp = tempfile.mkstemp(prefix='.xsf_known_hosts',
+                                       dir=directory)
+            try:
+                os.close(fd)
+                host_keys.save(tmp)
+                os.chmod(tmp, mode)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        return host_keys
+
+
+class KnownHostsPolicy(object):
+    '''The paramiko policy checking the host key against a store.
+
+    :param store: The known hosts.
+    :type store: :py:class:`.KnownHostsStore`
+    :param auto_add: (optional) Indicates whether to add the key of an
+                     unknown host, or reject it.
+    :type auto_add: bool
+    '''
+
+    def __init__(self, store, auto_add=True):
+        super(KnownHostsPolicy, self).__init__()
+        self.store = store
+        self.auto_add = auto_add
+
+    def missing_host_key(self, client, hostname, key):
+        known = self.store.lookup(hostname, key.get_name())
+        if known is None:
+            if not self.auto_add:
+                raise paramiko.SSHException(
+                    'Server %r not found in known_hosts' % hostname)
+            xlog.debug('Add %s host key for %s.' % (key.get_name(), hostname))
+            self.store.add(hostname, key)
+        elif known != key:
+            raise paramiko.BadHostKeyException(hostname, key, known)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_known_hosts(path):
+    '''Return the store of the known hosts file shared in process.'''
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = KnownHostsStore(path)
+        return store
+
+
+@atexit.register
+def flush_all():
+    '''Write the pending host keys of all stores.'''
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
@@ -14,16 +14,9 @@
 # limitations under the License.
 ##############################################################################
 
-from paramiko.ssh_exception import SSHException
 from pysvc.transports.transport import CommonTransport
-from paramiko import PKey
-from paramiko import SSHClient
-from paramiko.ssh_exception import PasswordRequiredException
-from paramiko.ssh_exception import PartialAuthentication
-from paramiko.ssh_exception import BadHostKeyException
-from paramiko.ssh_exception import BadAuthenticationType
-from paramiko.ssh_exception import AuthenticationException
 from pysvc.errors import ConnectionTimedoutException
+from pysvc.errors import CommandTimeoutError
 from pysvc.errors import TransportMessages
 from pysvc.errors import IncorrectCredentials
 from pysvc.errors import BadAuthenticationTypeException
@@ -35,15 +28,206 @@ from pysvc.errors import UnableToConnectException
 from logging import getLogger
 from contextlib import contextmanager
 from pysvc import PYSVC_DEFAULT_LOGGER
-import paramiko
+from pysvc.instrumentation import span, event
+import hashlib
 import socket
 import os
+import threading
+import uuid
 import warnings
-warnings.filterwarnings('ignore', category=DeprecationWarning)
 
+# paramiko takes most of the import time of pysvc, it is imported by the
+# first SSHTransport instead
+paramiko = None
 
 xlog = getLogger(PYSVC_DEFAULT_LOGGER)
 
+# the private keys read from files, keyed by the file, its modification
+# time and size, and a digest of passphrase, which saves reading and
+# decrypting a key file per connection
+_pkeys = {}
+_pkeys_lock = threading.Lock()
+# the authentication method which succeeds per (host, port, user)
+_auth_methods = {}
+
+
+def import_paramiko():
+    '''Import paramiko, ignoring its deprecation warnings.'''
+    global paramiko
+    if paramiko is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            import paramiko as module
+        paramiko = module
+    return paramiko
+
+
+def _read_private_key(filename, passphrase=None):
+    if hasattr(paramiko.PKey, 'from_path'):
+        if isinstance(passphrase, str):
+            passphrase = passphrase.encode()
+        return paramiko.PKey.from_path(filename, passphrase)
+    # paramiko before 3.2 reads a key of known type only
+    for name in ('RSAKey', 'ECDSAKey', 'Ed25519Key', 'DSSKey'):
+        cls = getattr(paramiko, name, None)
+        if cls is None:
+            continue
+        try:
+            return cls.from_private_key_file(filename, passphrase)
+        except paramiko.PasswordRequiredException:
+            raise
+        except paramiko.SSHException:
+            continue
+    raise paramiko.SSHException('Unsupported private key: %s' % filename)
+
+
+def load_private_key(filename, passphrase=None):
+    '''Return the private key in a file, which is read once per file content
+       and passphrase, and shared by the transports.
+
+    :raise paramiko.PasswordRequiredException: if the key is encrypted and
+        passphrase is not given.
+    :raise paramiko.SSHException: if the key cannot be read.
+    '''
+    path = os.path.abspath(filename)
+    st = os.stat(path)
+    digest = hashlib.sha256(passphrase.encode()).hexdigest() \
+        if passphrase else None
+    key = (path, st.st_mtime_ns, st.st_size, digest)
+    with _pkeys_lock:
+        pkey = _pkeys.get(key)
+    if pkey is None:
+        pkey = _read_private_key(path, passphrase)
+        with _pkeys_lock:
+            # forget the replaced file
+            for k in [k for k in _pkeys if k[0] == path and k[1:3] !=
+                      key[1:3]]:
+                del _pkeys[k]
+            _pkeys[key] = pkey
+    return pkey
+
+
+def forget_auth_methods():
+    '''Forget the private keys read and the authentication methods which
+       succeed.'''
+    with _pkeys_lock:
+        _pkeys.clear()
+    _auth_methods.clear()
+
+
+class Cancellation(object):
+    '''Close the channel of a command once cancelled, e.g. the slower one of
+       hedged requests. The output read is truncated, so the caller
+       cancelling it discards the result.'''
+
+    def __init__(self):
+        super(Cancellation, self).__init__()
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.channel = None
+
+    def attach(self, channel):
+        with self.lock:
+            self.channel = channel
+            if self.cancelled:
+                channel.close()
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            if self.channel is not None:
+                self.channel.close()
+
+
+class ShellSession(object):
+    '''A shell channel which executes commands one by one, saving the
+       channel setup and the shell startup of every command.
+
+    The output of a command is framed by a unique sentinel echoed after
+    it. The stderr of a command is the data received on stderr until
+    its sentinel, since the shell cannot redirect output to stderr in
+    restricted mode. stdout and stderr are not ordered, so the stderr of a
+    failed command, i.e. whose status is not 0 or whose stdout contains
+    `error_marker`, is waited for up to `STDERR_WAIT` seconds. The late
+    stderr is dropped before the next command.
+
+    :param channel: The channel with a shell started.
+    :type channel: :py:class:`paramiko.Channel`
+    :param error_marker: (optional) The text printed to stdout by a failed
+                         command, e.g. "|| echo <marker> $?" appended.
+    :type error_marker: str
+    '''
+
+    RECV_SIZE = 65536
+    STDERR_WAIT = 1.0
+
+    def __init__(self, channel, error_marker=None):
+        super(ShellSession, self).__init__()
+        self.channel = channel
+        self.error_marker = error_marker.encode() if error_marker else None
+        self.token = 'PYSVC_%s' % uuid.uuid4().hex
+        self.seq = 0
+        self.lock = threading.Lock()
+        self.buffer = b''
+
+    @property
+    def closed(self):
+        return self.channel.closed or self.channel.exit_status_ready()
+
+    def execute(self, command, timeout):
+        '''Execute a command and return its stdout and stderr.
+
+        :raise socket.timeout: if the output is not completed in time.
+        :raise EOFError: if the shell exits.
+        '''
+        channel = self.channel
+        channel.settimeout(timeout)
+        while channel.recv_stderr_ready():
+            xlog.debug('Drop the late stderr: %r' %
+                       channel.recv_stderr(self.RECV_SIZE))
+        self.seq += 1
+        sentinel = ('%s_%d ' % (self.token, self.seq)).encode()
+        channel.sendall(command.encode() + b'\necho ' + sentinel + b'$?\n')
+        while True:
+            # the sentinel is unique, and the output before it may not end
+            # with a newline
+            idx = self.buffer.find(sentinel)
+            end = self.buffer.find(b'\n', idx) if idx >= 0 else -1
+            if end >= 0:
+                break
+            data = channel.recv(self.RECV_SIZE)
+            if not data:
+                raise EOFError('The shell exits.')
+            self.buffer += data
+        stdout = self.buffer[:idx]
+        status = self.buffer[idx + len(sentinel):end].strip()
+        self.buffer = self.buffer[end + 1:]
+        stderr = b''
+        while channel.recv_stderr_ready():
+            stderr += channel.recv_stderr(self.RECV_SIZE)
+        if not stderr and (status != b'0' or (
+                self.error_marker and self.error_marker in stdout)):
+            stderr = self._wait_stderr(
+                min(timeout, self.STDERR_WAIT) if timeout
+                else self.STDERR_WAIT)
+        return stdout, stderr
+
+    def _wait_stderr(self, timeout):
+        channel = self.channel
+        channel.settimeout(timeout)
+        try:
+            stderr = channel.recv_stderr(self.RECV_SIZE)
+        except socket.timeout:
+            xlog.debug('No stderr of the failed command in %s seconds.' %
+                       timeout)
+            return b''
+        while channel.recv_stderr_ready():
+            stderr += channel.recv_stderr(self.RECV_SIZE)
+        return stderr
+
+    def close(self):
+        self.channel.close()
+
 
 class SSHTransport(CommonTransport):
     DEFAULT_SSH_PORT = 22
@@ -59,7 +243,12 @@ class SSHTransport(CommonTransport):
             timeout=30,
             auto_add=True,
             cmd_timeout=30.0,
-            ignore_known_hosts=True):
+            ignore_known_hosts=True,
+            shell_session=False,
+            keepalive=0,
+            auto_reconnect=False,
+            known_hosts_file=None,
+            shell_error_marker=None):
         """
         Constructor for common SSH trasport class.
         pkey        : Key object used to sign and verify SSH2 data;
@@ -70,8 +259,23 @@ class SSHTransport(CommonTransport):
                       whether I should auto add it to known host list and
                       save to a local file;
         cmd_timeout : Timeout valeu for a command to return;
+        shell_session : Whether to execute the commands without stdin input
+                        in a persistent shell, see ShellSession;
+        keepalive   : Interval in seconds to send keepalive packets when
+                      idle, 0 to disable;
+        auto_reconnect : Whether to reconnect before sending a command if
+                         the connection is found dead;
+        known_hosts_file : The known hosts file used unless
+                           ignore_known_hosts, ~/xsf_known_hosts by
+                           default. It is read once and written in
+                           batches by all transports in process, see
+                           pysvc.transports.known_hosts;
+        shell_error_marker : The text printed to stdout by a failed
+                             command, whose stderr is waited for in the
+                             shell session, see ShellSession;
         """
         super(SSHTransport, self).__init__()
+        import_paramiko()
         self.host = host
         self.user = user
         self.password = password
@@ -82,23 +286,31 @@ class SSHTransport(CommonTransport):
         self.cmd_exec_timeout = cmd_timeout
         self.connected_endpoint = None
         self.auto_add_unknown_hosts = auto_add
-        self.transport = SSHClient()
+        self.transport = paramiko.SSHClient()
         self.sftp_client = None
+        self.shell_session = shell_session
+        self.shell_error_marker = shell_error_marker
+        self.session = None
+        self.session_lock = threading.Lock()
+        self.keepalive = keepalive
+        self.auto_reconnect = auto_reconnect
+        self.reconnect_lock = threading.Lock()
         self.is_client_connected = False
         self.is_known_hosts_ignored = ignore_known_hosts
-        self.svc_client_host_keys_file = \
+        self.svc_client_host_keys_file = known_hosts_file or \
             "%s/xsf_known_hosts" % os.path.expanduser("~")
+        self.known_hosts = None
         if self.pkey is not None:
-            if not isinstance(self.pkey, PKey):
+            if not isinstance(self.pkey, paramiko.PKey):
                 xlog.debug(TransportMessages.SSH_INCORRECT_PRIVATE_KEY)
                 raise IncorrectCredentials(
                     message=TransportMessages.SSH_INCORRECT_PRIVATE_KEY)
 
-        if (os.path.isfile(self.svc_client_host_keys_file) and
-                self.is_known_hosts_ignored is False):
+        if self.is_known_hosts_ignored is False:
+            from pysvc.transports.known_hosts import get_known_hosts
+            self.known_hosts = get_known_hosts(self.svc_client_host_keys_file)
             try:
-                self.transport.load_host_keys(
-                    filename=self.svc_client_host_keys_file)
+                self.known_hosts.load()
             except IOError as ex:
                 xlog.debug(ex)
                 raise IncorrectCredentials(
@@ -115,29 +327,30 @@ class SSHTransport(CommonTransport):
 
     @contextmanager
     def _exception_handler(self):
+        errors = paramiko.ssh_exception
         try:
             yield
-        except BadAuthenticationType as ex:
+        except errors.BadAuthenticationType as ex:
             xlog.debug(ex)
             raise BadAuthenticationTypeException(
                 allowed_types=ex.allowed_types, original_exception=ex)
-        except BadHostKeyException as ex:
+        except errors.BadHostKeyException as ex:
             xlog.debug(ex)
             raise BadHostFingerPrintException(
                 hostname=ex.hostname,
                 expected_key=ex.expected_key,
                 presented_key=ex.key,
                 original_exception=ex)
-        except PartialAuthentication as ex:
+        except errors.PartialAuthentication as ex:
             xlog.debug(ex)
             raise PartialAuthenticationException(
                 allowed_types=ex.allowed_types, original_exception=ex)
-        except PasswordRequiredException as ex:
+        except errors.PasswordRequiredException as ex:
             xlog.debug(ex)
             raise PassphraseRequiredException(
                 message=TransportMessages.SSH_PASS_PHRASE_REQUIRED,
                 original_exception=ex)
-        except AuthenticationException as ex:
+        except errors.AuthenticationException as ex:
             xlog.debug(ex)
             raise IncorrectCredentials(
                 message=TransportMessages.SSH_AUTHENTICATION_FAILURE,
@@ -151,7 +364,7 @@ class SSHTransport(CommonTransport):
             xlog.debug(ex)
             raise HostDoesNotExistException(
                 hostname=self.host, original_exception=ex)
-        except (SSHException, socket.error) as ex:
+        except (errors.SSHException, socket.error) as ex:
             xlog.debug(ex)
             raise UnableToConnectException(
                 message=TransportMessages.SSH_UNABLE_TO_CONNECT(
@@ -163,66 +376,247 @@ class SSHTransport(CommonTransport):
         which were set up in constructor.
         """
         with self._exception_handler():
-            if self.auto_add_unknown_hosts:
+            if self.known_hosts is not None:
+                from pysvc.transports.known_hosts import KnownHostsPolicy
+                self.transport.set_missing_host_key_policy(KnownHostsPolicy(
+                    self.known_hosts, self.auto_add_unknown_hosts))
+            elif self.auto_add_unknown_hosts:
                 self.transport.set_missing_host_key_policy(
                     paramiko.AutoAddPolicy())
-            self.transport.connect(
-                self.host,
-                port=self.port,
-                username=self.user,
-                password=self.password,
-                pkey=self.pkey,
-                key_filename=self.private_key,
-                timeout=self.timeout)
+            self._authenticate()
             self.connected_endpoint = self.host
             self.is_client_connected = True
-            if self.is_known_hosts_ignored is False:
-                self.transport.save_host_keys(self.svc_client_host_keys_file)
+            if self.keepalive:
+                self.transport.get_transport().set_keepalive(self.keepalive)
+
+    def _authenticate(self):
+        pkey, key_filename = self.pkey, self.private_key
+        if pkey is None and key_filename:
+            try:
+                pkey = load_private_key(key_filename, self.password)
+                key_filename = None
+            except paramiko.PasswordRequiredException:
+                raise
+            except (paramiko.SSHException, IOError, OSError) as ex:
+                # let paramiko try it
+                xlog.debug('Fail to read private key %s: %s' %
+                           (key_filename, ex))
+        auth_key = (self.host, self.port, self.user)
+        method = _auth_methods.get(auth_key)
+        if (method == 'password' and not self.password) or \
+                (method == 'publickey' and pkey is None):
+            method = None
+        try:
+            self._connect_with(pkey, key_filename, method)
+        except paramiko.AuthenticationException:
+            if method is None:
+                raise
+            # the credentials or the storage array changed
+            xlog.debug('The %s authentication to %s fails, try all.' %
+                       (method, self))
+            _auth_methods.pop(auth_key, None)
+            self.transport.close()
+            self._connect_with(pkey, key_filename, None)
+            method = None
+        if method is None:
+            handler = self.transport.get_transport().auth_handler
+            auth_method = getattr(handler, 'auth_method', None)
+            if auth_method == 'publickey' and pkey is not None and \
+                    getattr(handler, 'private_key', None) is pkey:
+                _auth_methods[auth_key] = 'publickey'
+            elif auth_method == 'password':
+                _auth_methods[auth_key] = 'password'
+
+    def _connect_with(self, pkey, key_filename, method):
+        kwargs = {}
+        if method is not None:
+            # skip the agent and the keys in ~/.ssh tried by default
+            kwargs.update(allow_agent=False, look_for_keys=False)
+        if method == 'password':
+            pkey = key_filename = None
+        self.transport.connect(
+            self.host,
+            port=self.port,
+            username=self.user,
+            password=self.password,
+            pkey=pkey,
+            key_filename=key_filename,
+            timeout=self.timeout,
+            **kwargs)
 
     def is_connected(self):
         return self.is_client_connected
 
+    def is_alive(self):
+        '''Return False if the connection is closed or found dead, e.g. by
+           keepalive.'''
+        if not self.is_client_connected:
+            return False
+        transport = self.transport.get_transport()
+        return transport is not None and transport.is_active()
+
+    def ensure_alive(self):
+        '''Reconnect if the connection is found dead.
+
+        :return: True if it reconnects.
+        :rtype: bool
+        '''
+        if self.is_alive():
+            return False
+        with self.reconnect_lock:
+            # the other threads may have reconnected
+            if self.is_alive():
+                return False
+            xlog.info('The connection to %s is dead, and reconnect.' % self)
+            self.reconnect()
+            return True
+
     def disconnect(self):
         """
         Disconnect from the SSH server.
         """
+        self.close_session()
         if self.is_client_connected:
             self.transport.close()
             self.is_client_connected = False
 
     def reconnect(self):
+        event('reconnect', host=self.host)
         self.disconnect()
         self.connect()
 
+    def clone(self):
+        '''Return a new transport to the same host with the same options
+           except the shell session, which is not connected.'''
+        return SSHTransport(
+            self.host,
+            user=self.user,
+            password=self.password,
+            pkey=self.pkey,
+            pkey_file=self.private_key,
+            port=self.port,
+            timeout=self.timeout,
+            auto_add=self.auto_add_unknown_hosts,
+            cmd_timeout=self.cmd_exec_timeout,
+            ignore_known_hosts=self.is_known_hosts_ignored,
+            keepalive=self.keepalive,
+            auto_reconnect=self.auto_reconnect,
+            known_hosts_file=self.svc_client_host_keys_file)
+
     def send_command(
             self,
             command,
             buf_size=-1,
             raw=False,
             timeout=0,
-            stdin_input=None):
+            stdin_input=None,
+            cancel=None):
+        '''Execute a command in a new channel, or in the shell session.
+
+        :param cancel: (optional) The cancellation closing the channel, which
+                       is ignored in the shell session.
+        :type cancel: :py:class:`.Cancellation`
+        '''
+        if self.auto_reconnect and self.is_client_connected:
+            self.ensure_alive()
+        if self.shell_session and raw and stdin_input is None:
+            result = self._send_in_session(command, timeout)
+            if result is not None:
+                return result
+        channel = None
         with self._exception_handler():
             # return self.transport.exec_command(command)
             try:
-                channel = self.transport.get_transport().open_session()
-                channel.settimeout(timeout or self.cmd_exec_timeout)
-                channel.exec_command(command)
-                stdin = channel.makefile('wb', buf_size)
-                stdout = channel.makefile('rb', buf_size)
-                stderr = channel.makefile_stderr('rb', buf_size)
-                if stdin_input is not None:
-                    stdin.write(stdin_input)
-                    stdin.flush()
-                    # shutdown_write to close write channel, paramiko will send
-                    # EOF to device.
-                    channel.shutdown_write()
-                if raw:  # gain performance without spliting line
-                    return stdin, stdout.read(), stderr.read()
-                return stdin, stdout.readlines(), stderr.readlines()
+                with span('transport.open', command, self.host):
+                    channel = self.transport.get_transport().open_session()
+                    channel.settimeout(timeout or self.cmd_exec_timeout)
+                    if cancel is not None:
+                        cancel.attach(channel)
+                with span('transport.exec', command, self.host):
+                    channel.exec_command(command)
+                    stdin = channel.makefile('wb', buf_size)
+                    stdout = channel.makefile('rb', buf_size)
+                    stderr = channel.makefile_stderr('rb', buf_size)
+                    if stdin_input is not None:
+                        stdin.write(stdin_input)
+                        stdin.flush()
+                        # shutdown_write to close write channel, paramiko
+                        # will send EOF to device.
+                        channel.shutdown_write()
+                with span('transport.transfer', command, self.host) as sp:
+                    if raw:  # gain performance without spliting line
+                        if sp:
+                            out = stdout.read(1)
+                            sp.mark('first_byte')
+                            out += stdout.read()
+                        else:
+                            out = stdout.read()
+                        err = stderr.read()
+                        sp.set(bytes=len(out) + len(err))
+                        return stdin, out, err
+                    return stdin, stdout.readlines(), stderr.readlines()
             except socket.timeout as ex:
-                # Need to reconnect to terminate the remote method call
-                self.reconnect()
-                xlog.error(ex)
-                raise ConnectionTimedoutException(
+                # closing the channel terminates the remote command, and the
+                # other channels of the connection are kept
+                if channel is not None:
+                    channel.close()
+                xlog.error('%s: %s' % (
+                    TransportMessages.SSH_CON_TIMED_OUT_WHEN_EXEC_CMD,
+                    command))
+                raise CommandTimeoutError(
                     message=TransportMessages.SSH_CON_TIMED_OUT_WHEN_EXEC_CMD,
                     original_exception=ex)
+
+    def _send_in_session(self, command, timeout):
+        '''Execute the command in the shell session, or return None if
+           the session is busy with another command.'''
+        with self.session_lock:
+            session = self.session
+            if session is not None and session.closed:
+                session.close()
+                session = None
+            if session is None:
+                with self._exception_handler():
+                    with span('transport.open', command, self.host):
+                        channel = \
+                            self.transport.get_transport().open_session()
+                        channel.invoke_shell()
+                session = self.session = ShellSession(
+                    channel, self.shell_error_marker)
+            if not session.lock.acquire(False):
+                # concurrent commands are executed in their own channels
+                return None
+        try:
+            with self._exception_handler():
+                with span('transport.transfer', command, self.host) as sp:
+                    out, err = session.execute(
+                        command, timeout or self.cmd_exec_timeout)
+                    sp.set(bytes=len(out) + len(err))
+                    return None, out, err
+        except ConnectionTimedoutException as ex:
+            # only the shell is stuck, and the connection is kept
+            self._drop_session(session)
+            raise CommandTimeoutError(
+                message=TransportMessages.SSH_CON_TIMED_OUT_WHEN_EXEC_CMD,
+                original_exception=ex.original_exception)
+        except EOFError as ex:
+            self._drop_session(session)
+            raise UnableToConnectException(
+                message=TransportMessages.SSH_UNABLE_TO_CONNECT(self.host),
+                original_exception=ex)
+        finally:
+            session.lock.release()
+
+    def _drop_session(self, session):
+        with self.session_lock:
+            if self.session is session:
+                self.session = None
+        session.close()
+
+    def close_session(self):
+        '''Close the shell session, a new one is started by the next
+           command.'''
+        with self.session_lock:
+            session, self.session = self.session, None
+        if session is not None:
+            session.close()
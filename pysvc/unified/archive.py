@@ -0,0 +1,257 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Compressed columnar archive for CLI listings and statistics
+
+Each snapshot (a :py:class:`pysvc.unified.response.CLIResponse`, a list of
+dict like rows or a decoded iostats dump) is appended to a data file as one
+zlib compressed chunk per column. A small index file, holding one JSON line
+per snapshot, records the offset and length of every chunk, so reading one
+column across many snapshots only touches the bytes of that column.
+
+Example:
+
+>>> from pysvc.unified.archive import ColumnArchive
+>>> with ColumnArchive('/var/lib/pysvc/lsvdisk.pca') as archive:
+...     archive.append(conn.svcinfo.lsvdisk(bytes=True), label='lsvdisk')
+...     for ts, values in archive.column('capacity', label='lsvdisk'):
+...         print ts, values
+'''
+
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from logging import getLogger
+import pysvc.errors as ce
+from pysvc import PYSVC_DEFAULT_LOGGER
+
+__all__ = ['ColumnArchive', 'ArchiveError']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+INDEX_SUFFIX = '.idx'
+STATS_ELEMENT_COLUMN = 'element'
+
+
+class ArchiveError(ce.StorageArrayClientException):
+    '''Raise if the archive is corrupted or used incorrectly.'''
+    pass
+
+
+class ColumnArchive(object):
+    '''Append-only columnar archive of snapshots.
+
+    :param path: The file name of archive data. The index is kept next to it
+                 with suffix ".idx".
+    :type path: str
+    :param compresslevel: (optional) The zlib compression level,
+                          it is 6 by default.
+    :type compresslevel: int
+    '''
+
+    def __init__(self, path, compresslevel=6):
+        super(ColumnArchive, self).__init__()
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.compresslevel = compresslevel
+        self.lock = threading.Lock()
+        self.entries = []
+        self._data = None
+        self._map = None
+        self._load_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        '''Release the memory map and file handles.'''
+        with self.lock:
+            self._unmap()
+
+    def _load_index(self):
+        from munch import Munch
+        if not os.path.isfile(self.index_path):
+            return
+        with open(self.index_path, 'r') as f:
+            for n, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self.entries.append(Munch(json.loads(line)))
+                except ValueError:
+                    raise ArchiveError(
+                        'The archive index %s is corrupted at line %s.' %
+                        (self.index_path, n + 1))
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def _mapped(self, end):
+        '''Return a read-only memory map covering at least `end` bytes.'''
+        if self._map is None or len(self._map) < end:
+            self._unmap()
+            self._data = open(self.path, 'rb')
+            self._map = mmap.mmap(self._data.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+            if len(self._map) < end:
+                raise ArchiveError(
+                    'The archive data %s is truncated.' % self.path)
+        return self._map
+
+    def append(self, rows, label='', timestamp=None, meta=None):
+        '''Append a snapshot to the archive.
+
+        :param rows: The snapshot, e.g. a
+                     :py:class:`pysvc.unified.response.CLIResponse` or a list
+                     of dict like objects.
+        :param label: (optional) The name to group snapshots, e.g. "lsvdisk".
+        :type label: str
+        :param timestamp: (optional) The time of snapshot in seconds since
+                          epoch, it is the current time by default.
+        :type timestamp: float
+        :param meta: (optional) Extra JSON serializable data of the snapshot.
+        :type meta: dict
+        :return: The id of the snapshot.
+        :rtype: int
+        '''
+        from munch import Munch
+        rows = list(rows)
+        columns = []
+        for row in rows:
+            for k in row:
+                if k not in columns:
+                    columns.append(k)
+        chunks = [(name, zlib.compress(
+            json.dumps([row.get(name) for row in rows]).encode('utf-8'),
+            self.compresslevel)) for name in columns]
+        with self.lock:
+            with open(self.path, 'ab') as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                layout = {}
+                for name, chunk in chunks:
+                    layout[name] = [offset, len(chunk)]
+                    f.write(chunk)
+                    offset += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            entry = Munch(id=len(self.entries), label=label or '',
+                          timestamp=time.time() if timestamp is None
+                          else timestamp,
+                          rows=len(rows), columns=columns, layout=layout,
+                          meta=meta or {})
+            with open(self.index_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.entries.append(entry)
+        return entry.id
+
+    def append_stats(self, tree, label='', timestamp=None):
+        '''Append a decoded iostats dump to the archive.
+
+        Every child element of the root becomes one row holding the element
+        attributes, and the element tag is kept in column "element". The
+        root attributes are kept as the meta-data of snapshot.
+
+        :param tree: The result of
+                     :py:meth:`pysvc.unified.client.UnifiedSSHClient.get_dump_element_tree`
+                     or its root element.
+        :return: The id of the snapshot.
+        :rtype: int
+        '''
+        root = tree.getroot() if hasattr(tree, 'getroot') else tree
+        rows = []
+        for nd in root:
+            row = dict(nd.attrib)
+            row[STATS_ELEMENT_COLUMN] = nd.tag
+            rows.append(row)
+        meta = dict(root.attrib)
+        meta['tag'] = root.tag
+        return self.append(rows, label or root.tag, timestamp, meta)
+
+    def snapshots(self, label=None, since=None, until=None):
+        '''Return the index entries of snapshots matching the conditions.'''
+        return [e for e in self.entries
+                if (label is None or e.label == label)
+                and (since is None or e.timestamp >= since)
+                and (until is None or e.timestamp < until)]
+
+    def _read_chunk(self, entry, name):
+        pos = entry.layout.get(name)
+        if pos is None:
+            return [None] * entry.rows
+        offset, length = pos
+        data = self._mapped(offset + length)[offset:offset + length]
+        try:
+            return json.loads(zlib.decompress(data).decode('utf-8'))
+        except (zlib.error, ValueError):
+            raise ArchiveError(
+                'The column "%s" of snapshot %s is corrupted.' %
+                (name, entry.id))
+
+    def column(self, name, label=None, since=None, until=None):
+        '''Read one column across the matching snapshots.
+
+        Only the chunks of the column are read from the memory-mapped data
+        file; missing cells are None.
+
+        :param name: The column name, e.g. "capacity".
+        :type name: str
+        :return: A generator yielding (timestamp, values) for each snapshot.
+        '''
+        for entry in self.snapshots(label, since, until):
+            with self.lock:
+                values = self._read_chunk(entry, name)
+            yield entry.timestamp, values
+
+    def read(self, snapshot_id, columns=None):
+        '''Read a whole snapshot back as a list of
+           :py:class:`munch.Munch`.
+
+        :param snapshot_id: The id returned by :py:meth:`.append`.
+        :type snapshot_id: int
+        :param columns: (optional) Only read these columns.
+        :type columns: list
+        '''
+        from munch import Munch
+        try:
+            entry = self.entries[snapshot_id]
+        except (IndexError, TypeError):
+            raise ArchiveError('No snapshot %s in the archive.' % snapshot_id)
+        names = entry.columns if columns is None else columns
+        with self.lock:
+            data = [(name, self._read_chunk(entry, name)) for name in names]
+        result = []
+        for i in range(entry.rows):
+            row = Munch()
+            for name, values in data:
+                if values[i] is not None:
+                    row[name] = values[i]
+            result.append(row)
+        return result
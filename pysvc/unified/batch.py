@@ -0,0 +1,246 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Batch of CLI commands sent in one SSH execution
+
+Example:
+
+>>> with conn.batch() as b:
+...     vdisks = b.svcinfo.lsvdisk(bytes=True)
+...     hosts = b.svcinfo.lshost()
+...
+>>> for vdisk in vdisks.response:
+...     print vdisk.name
+'''
+
+from logging import getLogger
+import pysvc.errors as ce
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.unified.clispec import CLISpecError
+
+__all__ = ['Batch', 'BatchResult', 'BatchError']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+TAG_BATCH = 'batch6c0d3e5b9f1a4f6e8b2d7a9c4e1f3b5d'
+DEFAULT_MAX_COMMANDS = 50
+
+
+class BatchError(ce.StorageArrayClientException):
+    '''Raise if the batch is used incorrectly or its output is broken.'''
+    pass
+
+
+class BatchResult(object):
+    '''The deferred response of a command in a batch.
+
+    :py:attr:`response` returns the response object after the batch is sent,
+    or raises the error of this command only.
+    '''
+
+    def __init__(self, command, cmd, extra):
+        super(BatchResult, self).__init__()
+        self.command = command
+        self.cmd = cmd
+        self.extra = extra
+        self.done = False
+        self._response = None
+        self._error = None
+
+    def set_output(self, stdout, stderr):
+        try:
+            self._response = self.command.make_response(
+                (stdout, stderr), self.extra)
+        except Exception as ex:
+            self._error = ex
+        self.done = True
+
+    def set_error(self, error):
+        self._error = error
+        self.done = True
+
+    @property
+    def error(self):
+        '''The error of this command or None.'''
+        return self._error
+
+    @property
+    def response(self):
+        if not self.done:
+            raise BatchError('The batch is not sent yet.')
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+    def __iter__(self):
+        return iter(self.response)
+
+
+class _BatchProxy(object):
+    def __init__(self, referent, batch):
+        super(_BatchProxy, self).__init__()
+        self.referent = referent
+        self.batch = batch
+
+    @property
+    def __doc__(self):
+        return getattr(self.referent, '__doc__', None)
+
+    def __getattr__(self, name):
+        at = getattr(self.referent, name, None)
+        if at is None:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'" %
+                (self.__class__.__name__, name))
+        return _BatchProxy(at, self.batch)
+
+    def __dir__(self):
+        return dir(self.referent)
+
+    def __call__(self, **kwargs):
+        return self.batch.add(self.referent, kwargs)
+
+
+class Batch(object):
+    '''Queue CLI commands and send them in one SSH execution.
+
+    The commands are sent when leaving the `with` block or calling
+    :py:meth:`.send`. Every command keeps its own return code, so the
+    failure of one command does not affect the others. Commands with stdin
+    input are not supported.
+
+    :param client: The connection.
+    :type client: :py:class:`pysvc.unified.client.UnifiedSSHClient`
+    :param max_commands: (optional) The max number of commands sent in one
+                         execution, it is 50 by default.
+    :type max_commands: int
+    '''
+
+    def __init__(self, client, max_commands=DEFAULT_MAX_COMMANDS):
+        super(Batch, self).__init__()
+        self.client = client
+        self.max_commands = max_commands
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.send()
+
+    def __getattr__(self, name):
+        obj = getattr(self.client.specification, name, None)
+        if obj is None:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'" %
+                (self.__class__.__name__, name))
+        return _BatchProxy(obj, self)
+
+    def __dir__(self):
+        return dir(self.client.specification)
+
+    def add(self, command, kwargs):
+        '''Queue a command and return its :py:class:`.BatchResult`.'''
+        cmd, extra, stdin_input = command.build(kwargs)
+        if stdin_input is not None:
+            raise CLISpecError('The stdin input is not supported in batch.')
+        result = BatchResult(command, cmd, extra)
+        self.results.append(result)
+        return result
+
+    def send(self):
+        '''Send the queued commands.
+
+        :return: The results of the sent commands.
+        :rtype: list
+        '''
+        results, self.results = self.results, []
+        for i in range(0, len(results), self.max_commands):
+            self._send(results[i:i + self.max_commands])
+        return results
+
+    def _send(self, results):
+        script = '; '.join('echo %s %d; %s' % (TAG_BATCH, i, r.cmd)
+                           for i, r in enumerate(results))
+        timeout = max([r.extra.get('timeout', 0) for r in results] + [0])
+        try:
+            stdout, stderr = self.client.send_raw_command(
+                script, {'timeout': timeout})
+        except Exception as ex:
+            for r in results:
+                r.set_error(ex)
+            return
+        outputs = split_output(stdout, len(results))
+        if outputs is None:
+            error = BatchError('The output of batch is broken: %s' % stdout)
+            for r in results:
+                r.set_error(error)
+            return
+        failed = [i for i, (r, out) in enumerate(zip(results, outputs))
+                  if r.extra.get('error_tag') and r.extra['error_tag'] in out]
+        errors = split_errors(stderr, len(failed), getattr(
+            self.client.specification, 'errors', None))
+        for i, (r, out) in enumerate(zip(results, outputs)):
+            r.set_output(out, errors[failed.index(i)] if i in failed else '')
+
+
+def split_output(stdout, count):
+    '''Split the stdout of a batch into the outputs of its commands, or
+       return None if any separator is missing.'''
+    if isinstance(stdout, bytes):
+        stdout = stdout.decode()
+    outputs = [None] * count
+    cur = None
+    for line in stdout.splitlines(True):
+        if line.startswith(TAG_BATCH):
+            try:
+                cur = int(line[len(TAG_BATCH):])
+            except ValueError:
+                return None
+            if not 0 <= cur < count or outputs[cur] is not None:
+                return None
+            outputs[cur] = []
+        elif cur is not None:
+            outputs[cur].append(line)
+    if any(out is None for out in outputs):
+        return None
+    return [''.join(out) for out in outputs]
+
+
+def split_errors(stderr, count, prefixes=None):
+    '''Split the stderr of a batch into the error messages of its failed
+       commands.
+
+    The stderr can not be delimited in a restricted shell, so it is split by
+    the lines starting with an error prefix of CLI specification, e.g. CMMV.
+    If the number of errors does not match, every failed command gets the
+    whole stderr.
+    '''
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode()
+    stderr = stderr or ''
+    if count <= 1:
+        return [stderr] * count
+    errors = []
+    for line in stderr.splitlines(True):
+        if not errors or (prefixes and any(
+                line.startswith(p) for p in prefixes if p)):
+            errors.append(line)
+        else:
+            errors[-1] += line
+    if len(errors) != count:
+        return [stderr] * count
+    return errors
@@ -0,0 +1,184 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Circuit breakers of unreachable storage arrays
+
+All the connections to the same storage array share one
+:py:class:`.CircuitBreaker`. After `failure_threshold` consecutive
+connection failures, e.g. timeouts of connect or commands, the breaker
+opens, and the connects and commands to the storage array fail at once
+with :py:class:`.CircuitOpenError` for `cooldown` seconds. Then one probe
+is let through, which closes the breaker if it succeeds, or opens it
+again. The CLI errors returned by the storage array are not failures.
+
+Example:
+
+>>> try:
+...     conn = connect('ip', username='admin', password='password',
+...                    circuit_breaker=True)
+... except CircuitOpenError:
+...     pass  # skip the storage array until it cools down
+'''
+
+import threading
+import time
+from contextlib import contextmanager
+from logging import getLogger
+import pysvc.errors as ce
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.instrumentation import event
+
+__all__ = ['CircuitBreaker', 'CircuitOpenError', 'get_breaker',
+           'forget_breakers']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30.0
+
+
+class CircuitOpenError(ce.UnableToConnectException):
+    '''Raise if the storage array is skipped for its recent failures.'''
+    pass
+
+
+class CircuitBreaker(object):
+    '''Fail fast after consecutive connection failures.
+
+    :param host: (optional) The storage array, for messages.
+    :type host: str
+    :param failure_threshold: (optional) The consecutive failures opening
+                              the breaker, it is 5 by default.
+    :type failure_threshold: int
+    :param cooldown: (optional) The seconds before a probe, it is 30 by
+                     default.
+    :type cooldown: float
+    '''
+
+    def __init__(self, host=None, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 cooldown=DEFAULT_COOLDOWN):
+        super(CircuitBreaker, self).__init__()
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def configure(self, failure_threshold=None, cooldown=None):
+        '''Change the settings which are given.'''
+        with self.lock:
+            if failure_threshold is not None:
+                self.failure_threshold = failure_threshold
+            if cooldown is not None:
+                self.cooldown = cooldown
+
+    def allow(self):
+        '''Return True if a connect or command may be sent, which is the
+           probe if the breaker is half open.'''
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and \
+                    time.time() >= self.opened_at + self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def on_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                xlog.info('The circuit breaker of %s closes.' % self.host)
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def on_failure(self):
+        with self.lock:
+            self.failures += 1
+            opening = self.state == HALF_OPEN or (
+                self.state == CLOSED and
+                self.failures >= self.failure_threshold)
+            if opening:
+                self.state = OPEN
+                self.opened_at = time.time()
+            self.probing = False
+        if opening:
+            xlog.warning('The circuit breaker of %s opens for %s seconds '
+                         'after %d failures.' %
+                         (self.host, self.cooldown, self.failures))
+            event('circuit_open', host=self.host)
+
+    def release(self):
+        '''Let another probe through, e.g. if the probe fails for a reason
+           other than connection.'''
+        with self.lock:
+            self.probing = False
+
+    @contextmanager
+    def guard(self):
+        '''Run the block if allowed, and record its result.
+
+        :raise CircuitOpenError: if the breaker is open.
+        '''
+        if not self.allow():
+            raise CircuitOpenError(
+                'The circuit breaker of %s is open after %d failures.' %
+                (self.host, self.failures))
+        try:
+            yield
+        except ce.UnableToConnectException:
+            self.on_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.on_success()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host, failure_threshold=None, cooldown=None):
+    '''Return the circuit breaker shared by all connections to the host.
+
+    The failure_threshold and cooldown of an existing breaker are changed if
+    they are given.
+    '''
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                host, failure_threshold or DEFAULT_FAILURE_THRESHOLD,
+                cooldown or DEFAULT_COOLDOWN)
+        else:
+            breaker.configure(failure_threshold, cooldown)
+        return breaker
+
+
+def forget_breakers():
+    '''Forget the failures of all storage arrays.'''
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,243 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Result cache for read-only CLI commands
+
+Example:
+
+>>> from pysvc.unified import connect
+>>> from pysvc.unified.cache import CommandCache
+>>> conn = connect('ip', username='admin', password='password',
+...                cache=CommandCache(default_ttl=10, ttls={'lssystem': 60}))
+>>> conn.svcinfo.lsvdisk() # sent to storage array
+>>> conn.svcinfo.lsvdisk() # served from cache
+>>> conn.svctask.mkvolume(name='v1', pool='p1', size=1, unit='gb')
+>>> conn.svcinfo.lsvdisk() # "lsvdisk" was invalidated by "mkvolume"
+'''
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.unified.clispec import is_read_only, command_name
+
+__all__ = ['CommandCache']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+PATTERN_MUTATION = re.compile(
+    '^(mk|rm|ch|add|expand|shrink|migrate|split|start|stop|prestart|'
+    'switch|repair|recover|include|detect|apply|set)(.+)$')
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTLS = {
+    'lssystem': 60.0,
+    'lscluster': 60.0,
+    'lsnode': 60.0,
+    'lsnodecanister': 60.0,
+    'lsiogrp': 60.0,
+    'lscurrentuser': 300.0,
+}
+
+_VDISK_LISTINGS = ('lsvdisk', 'lsvdiskcopy', 'lssevdiskcopy', 'lsvdiskextent',
+                   'lsvdiskhostmap', 'lshostvdiskmap', 'lsvdiskdependentmaps',
+                   'lsmdiskgrp', 'lsmdiskextent', 'lsfcmap',
+                   'lsrcrelationship', 'lsvolumegroup', 'lssystem',
+                   'lscluster')
+_HOST_LISTINGS = ('lshost', 'lshostiogrp', 'lshostvdiskmap', 'lsvdiskhostmap',
+                  'lsfabric', 'lshostcluster')
+# Listings to invalidate when an object of the key is changed. The listing
+# "ls<object>" is always invalidated, and an unknown object invalidates all.
+DEFAULT_DEPENDENCIES = {
+    'vdisk': _VDISK_LISTINGS,
+    'volume': _VDISK_LISTINGS,
+    'vdiskcopy': _VDISK_LISTINGS,
+    'volumecopy': _VDISK_LISTINGS,
+    'vdisksize': _VDISK_LISTINGS,
+    'volumesize': _VDISK_LISTINGS,
+    'vdiskhostmap': ('lshostvdiskmap', 'lsvdisk', 'lshost'),
+    'volumehostmap': ('lshostvdiskmap', 'lsvdiskhostmap', 'lsvdisk', 'lshost'),
+    'host': _HOST_LISTINGS,
+    'hostport': _HOST_LISTINGS,
+    'hostiogrp': _HOST_LISTINGS,
+    'hostcluster': _HOST_LISTINGS,
+    'mdisk': ('lsmdiskgrp', 'lsmdiskextent', 'lsvdisk', 'lssystem',
+              'lscluster'),
+    'mdiskgrp': ('lsmdisk', 'lsvdisk', 'lsvdiskcopy', 'lssystem',
+                 'lscluster'),
+    'fcmap': ('lsfcconsistgrp', 'lsvdisk', 'lsvdiskdependentmaps'),
+    'fcconsistgrp': ('lsfcmap',),
+    'rcrelationship': ('lsrcconsistgrp', 'lsvdisk'),
+    'rcconsistgrp': ('lsrcrelationship',),
+    'user': ('lscurrentuser',),
+}
+
+
+def response_size(resp):
+    '''Return the raw output size of a command's response in bytes, which
+       is less than the memory held by its parsed rows.'''
+    raw = getattr(resp, 'response', resp)
+    if isinstance(raw, (tuple, list)):
+        return sum(len(a) for a in raw if a) or 1
+    try:
+        return len(raw) or 1
+    except TypeError:
+        return 1
+
+
+# the parameters which do not change the response
+IGNORED_KEYS = ('xsf.cache', 'xsf.deadline', 'xsf.retry_policy', 'xsf.lane',
+                'xsf.timeout')
+
+
+class CommandCache(object):
+    '''LRU cache of responses keyed by the command's realname, canonical
+    arguments and the address of storage array, so a cache can be shared
+    by the connections to several storage arrays.
+
+    :param default_ttl: (optional) Seconds a response is kept, it is 30 by
+                        default.
+    :type default_ttl: float
+    :param ttls: (optional) The per-command seconds a response is kept, keyed
+                 by CLI name, e.g. {'lssystem': 60}. A value no greater than
+                 0 disables caching of the command.
+    :type ttls: dict
+    :param max_bytes: (optional) The upper bound of the raw output size of
+                      cached responses, it is 32MB by default. The parsed
+                      responses hold several times this memory.
+    :type max_bytes: int
+    :param dependencies: (optional) The listings to invalidate when an object
+                         is changed, see `DEFAULT_DEPENDENCIES`.
+    :type dependencies: dict
+
+    The cached response object is shared by the callers, so it should not be
+    modified.
+    '''
+
+    def __init__(
+            self,
+            default_ttl=DEFAULT_TTL,
+            ttls=None,
+            max_bytes=DEFAULT_MAX_BYTES,
+            dependencies=None,
+            clock=time.time):
+        super(CommandCache, self).__init__()
+        self.default_ttl = default_ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes
+        self.dependencies = DEFAULT_DEPENDENCIES if dependencies is None \
+            else dependencies
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(realname, kwargs, address=None):
+        return realname, tuple(sorted(
+            (k, repr(v)) for k, v in kwargs.items()
+            if k not in IGNORED_KEYS)), address
+
+    def ttl(self, realname):
+        return self.ttls.get(command_name(realname), self.default_ttl)
+
+    def get(self, realname, kwargs, address=None):
+        '''Return the cached response or None.
+
+        :param address: (optional) The (host, port) of storage array.
+        :type address: tuple
+        '''
+        key = self.key(realname, kwargs, address)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, size, resp = entry
+                if expires > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return resp
+                self._remove(key)
+            self.misses += 1
+        return None
+
+    def put(self, realname, kwargs, resp, generation=None, address=None):
+        '''Cache the response unless the cache was invalidated since
+           `generation`.'''
+        ttl = self.ttl(realname)
+        size = response_size(resp)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        key = self.key(realname, kwargs, address)
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (self.clock() + ttl, size, resp)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.size -= size
+
+    def invalidate(self, cmd):
+        '''Invalidate the listings depending on the objects changed by
+           `cmd`, which is a realname or a whole command line. The parts of
+           a compound command line separated by ";" are handled one by one.
+        '''
+        for part in cmd.split(';'):
+            name = command_name(part)
+            if name and name != 'echo' and not is_read_only(part):
+                self._invalidate(name)
+
+    def _invalidate(self, name):
+        m = PATTERN_MUTATION.match(name)
+        deps = self.dependencies.get(m.group(2)) if m else None
+        with self.lock:
+            self.generation += 1
+            self.invalidations += 1
+            if deps is None:
+                xlog.debug('Invalidate all cached responses for "%s".' % name)
+                self.entries.clear()
+                self.size = 0
+                return
+            names = set(deps)
+            names.add('ls' + m.group(2))
+            for key in [k for k in self.entries
+                        if command_name(k[0]) in names]:
+                self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.size = 0
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
@@ -19,16 +19,30 @@ try:
     from StringIO import StringIO
 except ImportError:
     from io import StringIO
-import pkg_resources
+import threading
+import time
 from logging import getLogger
 import pysvc.errors as ce
 from pysvc.messages import UnifiedMessages
 from pysvc.transports.ssh_transport import SSHTransport
-from pysvc.unified.clispec import parse
+from concurrent.futures import ThreadPoolExecutor
+from pysvc.unified.clispec import parse, is_read_only, CLIBase, CLISpecError, \
+    TAG_ERR
+from pysvc.unified.cache import CommandCache
+from pysvc.unified.singleflight import SingleFlight
+from pysvc.unified.batch import Batch, DEFAULT_MAX_COMMANDS
+from pysvc.unified.retry import DEFAULT_RETRY_POLICY, NO_RETRY
+from pysvc.unified.retry import get_retry_budget
+from pysvc.unified.limiter import get_limiter, lane_of
+from pysvc.unified.breaker import get_breaker
+from pysvc.unified.query import where, fetch_partitioned
+from pysvc.unified.query import DEFAULT_PARTITION_WORKERS
 from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.instrumentation import span
 from .scp_cli_client import ScpClient
 from pysvc.unified.helpers import etree
 from pysvc.unified.helpers.xml_util import XMLException
+from pysvc.unified.response import CLIFailureError
 
 __all__ = ['connect']
 
@@ -58,12 +72,33 @@ class UnifiedSSHClient(object):
         self.transport = None
         self.specification = None
         self.flexible = False
+        self.cache = None
+        self.single_flight = None
+        self.retry_policy = None
+        self.limiter = None
+        self.hedge_policy = None
+        self.hedge_transport = None
+        self.breaker = None
+        self.prefetches = {}
+
+    @property
+    def specification(self):
+        return self._specification
+
+    @specification.setter
+    def specification(self, spec):
+        self._specification = spec
+        # the proxies are bound to the commands of specification
+        self._proxies = {}
 
     def close(self):
         '''Close the connection.'''
         if self.transport:
             self.transport.disconnect()
             self.transport = None
+        if self.hedge_transport:
+            self.hedge_transport.disconnect()
+            self.hedge_transport = None
         self.specification = None
 
     def send_raw_command(self, cmd, extra=None, stdin=None):
@@ -75,16 +110,266 @@ class UnifiedSSHClient(object):
 
                       * timeout: (float) Response timeout for each sending
                         command in seconds.
+                      * lane: (str) The lane of :py:attr:`limiter`,
+                        "interactive" or "bulk". It is "bulk" for read-only
+                        commands and "interactive" for others by default.
         :type extra: dict
         :return: The content from stdout and stderr of the executed command.
         :rtype: tuple
+
+        Identical read-only commands sent concurrently are executed once if
+        :py:attr:`single_flight` is set. The command fails at once if
+        :py:attr:`breaker` is open, and waits for admission of
+        :py:attr:`limiter` if it is set. A slow read-only command is sent
+        again on :py:attr:`hedge_transport` if :py:attr:`hedge_policy` is
+        set.
         '''
+        with span('client.send', cmd, self._host()) as sp:
+            read_only = stdin is None and is_read_only(cmd)
+            send = self._send_raw_command
+            if read_only and self.hedge_policy is not None and \
+                    self.hedge_transport is not None:
+                send = self._send_hedged
+            if read_only and self.single_flight is not None:
+                stdout, stderr = self.single_flight.do(
+                    cmd, send, cmd, extra, stdin)
+            else:
+                stdout, stderr = send(cmd, extra, stdin)
+            sp.set(bytes=len(stdout or '') + len(stderr or ''))
+            return stdout, stderr
+
+    def _host(self):
+        return getattr(self.transport, 'host', None)
+
+    def _address(self):
+        return self._host(), getattr(self.transport, 'port', None)
+
+    def _send_hedged(self, cmd, extra=None, stdin=None):
+        return self.hedge_policy.call(
+            lambda cancel: self._send_raw_command(
+                cmd, extra, stdin, cancel=cancel),
+            lambda cancel: self._send_raw_command(
+                cmd, extra, stdin, self.hedge_transport, cancel), cmd)
+
+    def _send_raw_command(self, cmd, extra=None, stdin=None, transport=None,
+                          cancel=None):
+        breaker = self.breaker
+        if breaker is None:
+            return self._admit(cmd, extra, stdin, transport, cancel)
+        with breaker.guard():
+            return self._admit(cmd, extra, stdin, transport, cancel)
+
+    def _admit(self, cmd, extra, stdin, transport, cancel):
+        limiter = self.limiter
+        if limiter is None:
+            return self._execute(cmd, extra, stdin, transport, cancel)
+        lane = (extra.get('lane') if extra else None) or lane_of(cmd)
+        with limiter.slot(lane):
+            return self._execute(cmd, extra, stdin, transport, cancel)
+
+    def _execute(self, cmd, extra=None, stdin=None, transport=None,
+                 cancel=None):
+        transport = transport or self.transport
         timeout = extra.get('timeout', 0) if extra else 0
         xlog.debug("+++{0}+++".format(cmd))
-        _, stdout, stderr = self.transport.send_command(
-            cmd, raw=True, timeout=timeout, stdin_input=stdin)
+        try:
+            try:
+                _, stdout, stderr = transport.send_command(
+                    cmd, raw=True, timeout=timeout, stdin_input=stdin,
+                    cancel=cancel)
+            except ce.ConnectionTimedoutException:
+                raise
+            except ce.UnableToConnectException:
+                if not self._reconnect_to_replay(cmd, stdin, transport):
+                    raise
+                _, stdout, stderr = transport.send_command(
+                    cmd, raw=True, timeout=timeout, stdin_input=stdin,
+                    cancel=cancel)
+        finally:
+            if self.cache is not None and not is_read_only(cmd):
+                self.cache.invalidate(cmd)
         return stdout, stderr
 
+    def _reconnect_to_replay(self, cmd, stdin, transport):
+        '''Reconnect if the connection died while sending the command, and
+           return True if the command is read-only to send it again. The
+           commands which may change the storage array are never sent
+           again.'''
+        if not getattr(transport, 'auto_reconnect', False) or \
+                not transport.ensure_alive():
+            return False
+        if stdin is None and is_read_only(cmd):
+            xlog.info('Send "%s" again after reconnecting.' % cmd)
+            return True
+        return False
+
+    def call_command(self, command, kwargs):
+        '''Execute a CLI command of the specification through this client.
+
+        The response of a read-only command is served from :py:attr:`cache`
+        if it is set. Set "xsf.cache" to False in kwargs to bypass the cached
+        response and refresh it.
+
+        :param command: The CLI command.
+        :type command: :py:class:`pysvc.unified.clispec.CLICommand`
+        :param kwargs: The command's parameters.
+        :type kwargs: dict
+        :return: The response object.
+        '''
+        cache = self.cache
+        if (cache is None or 'stdin' in kwargs
+                or not is_read_only(command.realname)):
+            return command(self.send_raw_command, self._with_policy(kwargs))
+        address = self._address()
+        if kwargs.get('xsf.cache', True):
+            resp = cache.get(command.realname, kwargs, address)
+            if resp is None and self.prefetches:
+                resp = self._prefetched(
+                    cache.key(command.realname, kwargs, address))
+            if resp is not None:
+                return resp
+        generation = cache.generation
+        resp = command(self.send_raw_command, self._with_policy(kwargs))
+        cache.put(command.realname, kwargs, resp, generation, address)
+        return resp
+
+    def prefetch(self, commands):
+        '''Execute read-only commands in parallel in background threads and
+           keep their responses in :py:attr:`cache`, which is created if it
+           is not set.
+
+        A call of a prefetched command with the same parameters waits for
+        the prefetch if it is in flight instead of sending the command again.
+        The failures of prefetch are logged and ignored.
+
+        :param commands: The commands, each is a CLI name, e.g. "lsvdisk", a
+                         path, e.g. "svcinfo.lsvdisk", or a tuple of the
+                         command and its parameters, e.g.
+                         ("lsvdisk", {"bytes": True}).
+        :type commands: list
+        :return: The futures of responses.
+        :rtype: list
+
+        Example:
+
+        >>> conn.prefetch(['lssystem', 'lsnode', 'lsvdisk'])
+        >>> conn.svcinfo.lsvdisk()  # no round trip once prefetched
+        '''
+        resolved = []
+        for item in commands:
+            name, kwargs = (item, {}) if isinstance(item, str) else item
+            resolved.append((self._find_command(name), dict(kwargs)))
+        if not resolved:
+            return []
+        if self.cache is None:
+            self.cache = CommandCache()
+        futures = []
+        executor = ThreadPoolExecutor(len(resolved))
+        try:
+            for command, kwargs in resolved:
+                key = self.cache.key(command.realname, kwargs,
+                                     self._address())
+                # bypass the lookup, which would wait for the prefetch itself
+                kwargs['xsf.cache'] = False
+                generation = self.cache.generation
+                future = executor.submit(self.call_command, command, kwargs)
+                self.prefetches[key] = (generation, future)
+                future.add_done_callback(
+                    lambda f, key=key: self._prefetch_done(key, f))
+                futures.append(future)
+        finally:
+            # the threads exit once the prefetches are done
+            executor.shutdown(wait=False)
+        return futures
+
+    def _find_command(self, name):
+        spec = self.specification
+        if '.' in name:
+            obj = spec
+            for part in name.split('.'):
+                obj = obj.cmds.get(part) if obj is not None else None
+        else:
+            obj = next((ns.cmds[name] for _, ns in sorted(spec.cmds.items())
+                        if name in ns.cmds), None)
+        if obj is None or obj.cmds or not is_read_only(obj.realname):
+            raise CLISpecError(
+                '"%s" is not a read-only command of the specification.'
+                % name)
+        return obj
+
+    def _prefetch_done(self, key, future):
+        if self.prefetches.get(key, (None, None))[1] is future:
+            del self.prefetches[key]
+        if not future.cancelled() and future.exception() is not None:
+            xlog.warning('Fail to prefetch %s: %s' %
+                         (key[0], future.exception()))
+
+    def _prefetched(self, key):
+        generation, future = self.prefetches.get(key, (None, None))
+        # the prefetch may miss a change since it started
+        if future is None or generation != self.cache.generation:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            # the caller executes the command itself
+            return None
+
+    def _with_policy(self, kwargs):
+        if self.retry_policy is None or 'xsf.retry_policy' in kwargs:
+            return kwargs
+        kwargs = dict(kwargs)
+        kwargs['xsf.retry_policy'] = self.retry_policy
+        return kwargs
+
+    def _retry_callable(self, command, kwargs):
+        command = getattr(command, 'referent', command)
+        kwargs = dict(kwargs)
+        policy = kwargs.pop('xsf.retry_policy', None) or \
+            self.retry_policy or DEFAULT_RETRY_POLICY
+        kwargs['xsf.retry_policy'] = NO_RETRY
+        return policy, lambda: self.call_command(command, kwargs), \
+            kwargs.get('xsf.deadline')
+
+    def submit(self, executor, command, **kwargs):
+        '''Execute a CLI command on the executor.
+
+        The retries of transient failures are scheduled with timers, so no
+        thread of executor sleeps while waiting.
+
+        :param executor: The executor, e.g.
+                         :py:class:`concurrent.futures.ThreadPoolExecutor`.
+        :param command: The command, e.g. conn.svcinfo.lsvdisk.
+        :return: The future of response.
+        :rtype: :py:class:`concurrent.futures.Future`
+        '''
+        policy, fn, deadline = self._retry_callable(command, kwargs)
+        return policy.submit(fn, executor, deadline=deadline)
+
+    async def call_async(self, command, **kwargs):
+        '''Execute a CLI command in the executor of the running event loop
+           and await the retries without blocking the loop.
+
+        >>> resp = await conn.call_async(conn.svcinfo.lsvdisk, bytes=True)
+        '''
+        policy, fn, deadline = self._retry_callable(command, kwargs)
+        return await policy.call_async(fn, deadline=deadline)
+
+    def batch(self, max_commands=DEFAULT_MAX_COMMANDS):
+        '''Return a :py:class:`pysvc.unified.batch.Batch` which sends the
+           queued commands in one SSH execution.
+
+        Example:
+
+        >>> with conn.batch() as b:
+        ...     vdisks = b.svcinfo.lsvdisk()
+        ...     hosts = b.svcinfo.lshost()
+        ...
+        >>> vdisks.response.as_list
+        [...]
+        '''
+        return Batch(self, max_commands)
+
     def get_device_info(self):
         '''Get the device information of storage array.
 
@@ -123,12 +408,21 @@ class UnifiedSSHClient(object):
         return scp_client.receive(remote_path)
 
     def __getattr__(self, name):
-        obj = getattr(self.specification, name, None)
-        if obj is None:
-            raise AttributeError(
-                "'%s' object has no attribute '%s'" %
-                (self.__class__.__name__, name))
-        return Proxy(obj, self.send_raw_command)
+        proxies = self.__dict__.get('_proxies')
+        if proxies is None:
+            # not initialized yet, e.g. during unpickling
+            raise AttributeError(name)
+        proxy = proxies.get(name)
+        if proxy is None:
+            obj = getattr(self._specification, name, None)
+            if obj is None:
+                raise AttributeError(
+                    "'%s' object has no attribute '%s'" %
+                    (self.__class__.__name__, name))
+            proxy = Proxy(obj, self.send_raw_command, self)
+            if isinstance(obj, CLIBase):
+                proxies[name] = proxy
+        return proxy
 
     def __dir__(self):
         return dir(self.specification)
@@ -144,22 +438,34 @@ class Proxy(object):
     Help on ...
     '''
 
-    def __init__(self, referent, context):
+    def __init__(self, referent, context, client=None):
         super(Proxy, self).__init__()
         self.referent = referent
         self.context = context
+        self.client = client
+        # the proxies of namespaces and commands are kept, since they do not
+        # change until the specification of client changes
+        self.children = {}
 
     @property
     def __doc__(self):
         return getattr(self.referent, '__doc__', None)
 
     def __getattr__(self, name):
-        at = getattr(self.referent, name, None)
-        if at is None:
-            raise AttributeError(
-                "'%s' object has no attribute '%s'" %
-                (self.__class__.__name__, name))
-        return Proxy(at, self.context)
+        children = self.__dict__.get('children')
+        if children is None:
+            raise AttributeError(name)
+        proxy = children.get(name)
+        if proxy is None:
+            at = getattr(self.referent, name, None)
+            if at is None:
+                raise AttributeError(
+                    "'%s' object has no attribute '%s'" %
+                    (self.__class__.__name__, name))
+            proxy = Proxy(at, self.context, self.client)
+            if isinstance(at, CLIBase):
+                children[name] = proxy
+        return proxy
 
     def __dir__(self):
         return dir(self.referent)
@@ -167,51 +473,147 @@ class Proxy(object):
     def __call__(self, **kwargs):
         '''Call the wrapped referent with given parameters and
            return the result.'''
+        if self.client is not None:
+            return self.client.call_command(self.referent, kwargs)
         return self.referent(self.context, kwargs)
 
+    def where(self, params=None, **predicates):
+        '''Return the rows of listing which match the predicates, which are
+           sent in -filtervalue if the storage array supports, see
+           :py:mod:`pysvc.unified.query`.
+
+        :param params: (optional) The command's parameters, e.g.
+                       {"bytes": True}.
+        :type params: dict
+        :return: The matching rows.
+        :rtype: list
+
+        Example:
+
+        >>> conn.svcinfo.lsvdisk.where(mdisk_grp_name='p1', status='online')
+        [Munch(..., name='v1', ...), ...]
+        '''
+        return where(self, predicates, params)
+
+    def partitioned(self, by, values=None,
+                    max_workers=DEFAULT_PARTITION_WORKERS, **kwargs):
+        '''Fetch the listing in disjoint -filtervalue partitions by an
+           attribute concurrently, and return one response identical to
+           the listing fetched at once, see
+           :py:func:`pysvc.unified.query.fetch_partitioned`.
+
+        Example:
+
+        >>> conn.svcinfo.lsvdisk.partitioned('mdisk_grp_id', bytes=True)
+        <pysvc.unified.response.SVCResponse object at 0x...>
+        '''
+        return fetch_partitioned(self, by, values, kwargs, max_workers)
+
+
+# the device type and version detected per storage array, which saves the
+# detection commands of later connections
+DEVICE_TYPE_TTL = 3600.0
+_device_types = {}
+
+
+def _array_key(conn):
+    return (getattr(conn.transport, 'host', None),
+            getattr(conn.transport, 'port', None))
+
+
+def known_device_type(conn):
+    '''Return the remembered device type and version of the storage array
+       connected, or None.'''
+    entry = _device_types.get(_array_key(conn))
+    if entry is None or entry[0] < time.time():
+        return None
+    return entry[1]
+
+
+def remember_device_type(conn, device, version):
+    _device_types[_array_key(conn)] = (time.time() + DEVICE_TYPE_TTL,
+                                       (device, version))
+
+
+def forget_device_types():
+    '''Forget the detected device types, e.g. after upgrading storage
+       arrays.'''
+    _device_types.clear()
+
 
 def yield_device_type(conn):
+    '''Yield the candidates of device type and version, the remembered one
+       first.'''
+    known = known_device_type(conn)
+    if known is not None:
+        yield known
     conn.specification, oldspec = parse_cli_spec(
         conn, get_cli_spec('xsf', '1.0')), conn.specification
     try:
+        # the SVC and Storwize are never probed as IFS or SoNAS once known
+        if (known is None or known[0] != 'svc') and \
+                'cli' in conn.specification.cmds:
+            try:
+                for clu in conn.cli.lscluster():
+                    device = 'ifs' if clu.get('Profile') == 'IFS' \
+                        else 'sonas'
+                    for nd in conn.cli.lsnode(cluster=clu.get('Name')):
+                        yield device, canonical_version(
+                            nd.get('Product Version', '')
+                            or nd.get('Product version', '')
+                            or nd.get('product version', ''))
+            except GeneratorExit:
+                raise
+            except Exception as ex:
+                xlog.debug('No IFS or SoNAS is found, and continue: %s' % ex)
         try:
-            for clu in conn.cli.lscluster():
-                device = 'ifs' if clu.get('Profile') == 'IFS' else 'sonas'
-                for nd in conn.cli.lsnode(cluster=clu.get('Name')):
-                    yield device, canonical_version(
-                        nd.get('Product Version', '')
-                        or nd.get('Product version', '')
-                        or nd.get('product version', ''))
-        except GeneratorExit:
-            raise
-        except Exception:
-            xlog.exception('No IFS or SoNAS is found, and continue.')
-        try:
-            for clu in conn.svcinfo.lscluster():
-                if clu.get('location') == 'local':
-                    for clu1 in conn.svcinfo.lscluster(cluster=clu.get('id')):
-                        yield 'svc', canonical_version(
-                            clu1.get('code_level', ''))
+            for device in yield_svc_type(conn):
+                yield device
         except GeneratorExit:
             raise
-        except Exception:
-            xlog.exception('No SVC or Storwize is found, and continue.')
+        except Exception as ex:
+            xlog.debug('No SVC or Storwize is found, and continue: %s' % ex)
     finally:
         conn.specification = oldspec
 
 
+def yield_svc_type(conn):
+    try:
+        # one command since 6.3
+        system = conn.svcinfo.lssystem().as_single_element
+    except CLIFailureError as ex:
+        xlog.debug('Fail to list system, try to list cluster: %s' % ex)
+        system = None
+    if system and system.get('code_level'):
+        yield 'svc', canonical_version(system.get('code_level'))
+        return
+    for clu in conn.svcinfo.lscluster():
+        if clu.get('location') == 'local':
+            for clu1 in conn.svcinfo.lscluster(cluster=clu.get('id')):
+                yield 'svc', canonical_version(clu1.get('code_level', ''))
+
+
 def set_specification(conn, with_remote_clispec=True):
-    spec = get_remote_cli_spec(conn) if with_remote_clispec else None
+    '''Set the CLI specification of connection from "catxmlspec", or the
+       local one of the detected device type.
+
+    "catxmlspec" is skipped for the storage arrays whose device type was
+    detected, since it was unavailable.
+    '''
+    spec = None
+    if with_remote_clispec and known_device_type(conn) is None:
+        spec = get_remote_cli_spec(conn)
     if not spec:
         xlog.info(UnifiedMessages.UNIFIED_PARSE_LOCAL_START)
         for d, t in yield_device_type(conn):
             try:
                 spec = parse_cli_spec(conn, get_cli_spec(d, t))
-            except Exception:
-                xlog.exception(
-                    'No CLI specification found for "%s, %s", and continue.' %
-                    (d, t))
+            except Exception as ex:
+                xlog.warning(
+                    'No CLI specification found for "%s, %s", and continue: '
+                    '%s' % (d, t, ex))
             if spec:
+                remember_device_type(conn, d, t)
                 break
     if not spec:
         raise NoSpecificationError(UnifiedMessages.UNIFIED_NO_CLI_SPEC)
@@ -253,22 +655,84 @@ def device_type_alias(device, version):
 
 
 def get_cli_spec(device, version):
-    # pylint: disable-msg=E1101
-    return pkg_resources.resource_stream(
-        __name__, '%s-%s.xml' %
-        device_type_alias(
-            device, version))
+    from importlib.resources import files
+    return files(__package__).joinpath(
+        '%s-%s.xml' % device_type_alias(device, version)).open('rb')
 
 
 def canonical_version(data):
     return '.'.join(data.strip().split('.')[:2])
 
 
+# seconds to wait for a connection attempt before starting the next one
+DEFAULT_STAGGER = 0.25
+# the address which connects first per set of addresses of a cluster
+_preferred_addresses = {}
+
+
+def race(addresses, open_transport, stagger=DEFAULT_STAGGER):
+    '''Open transports to the addresses in parallel, and return the first
+       connected one. An attempt starts stagger seconds after the previous
+       one, or once an attempt fails. The later connected transports are
+       disconnected.
+
+    :param addresses: The addresses in the order to try.
+    :type addresses: list
+    :param open_transport: The function returning the connected transport
+                           to an address.
+    :type open_transport: function
+    :param stagger: (optional) The seconds to wait before the next attempt.
+    :type stagger: float
+    :raise: The error of the first address if all attempts fail.
+    '''
+    cond = threading.Condition()
+    errors = {}
+    won = []
+
+    def attempt(address):
+        try:
+            trans = open_transport(address)
+        except Exception as ex:
+            with cond:
+                errors[address] = ex
+                cond.notify_all()
+            return
+        with cond:
+            if not won:
+                won.append(trans)
+                cond.notify_all()
+                return
+        xlog.debug('Disconnect from %s which connects late.' % address)
+        trans.disconnect()
+
+    started = 0
+    with cond:
+        while not won and len(errors) < len(addresses):
+            if started < len(addresses):
+                th = threading.Thread(target=attempt,
+                                      args=(addresses[started],))
+                th.daemon = True
+                th.start()
+                started += 1
+                failed = len(errors)
+                cond.wait_for(lambda: won or len(errors) > failed, stagger)
+            else:
+                cond.wait()
+        if won:
+            return won[0]
+    for address in addresses[1:]:
+        xlog.debug('Fail to connect to %s: %s' % (address, errors[address]))
+    raise errors[addresses[0]]
+
+
 def connect(address, **kwargs):
     '''Connect to storage array through SSH.
 
-    :param address: The IP address or host name of storage array.
-    :type address: str
+    :param address: The IP address or host name of storage array, or a list
+                    of them, e.g. the cluster and service IP addresses. The
+                    addresses are tried in parallel, starting with the one
+                    connected last time, and the first connected is used.
+    :type address: str or list
     :param username: (optional) The username of login account.
     :type username: str
     :param password: (optional) The password of login account or private key.
@@ -300,6 +764,79 @@ def connect(address, **kwargs):
                                            specification from remote storage
                                            array, it is True by default.
     :type with_remote_clispec: bool
+    :param cache: (optional) The cache for responses of read-only commands,
+                             True to use a default
+                             :py:class:`pysvc.unified.cache.CommandCache`,
+                             it is None by default.
+    :type cache: :py:class:`pysvc.unified.cache.CommandCache` or bool
+    :param single_flight: (optional) Indicates whether to coalesce identical
+                                     read-only commands sent concurrently
+                                     into one execution, it is False by
+                                     default.
+    :type single_flight: bool
+    :param retry_policy: (optional) The policy to retry transient failures.
+                                    Its retries are bounded by a budget
+                                    shared by the connections to the same
+                                    storage array unless it has a budget.
+    :type retry_policy: :py:class:`pysvc.unified.retry.RetryPolicy`
+    :param max_in_flight: (optional) The max number of commands in flight
+                                     to the storage array, shared by all the
+                                     connections to it, it is None (no
+                                     limit) by default.
+    :type max_in_flight: int
+    :param prefetch: (optional) The read-only commands to execute in
+                                background once connected, see
+                                :py:meth:`.UnifiedSSHClient.prefetch`, e.g.
+                                ["lssystem", "lsnode", "lsvdisk"]. It
+                                creates a default cache if cache is not set.
+    :type prefetch: list
+    :param shell_session: (optional) Indicates whether to execute commands
+                                     in one persistent shell instead of a
+                                     new channel per command, which cuts
+                                     the latency of small commands, it is
+                                     False by default. The concurrent
+                                     commands still use their own channels.
+    :type shell_session: bool
+    :param keepalive: (optional) The interval in seconds to send SSH
+                                 keepalive packets when idle, which keeps
+                                 firewalls from dropping the connection and
+                                 finds it dead, it is 0 (disabled) by
+                                 default.
+    :type keepalive: int
+    :param auto_reconnect: (optional) Indicates whether to reconnect when
+                                      the connection is found dead, it is
+                                      False by default. The specification
+                                      is kept. A read-only command failing
+                                      because of the dead connection is
+                                      sent again, and the others fail.
+    :type auto_reconnect: bool
+    :param known_hosts: (optional) The known hosts file to check the SSH
+                                   host key of storage array against, True
+                                   for ~/xsf_known_hosts, it is None (not
+                                   checked) by default. The file is shared
+                                   by the connections in process, and the
+                                   new host keys are saved in batches.
+    :type known_hosts: str or bool
+    :param stagger: (optional) The seconds to wait for an address to
+                               connect before trying the next one at the
+                               same time, it is 0.25 by default.
+    :type stagger: float
+    :param hedge_policy: (optional) The policy to send a slow read-only
+                                    command again on a second connection
+                                    and use the first answer, which is
+                                    opened with the same options. It is
+                                    None (no hedging) by default.
+    :type hedge_policy: :py:class:`pysvc.unified.hedge.HedgePolicy`
+    :param circuit_breaker: (optional) Indicates whether to fail at once
+                                       for a while after consecutive
+                                       connection failures to the storage
+                                       array, see
+                                       :py:mod:`pysvc.unified.breaker`, or
+                                       the parameters of its breaker, e.g.
+                                       {"failure_threshold": 3,
+                                       "cooldown": 60}. It is False by
+                                       default.
+    :type circuit_breaker: bool or dict
     :return: The connection object to storage array.
     :rtype: :py:class:`.UnifiedSSHClient`
 
@@ -309,31 +846,87 @@ def connect(address, **kwargs):
     <pysvc.pysvc.unified.client.UnifiedSSHClient object at 0x...>
     '''
     g = kwargs.get
-    trans = SSHTransport(
-        host=address,
-        user=g('username'),
-        password=g('password'),
-        port=g(
-            'port',
-            22),
-        auto_add=g(
-            'add_hostkey',
-            True),
-        pkey=g('privatekey'),
-        pkey_file=g('privatekey_filename'),
-        timeout=g(
-            'timeout',
-            30),
-        cmd_timeout=g(
-            'cmd_timeout',
-            60.0))
+    breaker_args = g('circuit_breaker')
+    breaker_args = breaker_args if isinstance(breaker_args, dict) else (
+        {} if breaker_args else None)
+
+    def open_transport(host):
+        trans = SSHTransport(
+            host=host,
+            user=g('username'),
+            password=g('password'),
+            port=g(
+                'port',
+                22),
+            auto_add=g(
+                'add_hostkey',
+                True),
+            pkey=g('privatekey'),
+            pkey_file=g('privatekey_filename'),
+            timeout=g(
+                'timeout',
+                30),
+            cmd_timeout=g(
+                'cmd_timeout',
+                60.0),
+            shell_session=g('shell_session', False),
+            shell_error_marker=TAG_ERR,
+            keepalive=g('keepalive', 0),
+            auto_reconnect=g('auto_reconnect', False),
+            ignore_known_hosts=not g('known_hosts'),
+            known_hosts_file=g('known_hosts') if isinstance(
+                g('known_hosts'), str) else None)
+        try:
+            if breaker_args is None:
+                trans.connect()
+            else:
+                with get_breaker(host, **breaker_args).guard():
+                    trans.connect()
+        except BaseException:
+            trans.disconnect()
+            raise
+        return trans
+
+    if isinstance(address, (list, tuple)) and len(address) > 1:
+        cluster = frozenset(address)
+        preferred = _preferred_addresses.get(cluster)
+        addresses = sorted(address, key=lambda a: a != preferred)
+        trans = race(addresses, open_transport, g('stagger', DEFAULT_STAGGER))
+        _preferred_addresses[cluster] = trans.host
+    else:
+        if isinstance(address, (list, tuple)):
+            address = address[0]
+        trans = open_transport(address)
     conn = UnifiedSSHClient()
     try:
-        trans.connect()
         conn.flexible = g('flexible', False)
         conn.transport = trans
+        if breaker_args is not None:
+            conn.breaker = get_breaker(trans.host, **breaker_args)
         set_specification(conn, g('with_remote_clispec', True))
         check_device_type(conn, g('device_type'))
+        cache = g('cache')
+        conn.cache = CommandCache() if cache is True else (
+            None if cache is False else cache)
+        if g('single_flight', False):
+            conn.single_flight = SingleFlight()
+        policy = g('retry_policy')
+        if policy is not None and policy.budget is None:
+            policy = policy.with_budget(get_retry_budget(trans.host))
+        conn.retry_policy = policy
+        if g('max_in_flight'):
+            conn.limiter = get_limiter(trans.host, g('max_in_flight'))
+        if g('hedge_policy') is not None:
+            conn.hedge_policy = g('hedge_policy')
+            conn.hedge_transport = trans.clone()
+            try:
+                conn.hedge_transport.connect()
+            except ce.StorageArrayClientException as ex:
+                xlog.warning('Fail to open the hedge connection to %s: %s' %
+                             (trans, ex))
+                conn.hedge_transport = None
+        if g('prefetch'):
+            conn.prefetch(g('prefetch'))
         return conn
     except BaseException:
         trans.disconnect()
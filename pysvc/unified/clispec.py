@@ -17,14 +17,16 @@
 
 import base64
 import re
+import time
 import zlib
 from pysvc.unified.helpers import xml_util as etree
 from pysvc.unified.helpers.xml_util import XMLException
 from logging import getLogger
 import pysvc.errors as ce
-import time
+from pysvc.instrumentation import span
 from pysvc.unified.response import find_response_helper, is_svc_response
-from pysvc.unified.response import CLIFailureError
+from pysvc.unified.retry import DEFAULT_RETRY_POLICY
+from pysvc.unified.retry import RETRY_TIME, METADATA_RC_BUSY  # noqa: F401
 from collections import OrderedDict
 from pysvc import PYSVC_DEFAULT_LOGGER
 
@@ -35,8 +37,8 @@ xlog = getLogger(PYSVC_DEFAULT_LOGGER)
 PATTERN_INVALID_CHAR = re.compile('[^a-zA-Z0-9_]')
 TAG_ERR = 'error411049e268734c0c996d65b3854f1113'
 KEY_STR = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
-RETRY_TIME = 3
-METADATA_RC_BUSY = 11
+EXECUTABLES = ('svcinfo', 'svctask', 'sainfo', 'satask')
+READ_ONLY_EXECUTABLES = ('svcinfo', 'sainfo')
 
 
 class CLISpecError(ce.StorageArrayClientException):
@@ -176,6 +178,14 @@ class CLICommand(CLIBase):
                        * sending command in seconds.
                        * pysvc.with_header: (bool) Indicates whether
                        * the output has header.
+                       * xsf.retry_policy: (RetryPolicy) The policy to
+                       * retry transient failures, it is
+                       * DEFAULT_RETRY_POLICY by default.
+                       * xsf.lane: (str) The admission lane,
+                       * "interactive" or "bulk".
+                       * xsf.deadline: (float) The time (as time.time())
+                       * by which the command, including its retries, must
+                       * complete. The timeout of each sending is cut to it.
         :type kwargs: dict
         :return: The response object.
         :rtype: :py:class:`pysvc.pysvc.unified.response.CLIResponse` or
@@ -183,6 +193,26 @@ class CLICommand(CLIBase):
         '''
         if kwargs is None:
             kwargs = {}
+        with span('command', self.realname):
+            cmd, extra, stdin_input = self.build(kwargs)
+            policy = extra.pop('retry_policy', None) or DEFAULT_RETRY_POLICY
+            deadline = extra.pop('deadline', None)
+
+            def attempt():
+                send_extra = extra
+                if deadline is not None:
+                    send_extra = with_deadline(extra, deadline)
+                return self.make_response(
+                    start_response(cmd, send_extra, stdin=stdin_input), extra)
+            # Retry when SVC return metadata service busy error
+            return policy.call(attempt, deadline=deadline)
+
+    def build(self, kwargs):
+        '''Build the command line from the command's parameters.
+
+        :return: The command line, the extra parameters and the stdin input.
+        :rtype: tuple
+        '''
         args, extra = self.process_args(kwargs)
         if not extra.get('flexible', False):
             for k in kwargs:
@@ -197,25 +227,14 @@ class CLICommand(CLIBase):
         stdin_input = None
         if 'stdin' in list(kwargs.keys()):
             stdin_input = kwargs['stdin']
-        # Retry when SVC return metadata service busy error
-        attempt = 1
-        while True:
-            try:
-                resp = start_response(' '.join(args), extra, stdin=stdin_input)
-                # pylint: disable-msg=E1102
-                if self.resp_helper:
-                    resp = self.resp_helper(resp, extra)
-                return resp
-            except CLIFailureError as e:
-                if e.returnCode != METADATA_RC_BUSY:
-                    raise e
-                else:
-                    if attempt < RETRY_TIME:
-                        attempt = attempt + 1
-                        time.sleep(1)
-                        continue
-                    else:
-                        raise e
+        return ' '.join(args), extra, stdin_input
+
+    def make_response(self, resp, extra):
+        '''Return the response object for the output of command.'''
+        # pylint: disable-msg=E1102
+        if self.resp_helper:
+            resp = self.resp_helper(resp, extra)
+        return resp
 
 
 class SVCCommand(CLICommand):
@@ -566,6 +585,41 @@ def resolve_key_conflict(dict_, key):
         return key
 
 
+def with_deadline(extra, deadline):
+    '''Return the extra parameters whose timeout is cut to the deadline.
+
+    :raise CommandTimeoutError: if the deadline has passed.
+    '''
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise ce.CommandTimeoutError(
+            'The deadline of command has passed %.3f seconds ago.'
+            % -remaining)
+    extra = dict(extra)
+    timeout = extra.get('timeout')
+    extra['timeout'] = min(timeout, remaining) if timeout else remaining
+    return extra
+
+
+def is_read_only(cmd):
+    '''Return True if the command, given by its realname or the whole command
+       line, only queries the storage array.'''
+    tokens = cmd.split(None, 1)
+    if not tokens:
+        return False
+    return (tokens[0] in READ_ONLY_EXECUTABLES or tokens[0].startswith('ls')
+            or tokens[0] == 'catxmlspec')
+
+
+def command_name(cmd):
+    '''Return the CLI name (e.g. "lsvdisk") of a command's realname or of a
+       whole command line.'''
+    tokens = cmd.split(None, 2)
+    if len(tokens) > 1 and tokens[0] in EXECUTABLES:
+        return tokens[1]
+    return tokens[0] if tokens else ''
+
+
 def show_return_code_if_fail(tag=TAG_ERR):
     return '|| echo %s $?' % tag
 
@@ -0,0 +1,926 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Local fake SVC SSH server for load testing and benchmarks
+
+The server speaks SSH through paramiko and emulates the restricted shell of
+a storage array:
+
+* "catxmlspec" returns a CLI specification XML.
+* "svcinfo ls*" commands are answered from a synthetic
+  :py:class:`.Inventory` of configurable size, with -filtervalue (and
+  -filtervalue? listing its attributes), -bytes, -nohdr, -delim and the
+  detailed view of an object.
+* A few "svctask" commands (mkvdisk, mkvolume, rmvdisk, mkhost,
+  mkvdiskhostmap, ...) change the inventory, the others are accepted.
+* Synthetic iostats dumps are listed by "lsdumps" and served through SCP.
+* A shell channel executes the received lines one by one.
+* Latency and error return codes can be injected.
+
+Example:
+
+>>> from pysvc.unified import connect
+>>> from pysvc.unified.fakeserver import FakeSVCServer, Inventory
+>>> with FakeSVCServer(inventory=Inventory(vdisks=100000)) as server:
+...     server.svc.inject('mkvdisk', rc=11, times=2)
+...     conn = connect(server.host, port=server.port,
+...                    username=server.username, password=server.password)
+...     len(conn.svcinfo.lsvdisk().as_list)
+100000
+
+It can also run standalone:
+
+.. code-block:: console
+
+   $ python -m pysvc.unified.fakeserver --port 2222 --vdisks 100000
+
+The default CLI specification is the svc-6.3.xml of the tests in the source
+tree, which is not installed with the package. Pass the XML returned by
+"catxmlspec" of a storage array as `spec` (or --spec) otherwise.
+'''
+
+import fnmatch
+import os
+import random
+import re
+import shlex
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict
+from logging import getLogger
+import paramiko
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.unified.clispec import EXECUTABLES
+
+__all__ = ['FakeSVCServer', 'FakeSVC', 'Inventory', 'Table']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+# only in the source tree, the tests are not installed
+DEFAULT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'tests', 'response', 'svc-6.3.xml')
+DEFAULT_USERNAME = 'superuser'
+DEFAULT_PASSWORD = 'passw0rd'
+DEFAULT_DELIM = ' '
+IOSTATS_DIR = '/dumps/iostats'
+PATTERN_COMMAND = re.compile(r'<Command\s+name="(\w+)"')
+FLAGS = ('-nohdr', '-bytes', '-force', '-gui', '-autoexpand', '-compressed',
+         '-thin')
+UNITS = (('PB', 1024 ** 5), ('TB', 1024 ** 4), ('GB', 1024 ** 3),
+         ('MB', 1024 ** 2), ('KB', 1024))
+
+ERR_NOT_EXIST = ('CMMVC5753E The specified object does not exist or is not a '
+                 'suitable candidate.')
+ERR_NAME_EXIST = 'CMMVC6035E The action failed as the object already exists.'
+ERR_BAD_PARAM = 'CMMVC5709E [%s] is not a supported parameter.'
+ERR_MISSING = 'CMMVC5707E Required parameters are missing.'
+ERR_NO_POOL = ('CMMVC5754E The specified object does not exist, or the name '
+               'supplied does not meet the naming rules.')
+
+
+def format_size(value, in_bytes=False):
+    if in_bytes:
+        return str(value)
+    for unit, size in UNITS:
+        if value >= size:
+            return '%.2f%s' % (float(value) / size, unit)
+    return '%dB' % value
+
+
+def parse_size(size, unit='mb'):
+    units = dict((u.lower(), s) for u, s in UNITS + (('B', 1),))
+    return int(float(size) * units.get(unit.lower(), 1024 ** 2))
+
+
+class Table(object):
+    '''A listing of objects, e.g. the output of "lsvdisk".
+
+    :param columns: The column names, the first two are the id and name.
+    :type columns: list
+    :param detail: (optional) Indicates whether an object argument selects
+                   the detailed view of one object, otherwise it filters the
+                   rows by the first two columns, it is True by default.
+    :type detail: bool
+    :param sizes: (optional) The columns holding sizes in bytes.
+    :type sizes: tuple
+    :param single: (optional) Indicates whether the listing is always the
+                   detailed view of its first row, e.g. "lssystem", it is
+                   False by default.
+    :type single: bool
+    '''
+
+    def __init__(self, columns, detail=True, sizes=(), single=False):
+        super(Table, self).__init__()
+        self.columns = list(columns)
+        self.detail = detail
+        self.single = single
+        self.sizes = set(self.columns.index(c) for c in sizes)
+        self.rows = OrderedDict()
+        self.next_id = 0
+        self._rendered = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, **values):
+        '''Add a row and return its first column. The missing id is
+           allocated.'''
+        if 'id' in self.columns and values.get('id') is None:
+            values['id'] = self.next_id
+        if str(values.get('id', '')).isdigit():
+            self.next_id = max(self.next_id, int(values['id']) + 1)
+        row = tuple(values.get(c, '') for c in self.columns)
+        self.rows[(str(row[0]), str(row[1]))] = row
+        self._rendered.clear()
+        return row[0]
+
+    def _match(self, key):
+        return [(k, row) for k, row in self.rows.items()
+                if key == str(row[0]) or key == str(row[1])]
+
+    def find(self, key):
+        '''Return the rows whose id or name is the key.'''
+        return [row for _, row in self._match(key)]
+
+    def remove(self, key):
+        found = self._match(key)
+        for k, _ in found:
+            del self.rows[k]
+        self._rendered.clear()
+        return [row for _, row in found]
+
+    def value(self, row, column):
+        return row[self.columns.index(column)]
+
+    def select(self, filtervalue):
+        '''Return the rows matching "attr=value[:attr=value]" with "*" as
+           wildcard.'''
+        conds = []
+        for cond in filtervalue.split(':'):
+            attr, _, pattern = cond.partition('=')
+            if attr not in self.columns:
+                raise KeyError(attr)
+            conds.append((self.columns.index(attr), pattern))
+        return [row for row in self.rows.values()
+                if all(fnmatch.fnmatchcase(str(row[i]), p)
+                       for i, p in conds)]
+
+    def _cells(self, row, in_bytes):
+        return [format_size(v, in_bytes) if i in self.sizes else str(v)
+                for i, v in enumerate(row)]
+
+    def render(self, rows=None, delim=DEFAULT_DELIM, header=True,
+               in_bytes=False):
+        key = (delim, header, in_bytes)
+        if rows is None and key in self._rendered:
+            return self._rendered[key]
+        lines = [delim.join(self.columns)] if header else []
+        lines.extend(delim.join(self._cells(row, in_bytes))
+                     for row in (self.rows.values() if rows is None
+                                 else rows))
+        output = '\n'.join(lines) + '\n' if lines else ''
+        if rows is None:
+            self._rendered[key] = output
+        return output
+
+    def render_detail(self, row, delim=DEFAULT_DELIM, in_bytes=False):
+        return ''.join('%s%s%s\n' % (c, delim, v) for c, v in
+                       zip(self.columns, self._cells(row, in_bytes)))
+
+
+class Inventory(object):
+    '''Synthetic objects of a storage array.
+
+    :param vdisks: (optional) The number of volumes, it is 100 by default.
+    :type vdisks: int
+    :param hosts: (optional) The number of hosts, it is 10 by default.
+    :type hosts: int
+    :param pools: (optional) The number of storage pools, it is 4 by
+                  default.
+    :type pools: int
+    :param io_groups: (optional) The number of I/O groups with two nodes
+                      each, it is 1 by default.
+    :type io_groups: int
+    :param code_level: (optional) The code level of the cluster.
+    :type code_level: str
+    '''
+
+    def __init__(self, vdisks=100, hosts=10, pools=4, io_groups=1,
+                 code_level='8.5.0.0 (build 157.12.2203111203000)',
+                 seed=0):
+        super(Inventory, self).__init__()
+        self.lock = threading.RLock()
+        self.random = random.Random(seed)
+        self.code_level = code_level
+        self.cluster_id = '0000020420E0%04X' % (seed & 0xffff)
+        self.samples = 0
+        self.tables = {}
+        t = self.tables
+        t['lscluster'] = Table(['id', 'name', 'location', 'partnership',
+                                'bandwidth', 'id_alias', 'code_level'])
+        t['lssystem'] = Table(['id', 'name', 'location', 'code_level',
+                               'product_name', 'total_mdisk_capacity'],
+                              sizes=('total_mdisk_capacity',), single=True)
+        t['lscurrentuser'] = Table(['name', 'role'], single=True)
+        t['lsiogrp'] = Table(['id', 'name', 'node_count', 'vdisk_count',
+                              'host_count'])
+        t['lsnode'] = Table(['id', 'name', 'WWNN', 'status', 'IO_group_id',
+                             'IO_group_name', 'config_node', 'panel_name'])
+        t['lsmdiskgrp'] = Table(['id', 'name', 'status', 'mdisk_count',
+                                 'vdisk_count', 'capacity', 'extent_size',
+                                 'free_capacity'],
+                                sizes=('capacity', 'free_capacity'))
+        t['lshost'] = Table(['id', 'name', 'port_count', 'iogrp_count',
+                             'status'])
+        t['lsvdisk'] = Table(
+            ['id', 'name', 'IO_group_id', 'IO_group_name', 'status',
+             'mdisk_grp_id', 'mdisk_grp_name', 'capacity', 'type', 'FC_id',
+             'FC_name', 'RC_id', 'RC_name', 'vdisk_UID', 'fc_map_count',
+             'copy_count', 'fast_write_state', 'se_copy_count',
+             'compressed_copy_count'],
+            sizes=('capacity',))
+        t['lshostvdiskmap'] = Table(['id', 'name', 'SCSI_id', 'vdisk_id',
+                                     'vdisk_name', 'vdisk_UID'],
+                                    detail=False)
+        t['lsvdiskhostmap'] = Table(['id', 'name', 'SCSI_id', 'host_id',
+                                     'host_name', 'vdisk_UID'],
+                                    detail=False)
+        t['lsdumps'] = Table(['id', 'filename'], detail=False)
+        self.populate(vdisks, hosts, pools, io_groups)
+
+    def populate(self, vdisks, hosts, pools, io_groups):
+        t = self.tables
+        capacity = 256 * 1024 ** 4
+        t['lscluster'].add(id=self.cluster_id, name='fakesvc',
+                           location='local', id_alias=self.cluster_id,
+                           code_level=self.code_level)
+        t['lssystem'].add(id=self.cluster_id, name='fakesvc',
+                          location='local', code_level=self.code_level,
+                          product_name='IBM FlashSystem',
+                          total_mdisk_capacity=capacity * pools)
+        t['lscurrentuser'].add(name=DEFAULT_USERNAME, role='SecurityAdmin')
+        for i in range(io_groups):
+            t['lsiogrp'].add(id=i, name='io_grp%d' % i, node_count=2,
+                             vdisk_count=0, host_count=hosts)
+            for j in (1, 2):
+                n = t['lsnode'].add(
+                    name='node%d' % (i * 2 + j), WWNN='500507680C00%04X' % (
+                        i * 2 + j), status='online', IO_group_id=i,
+                    IO_group_name='io_grp%d' % i,
+                    config_node='yes' if i == 0 and j == 1 else 'no',
+                    panel_name='78G%05d' % (i * 2 + j))
+                for kind in ('Nv', 'Nn'):
+                    self.add_dump(kind, t['lsnode'].find(str(n))[0])
+        for i in range(pools):
+            t['lsmdiskgrp'].add(id=i, name='pool%d' % i, status='online',
+                                mdisk_count=4, vdisk_count=0,
+                                capacity=capacity, extent_size=1024,
+                                free_capacity=capacity)
+        for i in range(hosts):
+            t['lshost'].add(id=i, name='host%d' % i, port_count=2,
+                            iogrp_count=io_groups, status='online')
+        for i in range(vdisks):
+            self.add_vdisk('vdisk%d' % i, 'pool%d' % (i % max(pools, 1)),
+                           1024 ** 3 * (1 + i % 16), i % max(io_groups, 1))
+
+    def add_dump(self, kind, node):
+        name = '%s_stats_%s_%s' % (kind, node[7],
+                                   time.strftime('%y%m%d_%H%M%S'))
+        self.tables['lsdumps'].add(filename='%s/%s' % (IOSTATS_DIR, name))
+
+    def add_vdisk(self, name, pool, size, iogrp=0):
+        '''Add a volume and return its id, or None if the pool does not
+           exist.'''
+        with self.lock:
+            found = self.tables['lsmdiskgrp'].find(str(pool))
+            if not found:
+                return None
+            vdisks = self.tables['lsvdisk']
+            vid = vdisks.next_id
+            return vdisks.add(
+                id=vid, name=name or 'vdisk%d' % vid, IO_group_id=iogrp,
+                IO_group_name='io_grp%s' % iogrp, status='online',
+                mdisk_grp_id=found[0][0], mdisk_grp_name=found[0][1],
+                capacity=size, type='striped',
+                vdisk_UID='600507680C8080%018X' % vid, fc_map_count=0,
+                copy_count=1, fast_write_state='empty', se_copy_count=0,
+                compressed_copy_count=0)
+
+    def dump(self, path):
+        '''Return the content of a synthetic iostats dump, or None.'''
+        with self.lock:
+            if not self.tables['lsdumps'].select('filename=' + path):
+                return None
+            self.samples += 1
+            kind = os.path.basename(path)[:2]
+            rand = self.random
+            lines = ['<?xml version="1.0" encoding="UTF-8"?>']
+            if kind == 'Nv':
+                lines.append('<diskStatsColl cluster="fakesvc" '
+                             'cluster_id="%s" sizeUnits="512B" '
+                             'timeUnits="msec" sample="%d">' %
+                             (self.cluster_id, self.samples))
+                for row in self.tables['lsvdisk'].rows.values():
+                    n = self.samples * (int(row[0]) % 97 + 1)
+                    lines.append(
+                        '<vdsk idx="%s" id="%s" ro="%d" wo="%d" rb="%d" '
+                        'wb="%d" rl="%d" wl="%d"/>' %
+                        (row[0], row[1], n, n // 2, n * 16, n * 8,
+                         rand.randint(0, 2000), rand.randint(0, 4000)))
+                lines.append('</diskStatsColl>')
+            else:
+                lines.append('<diskStatsColl cluster="fakesvc" '
+                             'cluster_id="%s" sample="%d">' %
+                             (self.cluster_id, self.samples))
+                lines.append('<cpu busy="%d" comp="0" system="%d"/>' %
+                             (rand.randint(0, 100), rand.randint(0, 100)))
+                lines.append('</diskStatsColl>')
+            return '\n'.join(lines) + '\n'
+
+
+class _Fault(object):
+    def __init__(self, pattern, rc, message, times, probability):
+        super(_Fault, self).__init__()
+        self.pattern = re.compile(pattern)
+        self.rc = rc
+        self.message = message
+        self.times = times
+        self.probability = probability
+
+
+class FakeSVC(object):
+    '''Command interpreter of the fake storage array.
+
+    :param inventory: (optional) The objects of storage array.
+    :type inventory: :py:class:`.Inventory`
+    :param spec: (optional) The file name of CLI specification XML returned
+                 by "catxmlspec", it is the svc-6.3.xml in tests by default,
+                 which exists in the source tree only.
+    :type spec: str
+    :raise ValueError: if the specification file does not exist.
+    :param latency: (optional) The delay of every command in seconds, or
+                    the range (min, max) of a random delay, it is 0 by
+                    default.
+    :type latency: float or tuple
+    '''
+
+    def __init__(self, inventory=None, spec=None, latency=0.0,
+                 seed=None):
+        super(FakeSVC, self).__init__()
+        spec = spec or DEFAULT_SPEC
+        if not os.path.isfile(spec):
+            raise ValueError(
+                'The CLI specification "%s" does not exist, pass spec with '
+                'the XML returned by "catxmlspec" of a storage array.' % spec)
+        self.inventory = inventory if inventory is not None else Inventory()
+        self.spec = spec
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.faults = []
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        self._spec_data = None
+        self._commands = None
+
+    def inject(self, pattern, rc=1, message='CMMVC5786E The action failed '
+               'because the cluster is not in a stable state.', times=None,
+               probability=1.0):
+        '''Fail the commands matching the regular expression pattern.
+
+        :param rc: (optional) The return code, it is 1 by default.
+        :type rc: int
+        :param times: (optional) The max number of failures, None for no
+                      limit.
+        :type times: int
+        :param probability: (optional) The probability of failure, it is 1
+                            by default.
+        :type probability: float
+        '''
+        with self.lock:
+            self.faults.append(_Fault(pattern, rc, message, times,
+                                      probability))
+
+    def delay(self):
+        '''Return the injected latency of a command in seconds.'''
+        if isinstance(self.latency, (tuple, list)):
+            return self.random.uniform(*self.latency)
+        return self.latency
+
+    def _fault(self, line):
+        with self.lock:
+            for fault in self.faults:
+                if fault.times is not None and fault.times <= 0:
+                    continue
+                if not fault.pattern.search(line):
+                    continue
+                if self.random.random() >= fault.probability:
+                    continue
+                if fault.times is not None:
+                    fault.times -= 1
+                return fault
+        return None
+
+    def execute(self, line):
+        '''Execute a command line of the restricted shell.
+
+        Commands can be sequenced by ";" and "||", and "echo" expands "$?".
+
+        :return: stdout, stderr and the exit status.
+        :rtype: tuple
+        '''
+        lexer = shlex.shlex(line, posix=True, punctuation_chars=';|&')
+        lexer.whitespace_split = True
+        try:
+            tokens = list(lexer)
+        except ValueError as ex:
+            return '', 'rbash: syntax error: %s\n' % ex, 2
+        stdout, stderr = [], []
+        rc, skip, cmd = 0, False, []
+        for tk in tokens + [';']:
+            if tk not in (';', '||'):
+                cmd.append(tk)
+                continue
+            if cmd and not skip:
+                out, err, rc = self._run(cmd, rc)
+                stdout.append(out)
+                stderr.append(err)
+            # the commands after "||" run only if the previous one fails,
+            # a skipped command keeps the return code
+            skip = tk == '||' and rc == 0
+            cmd = []
+        return ''.join(stdout), ''.join(stderr), rc
+
+    def _run(self, args, last_rc):
+        if args[0] == 'echo':
+            return ' '.join(str(last_rc) if a == '$?' else a
+                            for a in args[1:]) + '\n', '', 0
+        if args[0] in EXECUTABLES:
+            args = args[1:]
+        if not args:
+            return '', ERR_MISSING + '\n', 1
+        name = args[0]
+        self.calls[name] += 1
+        fault = self._fault(' '.join(args))
+        if fault is not None:
+            return '', fault.message + '\n', fault.rc
+        if name == 'catxmlspec':
+            return self.spec_data, '', 0
+        opts, objs = self.parse_args(args[1:])
+        handler = getattr(self, 'do_' + name, None)
+        if handler is not None:
+            return handler(opts, objs)
+        if name in self.inventory.tables:
+            return self.list(name, opts, objs)
+        if name in self.commands:
+            # the other listings are empty and the other tasks are accepted
+            return '', '', 0
+        return '', 'rbash: %s: command not found\n' % name, 127
+
+    @property
+    def spec_data(self):
+        if self._spec_data is None:
+            with open(self.spec) as f:
+                self._spec_data = f.read()
+        return self._spec_data
+
+    @property
+    def commands(self):
+        '''The names of commands in the CLI specification.'''
+        if self._commands is None:
+            self._commands = set(PATTERN_COMMAND.findall(self.spec_data))
+        return self._commands
+
+    @staticmethod
+    def parse_args(args):
+        opts, objs, i = {}, [], 0
+        while i < len(args):
+            a = args[i]
+            if a.startswith('-') and len(a) > 1:
+                if (a in FLAGS or i + 1 == len(args)
+                        or re.match('^-[a-z]', args[i + 1])):
+                    opts[a[1:]] = True
+                    i += 1
+                else:
+                    opts[a[1:]] = args[i + 1]
+                    i += 2
+            else:
+                objs.append(a)
+                i += 1
+        return opts, objs
+
+    def list(self, name, opts, objs):
+        table = self.inventory.tables.get(name)
+        if table is None:
+            return '', '', 0
+        delim = opts.get('delim', DEFAULT_DELIM)
+        in_bytes = 'bytes' in opts
+        header = 'nohdr' not in opts
+        with self.inventory.lock:
+            if 'filtervalue?' in opts:
+                # the attributes accepted by -filtervalue
+                return '\n'.join(table.columns) + '\n', '', 0
+            if table.single:
+                rows = list(table.rows.values())[:1]
+                return (table.render_detail(rows[0], delim, in_bytes)
+                        if rows else ''), '', 0
+            if objs:
+                rows = table.find(objs[-1])
+                if table.detail:
+                    if not rows:
+                        return '', ERR_NOT_EXIST + '\n', 1
+                    return table.render_detail(rows[0], delim, in_bytes), \
+                        '', 0
+            elif 'filtervalue' in opts:
+                try:
+                    rows = table.select(opts['filtervalue'])
+                except KeyError as ex:
+                    return '', ERR_BAD_PARAM % ex.args[0] + '\n', 1
+            else:
+                rows = None
+            if rows is not None and not rows:
+                return '', '', 0
+            return table.render(rows, delim, header, in_bytes), '', 0
+
+    def do_lsdumps(self, opts, objs):
+        prefix = opts.get('prefix', '/dumps')
+        table = self.inventory.tables['lsdumps']
+        rows = [row for row in table.rows.values()
+                if row[1].startswith(prefix.rstrip('/') + '/')]
+        if not rows:
+            return '', '', 0
+        # the file names are relative to the prefix
+        rel = [(row[0], os.path.relpath(row[1], prefix)) for row in rows]
+        return table.render(rel, opts.get('delim', DEFAULT_DELIM),
+                            'nohdr' not in opts), '', 0
+
+    def do_mkvdisk(self, opts, objs, noun='Virtual Disk'):
+        inv = self.inventory
+        pool = opts.get('mdiskgrp', opts.get('pool'))
+        if pool is None or 'size' not in opts:
+            return '', ERR_MISSING + '\n', 1
+        name = opts.get('name')
+        with inv.lock:
+            if name and inv.tables['lsvdisk'].find(name):
+                return '', ERR_NAME_EXIST + '\n', 1
+            vid = inv.add_vdisk(name, pool,
+                                parse_size(opts['size'],
+                                           opts.get('unit', 'mb')),
+                                opts.get('iogrp', 0))
+        if vid is None:
+            return '', ERR_NO_POOL + '\n', 1
+        return '%s, id [%s], successfully created\n' % (noun, vid), '', 0
+
+    def do_mkvolume(self, opts, objs):
+        return self.do_mkvdisk(opts, objs, 'Volume')
+
+    def do_rmvdisk(self, opts, objs):
+        inv = self.inventory
+        with inv.lock:
+            if not objs or not inv.tables['lsvdisk'].remove(objs[-1]):
+                return '', ERR_NOT_EXIST + '\n', 1
+            inv.tables['lsvdiskhostmap'].remove(objs[-1])
+        return '', '', 0
+
+    do_rmvolume = do_rmvdisk
+
+    def do_mkhost(self, opts, objs):
+        inv = self.inventory
+        with inv.lock:
+            hosts = inv.tables['lshost']
+            name = opts.get('name') or 'host%d' % hosts.next_id
+            if hosts.find(name):
+                return '', ERR_NAME_EXIST + '\n', 1
+            hid = hosts.add(name=name, port_count=1, iogrp_count=1,
+                            status='offline')
+        return 'Host, id [%s], successfully created\n' % hid, '', 0
+
+    def do_rmhost(self, opts, objs):
+        inv = self.inventory
+        with inv.lock:
+            if not objs or not inv.tables['lshost'].remove(objs[-1]):
+                return '', ERR_NOT_EXIST + '\n', 1
+            inv.tables['lshostvdiskmap'].remove(objs[-1])
+        return '', '', 0
+
+    def do_mkvdiskhostmap(self, opts, objs):
+        inv = self.inventory
+        if 'host' not in opts or not objs:
+            return '', ERR_MISSING + '\n', 1
+        with inv.lock:
+            hosts = inv.tables['lshost'].find(opts['host'])
+            vdisks = inv.tables['lsvdisk'].find(objs[-1])
+            if not hosts or not vdisks:
+                return '', ERR_NOT_EXIST + '\n', 1
+            host, vdisk = hosts[0], vdisks[0]
+            hostmap = inv.tables['lshostvdiskmap']
+            scsi = opts.get('scsi', len(hostmap.find(str(host[0]))))
+            uid = inv.tables['lsvdisk'].value(vdisk, 'vdisk_UID')
+            hostmap.rows[(str(host[0]), str(vdisk[0]))] = (
+                host[0], host[1], scsi, vdisk[0], vdisk[1], uid)
+            hostmap._rendered.clear()
+            vdiskmap = inv.tables['lsvdiskhostmap']
+            vdiskmap.rows[(str(vdisk[0]), str(host[0]))] = (
+                vdisk[0], vdisk[1], scsi, host[0], host[1], uid)
+            vdiskmap._rendered.clear()
+        return ('Virtual Disk to Host map, id [%s], successfully created\n'
+                % scsi, '', 0)
+
+    def do_rmvdiskhostmap(self, opts, objs):
+        inv = self.inventory
+        if 'host' not in opts or not objs:
+            return '', ERR_MISSING + '\n', 1
+        with inv.lock:
+            hosts = inv.tables['lshost'].find(opts['host'])
+            vdisks = inv.tables['lsvdisk'].find(objs[-1])
+            key = (str(hosts[0][0]) if hosts else None,
+                   str(vdisks[0][0]) if vdisks else None)
+            hostmap = inv.tables['lshostvdiskmap']
+            if key not in hostmap.rows:
+                return '', ERR_NOT_EXIST + '\n', 1
+            del hostmap.rows[key]
+            del inv.tables['lsvdiskhostmap'].rows[(key[1], key[0])]
+            hostmap._rendered.clear()
+            inv.tables['lsvdiskhostmap']._rendered.clear()
+        return '', '', 0
+
+
+_host_key = None
+_host_key_lock = threading.Lock()
+
+
+def _default_host_key():
+    global _host_key
+    with _host_key_lock:
+        if _host_key is None:
+            _host_key = paramiko.ECDSAKey.generate()
+        return _host_key
+
+
+class _ServerInterface(paramiko.ServerInterface):
+    def __init__(self, server):
+        super(_ServerInterface, self).__init__()
+        self.server = server
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def get_allowed_auths(self, username):
+        return 'password,publickey'
+
+    def check_auth_password(self, username, password):
+        if (username == self.server.username
+                and password == self.server.password):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_auth_publickey(self, username, key):
+        if (username == self.server.username
+                and key in self.server.authorized_keys):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_exec_request(self, channel, command):
+        if isinstance(command, bytes):
+            command = command.decode()
+        th = threading.Thread(target=self.server.handle,
+                              args=(channel, command))
+        th.daemon = True
+        th.start()
+        return True
+
+    def check_channel_shell_request(self, channel):
+        th = threading.Thread(target=self.server.handle_shell,
+                              args=(channel,))
+        th.daemon = True
+        th.start()
+        return True
+
+
+class FakeSVCServer(object):
+    '''SSH server of a :py:class:`.FakeSVC`.
+
+    :param svc: (optional) The fake storage array, it is created with the
+                other keyword arguments by default.
+    :type svc: :py:class:`.FakeSVC`
+    :param host: (optional) The listening address, it is "127.0.0.1" by
+                 default.
+    :type host: str
+    :param port: (optional) The listening port, 0 (by default) to pick a free
+                 one.
+    :type port: int
+    :param username: (optional) The login user, it is "superuser" by
+                     default.
+    :type username: str
+    :param password: (optional) The login password.
+    :type password: str
+    :param authorized_keys: (optional) The public keys of login user.
+    :type authorized_keys: list
+    :param host_key: (optional) The host key, it is generated by default.
+    :type host_key: :py:class:`paramiko.PKey`
+    '''
+
+    def __init__(self, svc=None, host='127.0.0.1', port=0,
+                 username=DEFAULT_USERNAME, password=DEFAULT_PASSWORD,
+                 authorized_keys=(), host_key=None, **kwargs):
+        super(FakeSVCServer, self).__init__()
+        self.svc = svc if svc is not None else FakeSVC(**kwargs)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.authorized_keys = list(authorized_keys)
+        self.host_key = host_key
+        self.sock = None
+        self.thread = None
+        self.transports = []
+        self.lock = threading.Lock()
+        self.running = False
+        self.linger = 60.0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.stop()
+
+    def start(self):
+        '''Listen and serve in a background thread.'''
+        if self.host_key is None:
+            self.host_key = _default_host_key()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.listen(100)
+        self.port = self.sock.getsockname()[1]
+        self.running = True
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.daemon = True
+        self.thread.start()
+        xlog.info('The fake SVC is listening on %s:%d.' %
+                  (self.host, self.port))
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.sock is not None:
+            try:
+                # wake up the accepting thread
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+        with self.lock:
+            transports, self.transports = self.transports, []
+        for t in transports:
+            t.close()
+        if self.thread is not None:
+            self.thread.join(5)
+            self.thread = None
+
+    def _serve(self):
+        while self.running:
+            try:
+                client, _ = self.sock.accept()
+            except (OSError, AttributeError):
+                break
+            th = threading.Thread(target=self._start_transport,
+                                  args=(client,))
+            th.daemon = True
+            th.start()
+
+    def _start_transport(self, client):
+        # like sshd for interactive sessions
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        t = paramiko.Transport(client)
+        t.add_server_key(self.host_key)
+        with self.lock:
+            self.transports.append(t)
+        try:
+            t.start_server(server=_ServerInterface(self))
+        except (paramiko.SSHException, EOFError, OSError):
+            xlog.debug('The SSH negotiation with fake SVC failed.')
+            t.close()
+
+    def handle(self, channel, command):
+        '''Execute the command of a channel.'''
+        try:
+            delay = self.svc.delay()
+            if delay > 0:
+                time.sleep(delay)
+            tokens = command.split()
+            if tokens[:1] == ['scp'] and '-f' in tokens:
+                rc = self._send_file(channel, tokens[-1])
+            else:
+                stdout, stderr, rc = self.svc.execute(command)
+                channel.sendall(stdout.encode())
+                channel.sendall_stderr(stderr.encode())
+            channel.send_exit_status(rc)
+            channel.shutdown_write()
+            # The exec request may be acknowledged after the output is sent,
+            # so wait for the client to close the channel before closing it.
+            channel.settimeout(self.linger)
+            while channel.recv(4096):
+                pass
+        except socket.timeout:
+            pass
+        except (socket.error, EOFError):
+            xlog.debug('The client closed the channel of "%s".' % command)
+        except Exception:
+            xlog.exception('The fake SVC failed to execute "%s".' % command)
+        finally:
+            channel.close()
+
+    def handle_shell(self, channel):
+        '''Execute the lines received by a shell channel one by one.'''
+        buf = b''
+        try:
+            while True:
+                data = channel.recv(4096)
+                if not data:
+                    break
+                buf += data
+                while b'\n' in buf:
+                    line, buf = buf.split(b'\n', 1)
+                    if not line.strip():
+                        continue
+                    delay = self.svc.delay()
+                    if delay > 0:
+                        time.sleep(delay)
+                    stdout, stderr, _ = self.svc.execute(line.decode())
+                    if stdout:
+                        channel.sendall(stdout.encode())
+                    if stderr:
+                        channel.sendall_stderr(stderr.encode())
+        except (socket.error, EOFError):
+            pass
+        except Exception:
+            xlog.exception('The fake SVC shell failed.')
+        finally:
+            channel.close()
+
+    def _send_file(self, channel, path):
+        self.svc.calls['scp'] += 1
+        data = self.svc.inventory.dump(path)
+        channel.recv(1)
+        if data is None:
+            channel.sendall(('\x01scp: %s: No such file or directory\n' %
+                             path).encode())
+            return 1
+        data = data.encode()
+        channel.sendall(('C0644 %d %s\n' % (len(data), os.path.basename(
+            path))).encode())
+        channel.recv(1)
+        channel.sendall(data)
+        channel.sendall(b'\x00')
+        return 0
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Run a fake SVC SSH server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2222)
+    parser.add_argument('--username', default=DEFAULT_USERNAME)
+    parser.add_argument('--password', default=DEFAULT_PASSWORD)
+    parser.add_argument('--spec', help='the CLI specification XML, '
+                        'required unless run in the source tree')
+    parser.add_argument('--vdisks', type=int, default=100)
+    parser.add_argument('--hosts', type=int, default=10)
+    parser.add_argument('--pools', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    try:
+        svc = FakeSVC(Inventory(vdisks=args.vdisks, hosts=args.hosts,
+                                pools=args.pools),
+                      spec=args.spec, latency=args.latency)
+    except ValueError as ex:
+        parser.error(str(ex))
+    server = FakeSVCServer(svc, args.host, args.port, args.username,
+                           args.password).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Hedged requests of read-only commands
+
+A read-only command which is not answered within a percentile of the
+recent latencies of the same CLI command (e.g. lsvdisk) is sent again on a
+second transport, the first answer is used, and the channel of the other is
+closed. The hedges are bounded by a budget, so a slow storage array does not
+receive twice the load.
+
+Example:
+
+>>> from pysvc.unified.hedge import HedgePolicy
+>>> conn = connect('ip', username='admin', password='password',
+...                hedge_policy=HedgePolicy(percentile=0.95))
+>>> conn.svcinfo.lsvdisk()
+'''
+
+import collections
+import threading
+import time
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.instrumentation import event
+from pysvc.transports.ssh_transport import Cancellation
+from pysvc.unified.clispec import command_name
+from pysvc.unified.retry import RetryBudget
+
+__all__ = ['HedgePolicy']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+
+class HedgePolicy(object):
+    '''Send a duplicate of a slow read-only command.
+
+    The latencies are kept per CLI command, so a large listing does not set
+    the delay of a small one.
+
+    :param percentile: (optional) The percentile of recent latencies after
+                       which the duplicate is sent, it is 0.95 by default.
+    :type percentile: float
+    :param window: (optional) The number of recent latencies kept per
+                   command, it is 200 by default.
+    :type window: int
+    :param min_samples: (optional) The number of latencies of a command
+                        needed for the percentile, it is 20 by default.
+    :type min_samples: int
+    :param initial_delay: (optional) The delay in seconds before the
+                          duplicate while latencies of the command are not
+                          enough, it is 1.0 by default.
+    :type initial_delay: float
+    :param min_delay: (optional) The lower bound of delay in seconds, it is
+                      0.005 by default.
+    :type min_delay: float
+    :param budget: (optional) The hedge budget, it allows duplicates of 5%
+                   of the commands by default.
+    :type budget: :py:class:`pysvc.unified.retry.RetryBudget`
+    '''
+
+    def __init__(self, percentile=0.95, window=200, min_samples=20,
+                 initial_delay=1.0, min_delay=0.005, budget=None):
+        super(HedgePolicy, self).__init__()
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.budget = budget if budget is not None else RetryBudget(
+            ratio=0.05, max_tokens=5.0)
+        self.window = window
+        # the recent latencies keyed by CLI name
+        self.latencies = {}
+        self.lock = threading.Lock()
+        self.hedges = 0
+        self.wins = 0
+
+    def delay(self, name=''):
+        '''Return the seconds to wait before sending the duplicate of the
+           command named `name`.'''
+        with self.lock:
+            latencies = self.latencies.get(name, ())
+            if len(latencies) < self.min_samples:
+                return self.initial_delay
+            latencies = sorted(latencies)
+        idx = min(len(latencies) - 1, int(self.percentile * len(latencies)))
+        return max(self.min_delay, latencies[idx])
+
+    def record(self, seconds, name=''):
+        with self.lock:
+            latencies = self.latencies.get(name)
+            if latencies is None:
+                latencies = self.latencies[name] = collections.deque(
+                    maxlen=self.window)
+            latencies.append(seconds)
+
+    def call(self, primary, secondary, cmd=None):
+        '''Call primary in the caller's thread, and secondary in a timer
+           thread if primary is slow, and return the first result.
+
+        :param primary: The function sending the command, which accepts a
+                        Cancellation closing its channel, see
+                        :py:mod:`pysvc.transports.ssh_transport`.
+        :type primary: function
+        :param secondary: The function sending the duplicate, like primary.
+        :type secondary: function
+        :param cmd: (optional) The command line for instrumentation.
+        :type cmd: str
+        '''
+        self.budget.on_request()
+        name = command_name(cmd) if cmd else ''
+        cancels = Cancellation(), Cancellation()
+        cond = threading.Condition()
+        # the result or error of secondary, and who answers first
+        state = {'started': False, 'done': False, 'result': None,
+                 'error': None, 'winner': None}
+
+        def hedge():
+            with cond:
+                if state['winner'] is not None or \
+                        not self.budget.try_spend():
+                    return
+                state['started'] = True
+            with self.lock:
+                self.hedges += 1
+            event('hedge', cmd)
+            try:
+                result = secondary(cancels[1])
+            except Exception as ex:
+                with cond:
+                    state['error'] = ex
+                    state['done'] = True
+                    cond.notify_all()
+                return
+            with cond:
+                state['result'] = result
+                state['done'] = True
+                won = state['winner'] is None
+                if won:
+                    state['winner'] = 'secondary'
+                cond.notify_all()
+            if won:
+                cancels[0].cancel()
+
+        start = time.time()
+        timer = threading.Timer(self.delay(name), hedge)
+        timer.daemon = True
+        timer.start()
+        try:
+            result = primary(cancels[0])
+        except Exception:
+            timer.cancel()
+            with cond:
+                if not state['started']:
+                    state['winner'] = 'primary'
+                # the secondary answers, or may answer
+                cond.wait_for(lambda: state['done'] or not state['started'])
+                if state['started'] and state['error'] is None:
+                    return self._won(state, start, name)
+            raise
+        timer.cancel()
+        with cond:
+            if state['winner'] == 'secondary':
+                # the output of primary is truncated by the cancellation
+                return self._won(state, start, name)
+            state['winner'] = 'primary'
+        cancels[1].cancel()
+        self.record(time.time() - start, name)
+        return result
+
+    def _won(self, state, start, name):
+        with self.lock:
+            self.wins += 1
+        # the latency of primary is at least this
+        self.record(time.time() - start, name)
+        return state['result']
@@ -0,0 +1,187 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Admission control of concurrent CLI commands per storage array
+
+The storage array limits the concurrent CLI sessions of a user. All the
+connections to the same storage array share one
+:py:class:`.AdmissionLimiter`, so the commands beyond `max_in_flight` wait in
+the client instead of failing in the storage array. The waiting svctask
+commands are admitted before the waiting read-only commands.
+
+Example:
+
+>>> conn = connect('ip', username='admin', password='password',
+...                max_in_flight=4)
+>>> conn.limiter.stats()
+{'interactive': {'admitted': 3, 'queued': 0, 'timeouts': 0,
+                 'wait_total': 0.0, 'wait_max': 0.0, 'wait_mean': 0.0},
+ 'bulk': {...}, 'in_flight': 1}
+'''
+
+import threading
+import time
+from contextlib import contextmanager
+import pysvc.errors as ce
+from pysvc.unified.clispec import is_read_only
+
+__all__ = ['AdmissionLimiter', 'AdmissionTimeoutError', 'get_limiter',
+           'lane_of']
+
+DEFAULT_MAX_IN_FLIGHT = 4
+LANE_INTERACTIVE = 'interactive'
+LANE_BULK = 'bulk'
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+
+class AdmissionTimeoutError(ce.StorageArrayClientException):
+    '''Raise if a command is not admitted in time.'''
+    pass
+
+
+class _LaneStats(object):
+    def __init__(self):
+        super(_LaneStats, self).__init__()
+        self.admitted = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def as_dict(self):
+        return {
+            'admitted': self.admitted,
+            'queued': self.queued,
+            'timeouts': self.timeouts,
+            'wait_total': self.wait_total,
+            'wait_max': self.wait_max,
+            'wait_mean': (self.wait_total / self.admitted
+                          if self.admitted else 0.0),
+        }
+
+
+class AdmissionLimiter(object):
+    '''Bound the commands in flight to a storage array.
+
+    :param max_in_flight: (optional) The max number of commands in flight,
+                          it is 4 by default.
+    :type max_in_flight: int
+    :param timeout: (optional) The max time in seconds to wait for
+                    admission, None to wait forever, it is None by default.
+    :type timeout: float
+    '''
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=None,
+                 clock=time.time):
+        super(AdmissionLimiter, self).__init__()
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.clock = clock
+        self.in_flight = 0
+        self.lanes = dict((lane, _LaneStats()) for lane in LANES)
+        self.cond = threading.Condition()
+
+    def _admissible(self, lane):
+        if self.in_flight >= self.max_in_flight:
+            return False
+        # the bulk lane yields to the waiting interactive commands
+        return (lane == LANE_INTERACTIVE
+                or not self.lanes[LANE_INTERACTIVE].queued)
+
+    def acquire(self, lane=LANE_INTERACTIVE, timeout=None):
+        '''Wait until a command of the lane is admitted.
+
+        :raise AdmissionTimeoutError: if it is not admitted in time.
+        '''
+        stats = self.lanes[lane]
+        timeout = self.timeout if timeout is None else timeout
+        start = self.clock()
+        with self.cond:
+            stats.queued += 1
+            try:
+                while not self._admissible(lane):
+                    remaining = None
+                    if timeout is not None:
+                        remaining = start + timeout - self.clock()
+                        if remaining <= 0:
+                            stats.timeouts += 1
+                            raise AdmissionTimeoutError(
+                                'The command is not admitted in %s seconds, '
+                                '%d commands are in flight.' %
+                                (timeout, self.in_flight))
+                    self.cond.wait(remaining)
+            finally:
+                stats.queued -= 1
+            self.in_flight += 1
+            wait = self.clock() - start
+            stats.admitted += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+
+    def release(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    @contextmanager
+    def slot(self, lane=LANE_INTERACTIVE, timeout=None):
+        '''Hold an admission while in the `with` block.'''
+        self.acquire(lane, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def resize(self, max_in_flight):
+        with self.cond:
+            self.max_in_flight = max_in_flight
+            self.cond.notify_all()
+
+    def stats(self):
+        '''Return the queue wait time metrics of lanes in seconds.'''
+        with self.cond:
+            result = dict((lane, stats.as_dict())
+                          for lane, stats in self.lanes.items())
+            result['in_flight'] = self.in_flight
+            return result
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host, max_in_flight=None, **kwargs):
+    '''Return the limiter shared by all connections to the host.
+
+    The max_in_flight of an existing limiter is changed if it is given.
+    '''
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = AdmissionLimiter(
+                max_in_flight or DEFAULT_MAX_IN_FLIGHT, **kwargs)
+        elif max_in_flight and max_in_flight != limiter.max_in_flight:
+            limiter.resize(max_in_flight)
+        return limiter
+
+
+def lane_of(cmd):
+    '''Return the lane of a command line: "bulk" if all of its commands are
+       read-only, otherwise "interactive".'''
+    for part in cmd.split(';'):
+        part = part.strip()
+        if part and not part.startswith('echo ') and not is_read_only(part):
+            return LANE_INTERACTIVE
+    return LANE_BULK
@@ -0,0 +1,257 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Bulk provisioning of volumes and host mappings
+
+Example:
+
+>>> from pysvc.unified.provision import provision
+>>> report = provision(
+...     conn,
+...     volumes=[dict(name='v%d' % i, pool='p1', size=1, unit='gb')
+...              for i in range(1000)],
+...     mappings=[dict(host='h1', vdisk='v%d' % i) for i in range(1000)])
+>>> len(report.succeeded), len(report.failed), report.ops_per_second
+(2000, 0, 85.3)
+'''
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.unified.clispec import CLISpecError
+from pysvc.unified.retry import DEFAULT_RETRY_POLICY
+
+__all__ = ['provision', 'ProvisioningPipeline', 'ProvisionReport',
+           'AdaptiveBackoff']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+class AdaptiveBackoff(object):
+    '''Delay shared by the workers before sending a batch.
+
+    The delay is multiplied by `factor` on every busy return code, and is
+    divided by `factor` on every success until it drops below `initial`.
+    '''
+
+    def __init__(self, initial=0.1, maximum=5.0, factor=2.0,
+                 sleep=time.sleep):
+        super(AdaptiveBackoff, self).__init__()
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.sleep = sleep
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    def on_busy(self):
+        with self.lock:
+            self.delay = min(self.maximum,
+                             max(self.initial, self.delay * self.factor))
+
+    def on_success(self):
+        with self.lock:
+            self.delay /= self.factor
+            if self.delay < self.initial:
+                self.delay = 0.0
+
+    def wait(self):
+        delay = self.delay
+        if delay > 0:
+            self.sleep(delay)
+
+
+class ProvisionReport(object):
+    '''The result of provisioning.
+
+    * succeeded: list of (command name, spec, response)
+    * failed: list of (command name, spec, error)
+    * skipped: list of (command name, spec) whose volume failed
+    '''
+
+    def __init__(self):
+        super(ProvisionReport, self).__init__()
+        self.succeeded = []
+        self.failed = []
+        self.skipped = []
+        self.retries = 0
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not (self.failed or self.skipped)
+
+    @property
+    def ops_per_second(self):
+        '''The succeeded commands per second.'''
+        return len(self.succeeded) / self.elapsed if self.elapsed else 0.0
+
+
+class ProvisioningPipeline(object):
+    '''Create volumes, then map them to hosts, with bounded concurrency.
+
+    The specs are sent in batches (see :py:class:`pysvc.unified.batch.Batch`)
+    by at most `max_workers` threads. A command which fails transiently,
+    e.g. returns METADATA_RC_BUSY, is re-queued and the workers slow down
+    adaptively.
+
+    :param client: The connection.
+    :type client: :py:class:`pysvc.unified.client.UnifiedSSHClient`
+    :param max_workers: (optional) The max number of concurrent batches,
+                        it is 4 by default.
+    :type max_workers: int
+    :param batch_size: (optional) The max number of commands in a batch,
+                       it is 10 by default.
+    :type batch_size: int
+    :param max_attempts: (optional) The max attempts of a command which
+                         fails transiently, it is 5 by default.
+    :type max_attempts: int
+    :param backoff: (optional) The shared delay of workers.
+    :type backoff: :py:class:`.AdaptiveBackoff`
+    :param volume_command: (optional) The svctask command creating a
+                           volume, it is "mkvolume" by default.
+    :type volume_command: str
+    :param mapping_command: (optional) The svctask command mapping a volume
+                            to a host, it is "mkvdiskhostmap" by default.
+    :type mapping_command: str
+    '''
+
+    def __init__(
+            self,
+            client,
+            max_workers=DEFAULT_MAX_WORKERS,
+            batch_size=DEFAULT_BATCH_SIZE,
+            max_attempts=DEFAULT_MAX_ATTEMPTS,
+            backoff=None,
+            volume_command='mkvolume',
+            mapping_command='mkvdiskhostmap'):
+        super(ProvisioningPipeline, self).__init__()
+        self.client = client
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff or AdaptiveBackoff()
+        # only classifies the errors, the backoff is adaptive
+        self.retry_policy = client.retry_policy or DEFAULT_RETRY_POLICY
+        self.volume_command = volume_command
+        self.mapping_command = mapping_command
+
+    def find_command(self, name):
+        cmd = getattr(getattr(self.client.specification, 'svctask', None),
+                      name, None)
+        if cmd is None:
+            raise CLISpecError('The command "svctask %s" is not supported.' %
+                               name)
+        return cmd
+
+    def run(self, volumes=(), mappings=()):
+        '''Create the volumes and then the mappings.
+
+        :param volumes: The kwargs of volume command, e.g.
+                        [dict(name='v1', pool='p1', size=1, unit='gb')].
+        :type volumes: list
+        :param mappings: The kwargs of mapping command, e.g.
+                         [dict(host='h1', vdisk='v1')]. A mapping of a
+                         volume which fails to be created is skipped.
+        :type mappings: list
+        :return: The report.
+        :rtype: :py:class:`.ProvisionReport`
+        '''
+        report = ProvisionReport()
+        start = time.time()
+        if volumes:
+            self._run_phase(self.find_command(self.volume_command), volumes,
+                            report)
+        if mappings:
+            bad = set(spec.get('name') for _, spec, _ in report.failed)
+            bad.discard(None)
+            todo = []
+            for spec in mappings:
+                if bad and (spec.get('vdisk') in bad or
+                            spec.get('vdisk_name') in bad):
+                    report.skipped.append((self.mapping_command, spec))
+                else:
+                    todo.append(spec)
+            if todo:
+                self._run_phase(self.find_command(self.mapping_command),
+                                todo, report)
+        report.elapsed = time.time() - start
+        return report
+
+    def _chunks(self, items):
+        return [items[i:i + self.batch_size]
+                for i in range(0, len(items), self.batch_size)]
+
+    def _run_phase(self, command, specs, report):
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            futures = set(pool.submit(self._run_batch, command, chunk)
+                          for chunk in self._chunks([(s, 1) for s in specs]))
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                retry = []
+                for f in done:
+                    for spec, attempt, resp, error in f.result():
+                        if error is None:
+                            report.succeeded.append(
+                                (command.name, spec, resp))
+                        elif (self.retry_policy.is_retryable(error)
+                              and attempt < self.max_attempts):
+                            retry.append((spec, attempt + 1))
+                        else:
+                            report.failed.append((command.name, spec, error))
+                report.retries += len(retry)
+                futures.update(pool.submit(self._run_batch, command, chunk)
+                               for chunk in self._chunks(retry))
+
+    def _run_batch(self, command, items):
+        self.backoff.wait()
+        batch = self.client.batch(max_commands=self.batch_size)
+        queued = []
+        for spec, attempt in items:
+            try:
+                queued.append((spec, attempt, batch.add(command, dict(spec))))
+            except Exception as ex:
+                queued.append((spec, attempt, ex))
+        batch.send()
+        outcome = []
+        for spec, attempt, r in queued:
+            if isinstance(r, Exception):
+                outcome.append((spec, attempt, None, r))
+                continue
+            error = r.error
+            if error is None:
+                self.backoff.on_success()
+            elif self.retry_policy.is_retryable(error):
+                self.backoff.on_busy()
+            outcome.append((spec, attempt, None if error else r.response,
+                            error))
+        return outcome
+
+
+def provision(client, volumes=(), mappings=(), **kwargs):
+    '''Create volumes and host mappings in bulk.
+
+    See :py:class:`.ProvisioningPipeline` for the optional parameters.
+
+    :return: The report.
+    :rtype: :py:class:`.ProvisionReport`
+    '''
+    return ProvisioningPipeline(client, **kwargs).run(volumes, mappings)
@@ -0,0 +1,259 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Queries of listings with predicates pushed down to the storage array
+
+A predicate on an attribute accepted by the -filtervalue parameter of the
+command is sent in -filtervalue, so the storage array returns the matching
+rows only. The other predicates are applied to the parsed rows. The
+attributes accepted are listed by "<command> -filtervalue?" once per
+storage array and command.
+
+A predicate is one of:
+
+* a str or int, which equals the attribute. A str may end with the wildcard
+  "*", e.g. "vdisk*".
+* a list, tuple or set of the values, one of which equals the attribute.
+* a callable accepting the attribute value, which returns True if the row
+  matches.
+
+Only a str or int made of letters, digits, ".", "-", "_" and "/" is pushed
+down.
+
+A large listing is fetched faster in disjoint -filtervalue partitions,
+e.g. by storage pool, which are sent concurrently in their own channels
+and parsed in worker threads, see :py:func:`.fetch_partitioned`.
+
+Example:
+
+>>> conn.svcinfo.lsvdisk.where(mdisk_grp_name='p1', status='online')
+[Munch(..., name='v1', ...), ...]
+>>> conn.svcinfo.lsvdisk.where({'bytes': True}, name='db*',
+...                            capacity=lambda c: int(c) > 2 ** 40)
+>>> conn.svcinfo.lsvdisk.partitioned('mdisk_grp_id', bytes=True).as_list
+[Munch(..., name='v0', ...), ...]
+'''
+
+import copy
+import fnmatch
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+import pysvc.errors as ce
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.unified.clispec import CLICommand, CLISpecError
+
+__all__ = ['where', 'split_predicates', 'matches', 'fetch_partitioned']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+PATTERN_PUSHDOWN = re.compile(r'^[\w.\-/]+\*?$')
+
+# the attributes accepted by -filtervalue per (host, port, command), and the
+# time until which a failed probe is not repeated, or None once it succeeded
+_filter_attributes = {}
+# seconds before a failed probe of the attributes is sent again
+FAILED_PROBE_TTL = 60
+
+DEFAULT_PARTITION_WORKERS = 8
+# the listing and its column of the partition values of an attribute, and
+# the extra value, e.g. the mdisk_grp_id of a volume with copies in two
+# pools is "many"
+PARTITION_SOURCES = {
+    'mdisk_grp_id': ('lsmdiskgrp', 'id', 'many'),
+    'mdisk_grp_name': ('lsmdiskgrp', 'name', 'many'),
+    'IO_group_id': ('lsiogrp', 'id', None),
+    'IO_group_name': ('lsiogrp', 'name', None),
+}
+
+
+def filter_attributes(client, command):
+    '''Return the attributes accepted by the -filtervalue parameter of the
+       command, which are asked once per storage array. A failed probe is
+       sent again after `FAILED_PROBE_TTL` seconds.'''
+    if client is None or 'filtervalue' not in command.params:
+        return frozenset()
+    transport = client.transport
+    key = (getattr(transport, 'host', None), getattr(transport, 'port', None),
+           command.realname)
+    cached = _filter_attributes.get(key)
+    if cached is not None:
+        attrs, until = cached
+        if until is None or time.monotonic() < until:
+            return attrs
+    attrs, until = frozenset(), time.monotonic() + FAILED_PROBE_TTL
+    try:
+        stdout, stderr = client.send_raw_command(
+            '%s -filtervalue?' % command.realname)
+        if isinstance(stdout, bytes):
+            stdout = stdout.decode()
+        if stderr:
+            xlog.debug('Fail to list the filter attributes of %s: %s' %
+                       (command.realname, stderr))
+        else:
+            attrs, until = frozenset(stdout.split()), None
+    except ce.StorageArrayClientException as ex:
+        xlog.debug('Fail to list the filter attributes of %s: %s' %
+                   (command.realname, ex))
+    _filter_attributes[key] = (attrs, until)
+    return attrs
+
+
+def split_predicates(predicates, attributes):
+    '''Return the -filtervalue expression of the predicates pushed down, and
+       the remaining predicates.
+
+    :param predicates: The predicates keyed by attribute.
+    :type predicates: dict
+    :param attributes: The attributes accepted by -filtervalue.
+    :type attributes: set
+    :rtype: tuple
+    '''
+    pushed, remaining = [], {}
+    for attr, value in sorted(predicates.items()):
+        if attr in attributes and isinstance(value, (str, int)) and \
+                not isinstance(value, bool) and \
+                PATTERN_PUSHDOWN.match(str(value)):
+            pushed.append('%s=%s' % (attr, value))
+        else:
+            remaining[attr] = value
+    return ':'.join(pushed), remaining
+
+
+def _match(actual, expected):
+    if callable(expected):
+        return bool(expected(actual))
+    if isinstance(expected, (list, tuple, set, frozenset)):
+        return any(_match(actual, v) for v in expected)
+    if isinstance(expected, str) and '*' in expected:
+        return fnmatch.fnmatchcase(str(actual), expected)
+    return str(actual) == str(expected)
+
+
+def matches(row, predicates):
+    '''Return True if the row of response matches all the predicates.'''
+    return all(attr in row and _match(row[attr], expected)
+               for attr, expected in predicates.items())
+
+
+def where(proxy, predicates, params=None):
+    '''Return the rows of a listing which match the predicates.
+
+    :param proxy: The proxy of listing command, e.g. conn.svcinfo.lsvdisk.
+    :type proxy: :py:class:`pysvc.unified.client.Proxy`
+    :param predicates: The predicates keyed by attribute.
+    :type predicates: dict
+    :param params: (optional) The command's parameters.
+    :type params: dict
+    :return: The matching rows.
+    :rtype: list
+    '''
+    command = proxy.referent
+    if not isinstance(command, CLICommand) or command.cmds:
+        raise CLISpecError('"%s" is not a command.' %
+                           getattr(command, 'name', command))
+    kwargs = dict(params or {})
+    expr, remaining = split_predicates(
+        predicates, filter_attributes(proxy.client, command))
+    if expr:
+        if kwargs.get('filtervalue'):
+            expr = '%s:%s' % (kwargs['filtervalue'], expr)
+        kwargs['filtervalue'] = expr
+    resp = proxy(**kwargs)
+    return [row for row in resp if matches(row, remaining)]
+
+
+def partition_values(client, by):
+    '''Return the values partitioning a listing by the attribute, e.g. the
+       ids of storage pools for "mdisk_grp_id".'''
+    if client is None or by not in PARTITION_SOURCES:
+        raise CLISpecError(
+            'The values of partition attribute "%s" are not known.' % by)
+    listing, column, extra = PARTITION_SOURCES[by]
+    command = client._find_command(listing)
+    values = [row[column] for row in client.call_command(command, {})]
+    if extra is not None:
+        values.append(extra)
+    return values
+
+
+def _sort_key(row):
+    return int(row['id'])
+
+
+def fetch_partitioned(proxy, by, values=None, params=None,
+                      max_workers=DEFAULT_PARTITION_WORKERS):
+    '''Fetch a listing in disjoint -filtervalue partitions concurrently,
+       and return one response holding the rows of all partitions, in the
+       order of the listing fetched at once.
+
+    The listing must be partitioned completely by the values, otherwise
+    the rows of the other values are missing.
+
+    :param proxy: The proxy of listing command, e.g. conn.svcinfo.lsvdisk.
+    :type proxy: :py:class:`pysvc.unified.client.Proxy`
+    :param by: The attribute partitioning the listing, e.g. "mdisk_grp_id"
+               or "IO_group_id".
+    :type by: str
+    :param values: (optional) The values of attribute. The storage pools or
+                   I/O groups are listed for the attributes of
+                   :py:data:`PARTITION_SOURCES` by default.
+    :type values: list
+    :param params: (optional) The command's parameters.
+    :type params: dict
+    :param max_workers: (optional) The max partitions in flight, it is 8 by
+                        default.
+    :type max_workers: int
+    :return: The response, whose raw output is the list of outputs of
+             partitions.
+    :rtype: :py:class:`pysvc.unified.response.CLIResponse`
+    '''
+    command = proxy.referent
+    if not isinstance(command, CLICommand) or command.cmds or \
+            'filtervalue' not in command.params:
+        raise CLISpecError('"%s" is not a listing with -filtervalue.' %
+                           getattr(command, 'name', command))
+    attrs = filter_attributes(proxy.client, command)
+    if attrs and by not in attrs:
+        raise CLISpecError('"%s" is not a filter attribute of %s.' %
+                           (by, command.realname))
+    if values is None:
+        values = partition_values(proxy.client, by)
+    values = [str(v) for v in values]
+    for v in values:
+        if not PATTERN_PUSHDOWN.match(v) or v.endswith('*'):
+            raise CLISpecError('"%s" is not a partition value.' % v)
+    if not values:
+        return proxy(**dict(params or {}))
+    base = dict(params or {})
+    prefix = base.pop('filtervalue', None)
+
+    def fetch(value):
+        kwargs = dict(base)
+        expr = '%s=%s' % (by, value)
+        kwargs['filtervalue'] = '%s:%s' % (prefix, expr) if prefix else expr
+        return proxy(**kwargs)
+
+    with ThreadPoolExecutor(max(1, min(max_workers, len(values)))) as pool:
+        responses = list(pool.map(fetch, values))
+    rows = [row for resp in responses for row in resp]
+    if all(str(row.get('id', '')).isdigit() for row in rows):
+        # a listing is ordered by id
+        rows.sort(key=_sort_key)
+    merged = copy.copy(responses[0])
+    merged.response = [resp.response for resp in responses]
+    merged.result = rows
+    return merged
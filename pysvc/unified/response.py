@@ -32,10 +32,10 @@ try:
 except NameError:
     basestring = str
 
-from munch import Munch
 from logging import getLogger
 import pysvc.errors as ce
 from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.instrumentation import span
 
 __all__ = ['find_response_helper']
 
@@ -43,6 +43,29 @@ DEFAULT_DELIM = '\t'
 xlog = getLogger(PYSVC_DEFAULT_LOGGER)
 
 
+_Munch = None
+
+
+def _munch():
+    '''Return :py:class:`munch.Munch`.
+
+    munch imports yaml and importlib.metadata, so it is imported by the first
+    response.
+    '''
+    global _Munch
+    if _Munch is None:
+        from munch import Munch
+        _Munch = Munch
+    return _Munch
+
+
+def __getattr__(name):
+    # pysvc.unified.response.Munch is the class, imported on first use
+    if name == 'Munch':
+        return _munch()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
 class CLIFailureError(ce.StorageArrayClientException):
     '''Raise if CLI fails.'''
 
@@ -80,15 +103,18 @@ class CLIResponse(object):
         if kwargs is None:
             kwargs = {}
         self.response = resp
-        try:
-            self.result = self.parse(resp, kwargs)
-        except Exception:
-            if kwargs.get('flexible', False):
-                self.result = tuple()
-                xlog.exception(
-                    'Fail to parse CLI output, but continue in flexible mode.')
-            else:
-                raise
+        with span('response.parse') as sp:
+            try:
+                self.result = self.parse(resp, kwargs)
+            except Exception:
+                if kwargs.get('flexible', False):
+                    self.result = tuple()
+                    xlog.exception('Fail to parse CLI output, but continue '
+                                   'in flexible mode.')
+                else:
+                    raise
+            if sp:
+                sp.set(rows=len(self.result), bytes=output_size(resp))
 
     def parse(self, resp, kwargs):
         if isinstance(resp, basestring):
@@ -124,6 +150,7 @@ class CLIResponse(object):
 
         delim = kwargs.get('delim', DEFAULT_DELIM)
 
+        Munch = _munch()
         result = []
         snif = MySniffer(delim)
         rd = csv.reader(stdoutlines, snif.sniff(stdout))
@@ -170,7 +197,7 @@ class CLIResponse(object):
         return reduce(
             merge_dict,
             self.result,
-            Munch()) if self.result else None
+            _munch()()) if self.result else None
 
     @property
     def as_list(self):
@@ -180,7 +207,7 @@ class CLIResponse(object):
     def as_dict(self, key):
         '''Return response which has the key to a dict like
            object :py:class:`xiv.dtypes.Bunch`.'''
-        res = Munch()
+        res = _munch()()
         _ = [append_dict(res, a[key], a) for a in self.result if key in a]
         return compact_dict(res)
 
@@ -302,7 +329,7 @@ class svctask_metadata_entry_list_response(SVCResponse):
             label = stdoutlines.pop(0)
             label = label.split()
             for line in stdoutlines:
-                entry = Munch()
+                entry = _munch()()
                 line_entry = line.split()
                 for i in [0, 1, 2]:
                     entry[label[i]] = line_entry[i]
@@ -383,7 +410,7 @@ class svctask_metadata_db_list_response(SVCResponse):
             label = stdoutlines.pop(0)
             label = label.split()
             for line in stdoutlines:
-                entry = Munch()
+                entry = _munch()()
                 line_entry = line.split()
                 for i in [0]:
                     entry[label[i]] = line_entry[i]
@@ -488,7 +515,7 @@ def compact_if_not_similar(dicts):
         # so merge all data
         # e.g. "svcinfo lsvdisk 1"
         if not compare_similar(a, b):
-            return [reduce(merge_dict, dicts, Munch())]
+            return [reduce(merge_dict, dicts, _munch()())]
     # if all data are similar, they are for different objects, so no merge
     # e.g. "svcinfo lsportip 1"
     return dicts
@@ -508,7 +535,7 @@ def is_numeric(data):
 
 
 def colon2Bunch(line=''):
-    ret = Munch()
+    ret = _munch()()
     pairs = line.split()
     i = 0
     while i < len(pairs):
@@ -522,7 +549,7 @@ def colon2Bunch(line=''):
 
 
 def lines2Bunch(lines=[]):
-    ret = Munch()
+    ret = _munch()()
     for line in lines:
         pairs = line.split()
         i = 0
@@ -536,6 +563,13 @@ def to_long_hex(data):
     return long(data, 16)
 
 
+def output_size(resp):
+    '''Return the bytes of CLI output, which is a str or (stdout, stderr).'''
+    if isinstance(resp, (tuple, list)):
+        return sum(len(r) for r in resp if r)
+    return len(resp) if resp else 0
+
+
 def is_svc_response(name):
     return getattr(name, 'resp_type', None) == 'svc' or (
         isinstance(name, basestring) and name.startswith('svc'))
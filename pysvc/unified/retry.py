@@ -0,0 +1,258 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Retry policies for transient CLI failures
+
+Example:
+
+>>> from pysvc.unified.retry import RetryPolicy
+>>> conn = connect('ip', username='admin', password='password',
+...                retry_policy=RetryPolicy(max_attempts=5, base_delay=0.2))
+>>> conn.svctask.mkvolume(name='v1', pool='p1', size=1, unit='gb')
+>>>
+>>> # schedule retries on an executor instead of sleeping in the caller
+>>> future = conn.submit(executor, conn.svcinfo.lsvdisk, bytes=True)
+'''
+
+import copy
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+from logging import getLogger
+from pysvc import PYSVC_DEFAULT_LOGGER
+from pysvc.instrumentation import event
+from pysvc.unified.response import CLIFailureError
+
+__all__ = ['RetryPolicy', 'RetryBudget', 'get_retry_budget', 'NO_RETRY']
+
+xlog = getLogger(PYSVC_DEFAULT_LOGGER)
+
+RETRY_TIME = 3
+METADATA_RC_BUSY = 11
+PATTERN_ERROR_ID = re.compile(r'\b(CMMVC\d+[EW])\b')
+# The cluster is not in a stable state, e.g. during node failover.
+DEFAULT_RETRYABLE_ERRORS = ('CMMVC5786E',)
+
+
+class RetryBudget(object):
+    '''Bound the retries to a ratio of the requests.
+
+    Every request deposits `ratio` token and every retry withdraws one. The
+    budget starts with, and never holds more than, `max_tokens` tokens.
+    '''
+
+    def __init__(self, ratio=0.2, max_tokens=10.0):
+        super(RetryBudget, self).__init__()
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.exhausted = 0
+        self.lock = threading.Lock()
+
+    def on_request(self):
+        with self.lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self):
+        with self.lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(host, **kwargs):
+    '''Return the retry budget shared by all connections to the host.'''
+    with _budgets_lock:
+        budget = _budgets.get(host)
+        if budget is None:
+            budget = _budgets[host] = RetryBudget(**kwargs)
+        return budget
+
+
+class RetryPolicy(object):
+    '''Retry with exponential backoff and jitter.
+
+    :param max_attempts: (optional) The max attempts including the first
+                         one, it is 3 by default.
+    :type max_attempts: int
+    :param base_delay: (optional) The delay before the first retry in
+                       seconds, it is 0.5 by default.
+    :type base_delay: float
+    :param max_delay: (optional) The upper bound of delay in seconds,
+                      it is 8 by default.
+    :type max_delay: float
+    :param multiplier: (optional) The growth of delay per attempt,
+                       it is 2 by default.
+    :type multiplier: float
+    :param jitter: (optional) The fraction of delay which is randomized,
+                   from 0 to 1, it is 0.5 by default.
+    :type jitter: float
+    :param retryable_codes: (optional) The retryable return codes, it is
+                            (METADATA_RC_BUSY,) by default.
+    :type retryable_codes: tuple
+    :param retryable_errors: (optional) The retryable error ids in the error
+                             message, e.g. ('CMMVC5786E',).
+    :type retryable_errors: tuple
+    :param budget: (optional) The retry budget.
+    :type budget: :py:class:`.RetryBudget`
+    '''
+
+    def __init__(
+            self,
+            max_attempts=RETRY_TIME,
+            base_delay=0.5,
+            max_delay=8.0,
+            multiplier=2.0,
+            jitter=0.5,
+            retryable_codes=(METADATA_RC_BUSY,),
+            retryable_errors=DEFAULT_RETRYABLE_ERRORS,
+            budget=None,
+            sleep=time.sleep,
+            clock=time.time):
+        super(RetryPolicy, self).__init__()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retryable_codes = tuple(retryable_codes)
+        self.retryable_errors = tuple(retryable_errors)
+        self.budget = budget
+        self.sleep = sleep
+        self.clock = clock
+        self.retries = 0
+        self.lock = threading.Lock()
+
+    def with_budget(self, budget):
+        '''Return a copy of the policy using the budget.'''
+        policy = copy.copy(self)
+        policy.budget = budget
+        policy.lock = threading.Lock()
+        return policy
+
+    def is_retryable(self, error):
+        if not isinstance(error, CLIFailureError):
+            return False
+        if error.returnCode in self.retryable_codes:
+            return True
+        if self.retryable_errors:
+            m = PATTERN_ERROR_ID.search(str(error))
+            return bool(m and m.group(1) in self.retryable_errors)
+        return False
+
+    def backoff(self, attempt):
+        '''Return the delay in seconds after the `attempt`-th failure.'''
+        delay = min(self.max_delay,
+                    self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def next_delay(self, error, attempt, deadline=None):
+        '''Return the delay before the next attempt, or None if the error
+           should be raised.'''
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        delay = self.backoff(attempt)
+        if deadline is not None and self.clock() + delay >= deadline:
+            return None
+        if self.budget is not None and not self.budget.try_spend():
+            xlog.warning('The retry budget is exhausted: %s' % error)
+            return None
+        with self.lock:
+            self.retries += 1
+        event('retry', error=error, attempt=attempt, delay=delay)
+        return delay
+
+    def call(self, fn, deadline=None):
+        '''Call fn() and retry in the calling thread.'''
+        if self.budget is not None:
+            self.budget.on_request()
+        attempt = 1
+        while True:
+            try:
+                return fn()
+            except Exception as ex:
+                delay = self.next_delay(ex, attempt, deadline)
+                if delay is None:
+                    raise
+                xlog.debug('Retry in %.2f seconds: %s' % (delay, ex))
+                self.sleep(delay)
+                attempt += 1
+
+    def submit(self, fn, executor, deadline=None):
+        '''Call fn() on the executor and schedule retries with timers, so no
+           thread sleeps while waiting.
+
+        :return: The future of result.
+        :rtype: :py:class:`concurrent.futures.Future`
+        '''
+        future = Future()
+        if self.budget is not None:
+            self.budget.on_request()
+
+        def schedule(n):
+            try:
+                executor.submit(attempt, n)
+            except RuntimeError:
+                # the executor was shut down while the timer was waiting;
+                # run the attempt in the timer thread so the future resolves
+                attempt(n)
+
+        def attempt(n):
+            if n == 1 and not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn()
+            except Exception as ex:
+                delay = self.next_delay(ex, n, deadline)
+                if delay is None:
+                    future.set_exception(ex)
+                    return
+                timer = threading.Timer(delay, schedule, (n + 1,))
+                timer.daemon = True
+                timer.start()
+                return
+            future.set_result(result)
+        executor.submit(attempt, 1)
+        return future
+
+    async def call_async(self, fn, loop=None, deadline=None):
+        '''Run fn() in the default executor of the event loop and await the
+           retries without blocking the loop.'''
+        import asyncio
+        loop = loop or asyncio.get_event_loop()
+        if self.budget is not None:
+            self.budget.on_request()
+        attempt = 1
+        while True:
+            try:
+                return await loop.run_in_executor(None, fn)
+            except Exception as ex:
+                delay = self.next_delay(ex, attempt, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,80 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for columnar archive'''
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pysvc.unified.response as ucr
+from pysvc.unified.archive import ColumnArchive, ArchiveError
+from pysvc.unified.helpers import etree
+from .testdata import RESP_svcinfo_lsvdisk
+
+STATS_XML = '''<diskStatsColl cluster="c1" timestamp="2025-01-01 00:00:00">
+<vdsk idx="0" ro="10" wo="20"/>
+<vdsk idx="1" ro="11" wo="21"/>
+<mdsk idx="0" ro="5"/>
+</diskStatsColl>'''
+
+
+class TestColumnArchive(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'test.pca')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_append_response(self):
+        resp = ucr.find_response_helper('svc_normal')(
+            RESP_svcinfo_lsvdisk, dict(delim=','))
+        with ColumnArchive(self.path) as archive:
+            sid = archive.append(resp, label='lsvdisk', timestamp=1)
+            archive.append(resp, label='lsvdisk', timestamp=2)
+            self.assertEqual(resp.as_list, archive.read(sid))
+            self.assertEqual(
+                [(1, [r.capacity for r in resp]),
+                 (2, [r.capacity for r in resp])],
+                list(archive.column('capacity', label='lsvdisk')))
+
+        with ColumnArchive(self.path) as archive:
+            self.assertEqual(2, len(archive))
+            self.assertEqual([r.id for r in resp],
+                             [r.id for r in archive.read(1, ['id'])])
+            self.assertEqual([(2, [None] * len(resp.as_list))],
+                             list(archive.column('nothing', since=2)))
+
+    def test_append_stats(self):
+        with ColumnArchive(self.path) as archive:
+            sid = archive.append_stats(etree.fromstring(STATS_XML))
+            entry = archive.snapshots('diskStatsColl')[0]
+            self.assertEqual('c1', entry.meta['cluster'])
+            self.assertEqual(['vdsk', 'vdsk', 'mdsk'],
+                             [r.element for r in archive.read(sid)])
+            self.assertEqual([['20', '21', None]],
+                             [v for _, v in archive.column('wo')])
+
+    def test_corrupted(self):
+        with ColumnArchive(self.path) as archive:
+            archive.append([{'a': '1'}])
+            self.assertRaises(ArchiveError, archive.read, 5)
+        with open(self.path, 'r+b') as f:
+            f.write(b'xx')
+        with ColumnArchive(self.path) as archive:
+            self.assertRaises(ArchiveError, archive.read, 0)
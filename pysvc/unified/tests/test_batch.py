@@ -0,0 +1,78 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for batch of CLI commands'''
+
+import os
+from unittest import TestCase
+
+import mock
+import pysvc.unified.clispec as ucs
+import pysvc.unified.response as ucr
+from pysvc.unified.batch import BatchError, TAG_BATCH, split_errors
+from pysvc.unified.client import UnifiedSSHClient
+from .testdata import RESP_svcinfo_lsvdisk, RESP_svcinfo_lscurrentuser
+
+TEST_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPEC = ucs.parse(os.path.join(TEST_ROOT, 'response', 'svc-6.3.xml'))
+ERR_NOT_EXIST = 'CMMVC5753E The specified object does not exist.\n'
+
+
+class TestBatch(TestCase):
+
+    def setUp(self):
+        self.conn = UnifiedSSHClient()
+        self.conn.specification = SPEC
+        self.conn.transport = mock.Mock()
+
+    def reply(self, *outputs, **kwargs):
+        stdout = ''.join('%s %d\n%s' % (TAG_BATCH, i, out)
+                         for i, out in enumerate(outputs))
+        self.conn.transport.send_command.return_value = (
+            None, stdout.encode(), kwargs.get('stderr', '').encode())
+
+    def test_batch(self):
+        self.reply(RESP_svcinfo_lsvdisk, '%s 1\n' % ucs.TAG_ERR,
+                   RESP_svcinfo_lscurrentuser, stderr=ERR_NOT_EXIST)
+        with self.conn.batch() as b:
+            vdisks = b.svcinfo.lsvdisk()
+            host = b.svcinfo.lshost(object_id='notexists')
+            users = b.svcinfo.lscurrentuser()
+            self.assertRaises(BatchError, getattr, vdisks, 'response')
+        send = self.conn.transport.send_command
+        self.assertEqual(1, send.call_count)
+        script = send.call_args[0][0]
+        self.assertEqual(3, script.count(ucs.show_return_code_if_fail()))
+        self.assertTrue(script.startswith('echo %s 0; svcinfo lsvdisk' %
+                                          TAG_BATCH))
+        self.assertEqual(4, len(vdisks.response.as_list))
+        self.assertEqual('superuser', users.response.as_list[0].name)
+        self.assertRaises(ucr.CLIFailureError, getattr, host, 'response')
+        self.assertTrue(ERR_NOT_EXIST.strip() in str(host.error))
+
+    def test_broken_output(self):
+        self.conn.transport.send_command.return_value = (None, b'', b'')
+        with self.conn.batch(max_commands=1) as b:
+            r1 = b.svcinfo.lsvdisk()
+            r2 = b.svcinfo.lshost()
+        self.assertEqual(2, self.conn.transport.send_command.call_count)
+        self.assertTrue(isinstance(r1.error, BatchError))
+        self.assertTrue(isinstance(r2.error, BatchError))
+
+    def test_split_errors(self):
+        self.assertEqual(['CMMVC1E a\nmore\n', 'CMMVC2E b\n'],
+                         split_errors('CMMVC1E a\nmore\nCMMVC2E b\n', 2,
+                                      ['CMMV']))
+        self.assertEqual(['x\n', 'x\n'], split_errors('x\n', 2, ['CMMV']))
@@ -0,0 +1,119 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for circuit breakers'''
+
+from unittest import TestCase
+
+import mock
+import pysvc.errors as ce
+import pysvc.unified.breaker as ub
+from pysvc.transports.ssh_transport import SSHTransport
+from pysvc.unified.breaker import CircuitBreaker, CircuitOpenError
+from pysvc.unified.client import UnifiedSSHClient, connect
+
+
+class TestCircuitBreaker(TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.patcher = mock.patch.object(ub.time, 'time',
+                                         lambda: self.now)
+        self.patcher.start()
+        self.breaker = CircuitBreaker('array1', failure_threshold=2,
+                                      cooldown=30)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def fail(self):
+        with self.breaker.guard():
+            raise ce.UnableToConnectException('unreachable')
+
+    def test_open(self):
+        self.assertRaises(ce.UnableToConnectException, self.fail)
+        self.assertEqual(ub.CLOSED, self.breaker.state)
+        self.assertRaises(ce.UnableToConnectException, self.fail)
+        self.assertEqual(ub.OPEN, self.breaker.state)
+        self.assertRaises(CircuitOpenError, self.fail)
+        self.assertEqual(1, self.breaker.rejected)
+
+    def test_half_open(self):
+        for _ in range(2):
+            self.assertRaises(ce.UnableToConnectException, self.fail)
+        self.now += 30
+        # one probe at a time
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.on_failure()
+        self.assertEqual(ub.OPEN, self.breaker.state)
+        self.now += 30
+        with self.breaker.guard():
+            pass
+        self.assertEqual(ub.CLOSED, self.breaker.state)
+        self.assertEqual(0, self.breaker.failures)
+
+    def test_other_errors(self):
+        for _ in range(3):
+            self.assertRaises(ValueError, self._raise, ValueError)
+        self.assertEqual(ub.CLOSED, self.breaker.state)
+
+    def _raise(self, cls):
+        with self.breaker.guard():
+            raise cls()
+
+
+class TestBreakerClient(TestCase):
+
+    def setUp(self):
+        ub.forget_breakers()
+
+    def tearDown(self):
+        ub.forget_breakers()
+
+    def test_connect(self):
+        error = ce.UnableToConnectException('unreachable')
+        with mock.patch.object(SSHTransport, 'connect',
+                               side_effect=error) as conn:
+            for _ in range(2):
+                self.assertRaises(
+                    ce.UnableToConnectException, connect, 'array1',
+                    circuit_breaker={'failure_threshold': 2})
+            self.assertRaises(CircuitOpenError, connect, 'array1',
+                              circuit_breaker=True)
+        self.assertEqual(2, conn.call_count)
+
+    def test_settings(self):
+        breaker = ub.get_breaker('array1')
+        self.assertEqual(ub.DEFAULT_FAILURE_THRESHOLD,
+                         breaker.failure_threshold)
+        self.assertTrue(breaker is ub.get_breaker(
+            'array1', failure_threshold=2, cooldown=5))
+        self.assertEqual((2, 5), (breaker.failure_threshold,
+                                  breaker.cooldown))
+        ub.get_breaker('array1')
+        self.assertEqual(2, breaker.failure_threshold)
+
+    def test_command(self):
+        conn = UnifiedSSHClient()
+        conn.breaker = CircuitBreaker('array1', failure_threshold=1)
+        conn.transport = mock.Mock(auto_reconnect=False)
+        conn.transport.send_command.side_effect = \
+            ce.UnableToConnectException('unreachable')
+        self.assertRaises(ce.UnableToConnectException,
+                          conn.send_raw_command, 'svcinfo lssystem')
+        self.assertRaises(CircuitOpenError,
+                          conn.send_raw_command, 'svcinfo lssystem')
+        self.assertEqual(1, conn.transport.send_command.call_count)
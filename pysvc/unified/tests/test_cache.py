@@ -0,0 +1,169 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for command result cache'''
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import mock
+import pysvc.unified.clispec as ucs
+from pysvc.unified.cache import CommandCache
+from pysvc.unified.client import UnifiedSSHClient
+from .testdata import RESP_svcinfo_lsvdisk
+
+TEST_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPEC = ucs.parse(os.path.join(TEST_ROOT, 'response', 'svc-6.3.xml'))
+
+
+class TestCommandCache(TestCase):
+
+    def setUp(self):
+        self.now = [0.0]
+        self.cache = CommandCache(default_ttl=10, ttls={'lshost': 0},
+                                  max_bytes=100, clock=lambda: self.now[0])
+
+    def test_ttl(self):
+        self.cache.put('svcinfo lsvdisk', {}, 'r1')
+        self.cache.put('svcinfo lshost', {}, 'r2')
+        self.assertEqual('r1', self.cache.get('svcinfo lsvdisk', {}))
+        self.assertEqual(None, self.cache.get('svcinfo lshost', {}))
+        self.now[0] = 10
+        self.assertEqual(None, self.cache.get('svcinfo lsvdisk', {}))
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+    def test_lru(self):
+        self.cache.put('svcinfo lsvdisk', {'object_id': 1}, 'a' * 40)
+        self.cache.put('svcinfo lsvdisk', {'object_id': 2}, 'b' * 40)
+        self.cache.get('svcinfo lsvdisk', {'object_id': 1})
+        self.cache.put('svcinfo lsvdisk', {'object_id': 3}, 'c' * 40)
+        self.assertTrue(self.cache.get('svcinfo lsvdisk', {'object_id': 1}))
+        self.assertFalse(self.cache.get('svcinfo lsvdisk', {'object_id': 2}))
+        self.assertEqual(1, self.cache.evictions)
+        self.assertEqual(80, self.cache.size)
+
+    def test_invalidate(self):
+        for name in ('lsvdisk', 'lsmdiskgrp', 'lsiogrp', 'lshostvdiskmap'):
+            self.cache.put('svcinfo ' + name, {}, name)
+        self.cache.invalidate('svctask mkvdiskhostmap -host h1 v1')
+        self.assertEqual(['svcinfo lsmdiskgrp', 'svcinfo lsiogrp'],
+                         [k[0] for k in self.cache.entries])
+        self.cache.invalidate('svctask chsystem -name x')
+        self.assertFalse(self.cache.entries)
+
+    def test_stale_put(self):
+        generation = self.cache.generation
+        self.cache.invalidate('svctask rmvdisk 1')
+        self.cache.put('svcinfo lsvdisk', {}, 'r1', generation)
+        self.assertEqual(None, self.cache.get('svcinfo lsvdisk', {}))
+
+
+class TestClientCache(TestCase):
+
+    def setUp(self):
+        self.conn = UnifiedSSHClient()
+        self.conn.specification = SPEC
+        self.conn.transport = mock.Mock()
+        self.conn.transport.send_command.return_value = (
+            None, RESP_svcinfo_lsvdisk, '')
+        self.conn.cache = CommandCache()
+
+    def test_call_command(self):
+        send = self.conn.transport.send_command
+        first = self.conn.svcinfo.lsvdisk()
+        self.assertTrue(first is self.conn.svcinfo.lsvdisk())
+        self.assertEqual(1, send.call_count)
+        self.conn.svcinfo.lsvdisk(**{'xsf.cache': False})
+        self.assertEqual(2, send.call_count)
+        send.return_value = (None, '', '')
+        self.conn.svctask.rmvdisk(vdisk_id='1')
+        self.conn.svcinfo.lsvdisk()
+        self.assertEqual(4, send.call_count)
+
+    def test_shared_cache(self):
+        other = UnifiedSSHClient()
+        other.specification = SPEC
+        other.transport = mock.Mock()
+        other.transport.send_command.return_value = (
+            None, RESP_svcinfo_lsvdisk, '')
+        other.cache = self.conn.cache
+        self.conn.transport.host, other.transport.host = 'a1', 'a2'
+        self.assertFalse(self.conn.svcinfo.lsvdisk() is
+                         other.svcinfo.lsvdisk())
+        self.assertEqual(2, len(self.conn.cache.entries))
+
+    def test_submit_shares_entry(self):
+        send = self.conn.transport.send_command
+        first = self.conn.svcinfo.lsvdisk()
+        with ThreadPoolExecutor(1) as executor:
+            resp = self.conn.submit(executor, self.conn.svcinfo.lsvdisk)
+            self.assertTrue(first is resp.result(5))
+        self.assertTrue(first is self.conn.svcinfo.lsvdisk(
+            **{'xsf.lane': 'bulk', 'xsf.timeout': 5}))
+        self.assertEqual(1, send.call_count)
+        self.assertEqual(1, len(self.conn.cache.entries))
+
+    def test_prefetch(self):
+        send = self.conn.transport.send_command
+        release = threading.Event()
+
+        def slow(*args, **kwargs):
+            release.wait(5)
+            return None, RESP_svcinfo_lsvdisk, ''
+        send.side_effect = slow
+        futures = self.conn.prefetch(['lsvdisk', ('svcinfo.lshost', {})])
+        self.assertEqual(2, len(self.conn.prefetches))
+        # the call waits for the prefetch in flight
+        caller = threading.Thread(target=self.conn.svcinfo.lsvdisk)
+        caller.start()
+        release.set()
+        caller.join(5)
+        for future in futures:
+            future.result(5)
+        self.conn.svcinfo.lshost()
+        self.assertEqual(2, send.call_count)
+
+    def test_prefetch_then_change(self):
+        send = self.conn.transport.send_command
+        release = threading.Event()
+        stale = RESP_svcinfo_lsvdisk.replace('vdisk', 'stale')
+        listings = []
+
+        def reply(cmd, *args, **kwargs):
+            if 'lsvdisk' not in cmd:
+                return None, '', ''
+            listings.append(cmd)
+            if len(listings) == 1:
+                # the prefetch is answered after the change
+                release.wait(5)
+                return None, stale, ''
+            return None, RESP_svcinfo_lsvdisk, ''
+        send.side_effect = reply
+        future, = self.conn.prefetch(['lsvdisk'])
+        self.conn.svctask.rmvdisk(vdisk_id='1')
+        timer = threading.Timer(0.1, release.set)
+        timer.start()
+        resp = self.conn.svcinfo.lsvdisk()
+        timer.join(5)
+        future.result(5)
+        self.assertFalse(any('stale' in v.name for v in resp))
+        self.assertEqual(2, len(listings))
+
+    def test_prefetch_mutation(self):
+        self.assertRaises(ucs.CLISpecError, self.conn.prefetch, ['mkvdisk'])
+        self.assertRaises(ucs.CLISpecError, self.conn.prefetch, ['svcinfo'])
@@ -0,0 +1,347 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for the fake SVC SSH server'''
+
+import os
+import shutil
+import socket
+import tempfile
+import time
+from unittest import TestCase
+
+import mock
+import paramiko
+import pysvc.transports.ssh_transport as st
+import pysvc.unified.client as uc
+from pysvc.errors import CommandTimeoutError, UnableToConnectException
+from pysvc.unified.client import connect
+from pysvc.unified.fakeserver import FakeSVC, FakeSVCServer, Inventory
+from pysvc.unified.response import CLIFailureError
+from pysvc.unified.retry import NO_RETRY
+
+
+class TestFakeSVC(TestCase):
+
+    def setUp(self):
+        self.svc = FakeSVC(Inventory(vdisks=5, hosts=2, pools=2))
+
+    def test_execute(self):
+        out, err, rc = self.svc.execute(
+            "svcinfo lsvdisk -delim , -filtervalue 'name=vdisk*:"
+            "mdisk_grp_name=pool1' || echo TAG $?")
+        self.assertEqual(0, rc)
+        self.assertEqual(['vdisk1', 'vdisk3'],
+                         [ln.split(',')[1] for ln in out.splitlines()[1:]])
+        out, err, rc = self.svc.execute('lsvdisk nope || echo TAG $?')
+        self.assertEqual('TAG 1\n', out)
+        self.assertTrue(err.startswith('CMMVC5753E'))
+        self.assertEqual(127, self.svc.execute('nope')[2])
+
+    def test_missing_spec(self):
+        with mock.patch('pysvc.unified.fakeserver.DEFAULT_SPEC',
+                        os.path.join(tempfile.gettempdir(), 'nope.xml')):
+            self.assertRaises(ValueError, FakeSVC)
+        self.assertRaises(ValueError, FakeSVC, spec='nope.xml')
+
+    def test_inject(self):
+        self.svc.inject('mkvdisk', rc=11, times=1)
+        cmd = 'mkvdisk -name v1 -mdiskgrp pool0 -iogrp 0 -size 1'
+        self.assertEqual(11, self.svc.execute(cmd)[2])
+        self.assertEqual(0, self.svc.execute(cmd)[2])
+        self.assertEqual(1, self.svc.execute(cmd)[2])  # already exists
+        self.assertEqual(3, self.svc.calls['mkvdisk'])
+
+
+class TestFakeSVCServer(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSVCServer(inventory=Inventory(vdisks=50)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        s = self.server
+        self.conn = connect(s.host, port=s.port, username=s.username,
+                            password=s.password)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_commands(self):
+        conn = self.conn
+        self.assertEqual('svc', conn.get_device_info()[0])
+        self.assertEqual(50, len(conn.svcinfo.lsvdisk().as_list))
+        self.assertEqual('vdisk7',
+                         conn.svcinfo.lsvdisk(object='7').as_single_element
+                         .name)
+        conn.svctask.mkvdisk(name='v1', mdiskgrp='pool0', iogrp=0, size=1,
+                             unit='gb')
+        vdisks = conn.svcinfo.lsvdisk(filtervalue='name=v1',
+                                      bytes=True).as_list
+        self.assertEqual('1073741824', vdisks[0].capacity)
+
+    def test_error(self):
+        self.server.svc.inject('lshost', rc=11, times=1)
+        try:
+            self.conn.svcinfo.lshost(**{'xsf.retry_policy': NO_RETRY})
+        except CLIFailureError as ex:
+            self.assertEqual(11, ex.returnCode)
+        else:
+            self.fail('CLIFailureError is not raised.')
+
+    def test_dump(self):
+        dumps = self.conn.svcinfo.lsdumps(prefix='/dumps/iostats').as_list
+        path = '/dumps/iostats/' + dumps[0].filename
+        tree = self.conn.get_dump_element_tree(path, 10)
+        self.assertEqual(len(self.server.svc.inventory.tables['lsvdisk']),
+                         len(tree.getroot().findall('vdsk')))
+
+
+class TestShellSession(TestCase):
+
+    def setUp(self):
+        self.server = FakeSVCServer(inventory=Inventory(vdisks=5)).start()
+        s = self.server
+        self.conn = connect(s.host, port=s.port, username=s.username,
+                            password=s.password, shell_session=True)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.stop()
+
+    def test_commands(self):
+        conn = self.conn
+        for i in range(5):
+            self.assertEqual('vdisk%d' % i, conn.svcinfo.lsvdisk(
+                object=str(i)).as_single_element.name)
+        try:
+            conn.svcinfo.lsvdisk(object='nope')
+        except CLIFailureError as ex:
+            self.assertIn('CMMVC5753E', str(ex))
+        else:
+            self.fail('CLIFailureError is not raised.')
+        self.assertEqual(5, len(conn.svcinfo.lsvdisk().as_list))
+        self.assertTrue(conn.transport.session is not None)
+
+    def test_late_stderr(self):
+        channel = mock.Mock()
+        channel.recv_stderr_ready.return_value = False
+        channel.recv_stderr.return_value = b'CMMVC5753E late\n'
+        session = st.ShellSession(channel, error_marker='TAG')
+        session.token = 'T'
+        channel.recv.return_value = b'TAG 1\nT_1 0\n'
+        self.assertEqual((b'TAG 1\n', b'CMMVC5753E late\n'),
+                         session.execute('lsvdisk nope', 5))
+        channel.settimeout.assert_called_with(session.STDERR_WAIT)
+        # a successful command does not wait
+        channel.recv.return_value = b'id,name\nT_2 0\n'
+        channel.recv_stderr.reset_mock()
+        self.assertEqual((b'id,name\n', b''),
+                         session.execute('lsvdisk', 5))
+        self.assertFalse(channel.recv_stderr.called)
+        # no stderr in time
+        channel.recv.return_value = b'T_3 1\n'
+        channel.recv_stderr.side_effect = socket.timeout()
+        self.assertEqual((b'', b''), session.execute('false', 5))
+
+    def test_reopen(self):
+        self.conn.svcinfo.lsvdisk()
+        session = self.conn.transport.session
+        session.close()
+        self.assertEqual(5, len(self.conn.svcinfo.lsvdisk().as_list))
+        self.assertFalse(session is self.conn.transport.session)
+
+
+class TestReconnect(TestCase):
+
+    def setUp(self):
+        self.server = FakeSVCServer(inventory=Inventory(vdisks=5)).start()
+        s = self.server
+        self.conn = connect(s.host, port=s.port, username=s.username,
+                            password=s.password, keepalive=1,
+                            auto_reconnect=True)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.stop()
+
+    def test_dead_connection(self):
+        spec = self.conn.specification
+        for t in self.server.transports:
+            t.close()
+        deadline = time.time() + 5
+        while self.conn.transport.is_alive() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(self.conn.transport.is_alive())
+        self.assertEqual(5, len(self.conn.svcinfo.lsvdisk().as_list))
+        self.assertTrue(spec is self.conn.specification)
+        self.assertEqual(1, self.server.svc.calls['catxmlspec'])
+
+
+class TestAuthentication(TestCase):
+
+    def setUp(self):
+        self.key = paramiko.ECDSAKey.generate()
+        self.root = tempfile.mkdtemp()
+        self.key_file = os.path.join(self.root, 'id_ecdsa')
+        self.key.write_private_key_file(self.key_file, password=b'secret')
+        self.server = FakeSVCServer(inventory=Inventory(vdisks=1),
+                                    authorized_keys=[self.key]).start()
+        st.forget_auth_methods()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.root)
+        st.forget_auth_methods()
+
+    def connect(self, **kwargs):
+        s = self.server
+        trans = st.SSHTransport(s.host, user=s.username, port=s.port,
+                                **kwargs)
+        trans.connect()
+        trans.disconnect()
+
+    def test_private_key(self):
+        auth_key = (self.server.host, self.server.port, self.server.username)
+        read = mock.Mock(wraps=st._read_private_key)
+        with mock.patch.object(st, '_read_private_key', read):
+            self.connect(pkey_file=self.key_file, password='secret')
+            self.connect(pkey_file=self.key_file, password='secret')
+        self.assertEqual(1, read.call_count)
+        self.assertEqual('publickey', st._auth_methods[auth_key])
+
+    def test_password(self):
+        auth_key = (self.server.host, self.server.port, self.server.username)
+        self.connect(password=self.server.password)
+        self.assertEqual('password', st._auth_methods[auth_key])
+        # the remembered method fails, and the others are tried
+        self.connect(pkey_file=self.key_file, password='secret')
+        self.assertEqual('publickey', st._auth_methods[auth_key])
+
+
+class TestMultiAddress(TestCase):
+
+    def setUp(self):
+        self.server = FakeSVCServer(inventory=Inventory(vdisks=1)).start()
+        # accepts TCP connections but never answers
+        self.blackhole = socket.socket()
+        self.blackhole.bind(('127.0.0.2', self.server.port))
+        self.blackhole.listen(8)
+        uc._preferred_addresses.clear()
+
+    def tearDown(self):
+        self.blackhole.close()
+        self.server.stop()
+        uc._preferred_addresses.clear()
+
+    def connect(self, addresses):
+        s = self.server
+        conn = connect(addresses, port=s.port, username=s.username,
+                       password=s.password, timeout=5, stagger=0.1)
+        host = conn.transport.host
+        conn.close()
+        return host
+
+    def test_race(self):
+        start = time.time()
+        host = self.connect(['127.0.0.2', '127.0.0.1'])
+        self.assertLess(time.time() - start, 3)
+        self.assertEqual('127.0.0.1', host)
+        # the address connected is tried first
+        self.assertEqual('127.0.0.1', uc._preferred_addresses[
+            frozenset(['127.0.0.1', '127.0.0.2'])])
+
+    def test_all_fail(self):
+        self.blackhole.close()
+        self.assertRaises(UnableToConnectException, self.connect,
+                          ['127.0.0.2', '127.0.0.3'])
+
+
+class TestTimeout(TestCase):
+
+    def setUp(self):
+        self.server = FakeSVCServer(inventory=Inventory(vdisks=5)).start()
+        s = self.server
+        self.conn = connect(s.host, port=s.port, username=s.username,
+                            password=s.password)
+        self.server.svc.latency = 0.5
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.stop()
+
+    def test_channel_timeout(self):
+        transport = self.conn.transport.transport.get_transport()
+        self.assertRaises(CommandTimeoutError, self.conn.svcinfo.lsvdisk,
+                          **{'xsf.timeout': 0.1})
+        # the connection is kept
+        self.assertTrue(transport is
+                        self.conn.transport.transport.get_transport())
+        self.assertEqual(5, len(self.conn.svcinfo.lsvdisk().as_list))
+
+    def test_deadline(self):
+        start = time.time()
+        self.assertRaises(CommandTimeoutError, self.conn.svcinfo.lsvdisk,
+                          **{'xsf.deadline': start + 0.2})
+        self.assertLess(time.time() - start, 0.5)
+        self.assertRaises(CommandTimeoutError, self.conn.svcinfo.lsvdisk,
+                          **{'xsf.deadline': start})
+
+
+class TestDeviceDetection(TestCase):
+
+    def setUp(self):
+        self.server = FakeSVCServer(inventory=Inventory(
+            code_level='6.3.0.4 (build 54.8.1206280000)')).start()
+        self.server.svc.inject('catxmlspec', rc=127,
+                               message='rbash: catxmlspec: command not found')
+        uc.forget_device_types()
+        root = os.path.dirname(os.path.abspath(__file__))
+        self.get_cli_spec = uc.get_cli_spec
+
+        def get_cli_spec(device, version):
+            if device == 'svc':
+                return open(os.path.join(
+                    root, 'response', 'svc-%s.xml' % version), 'rb')
+            return self.get_cli_spec(device, version)
+        self.patcher = mock.patch.object(uc, 'get_cli_spec', get_cli_spec)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.server.stop()
+        uc.forget_device_types()
+
+    def connect(self):
+        s = self.server
+        conn = connect(s.host, port=s.port, username=s.username,
+                       password=s.password)
+        conn.close()
+        return conn
+
+    def test_detect(self):
+        calls = self.server.svc.calls
+        self.connect()
+        self.assertEqual(1, calls['catxmlspec'])
+        self.assertEqual(1, calls['lssystem'])
+        self.assertEqual(0, calls['lscluster'])
+        # the device type is remembered
+        self.connect()
+        self.assertEqual(1, calls['catxmlspec'])
+        self.assertEqual(1, calls['lssystem'])
@@ -0,0 +1,97 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for hedged requests'''
+
+import time
+from unittest import TestCase
+
+import mock
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.hedge import HedgePolicy
+from pysvc.unified.retry import RetryBudget
+
+
+class TestHedgePolicy(TestCase):
+
+    def test_delay(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10,
+                             initial_delay=2.0)
+        self.assertEqual(2.0, policy.delay())
+        for i in range(1, 11):
+            policy.record(i * 0.01)
+        self.assertAlmostEqual(0.1, policy.delay())
+
+    def test_delay_per_command(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10,
+                             initial_delay=2.0)
+        for i in range(1, 11):
+            policy.record(i, 'lsvdisk')
+            policy.record(i * 0.01, 'lssystem')
+        self.assertAlmostEqual(10, policy.delay('lsvdisk'))
+        self.assertAlmostEqual(0.1, policy.delay('lssystem'))
+        self.assertEqual(2.0, policy.delay('lshost'))
+
+        def primary(cancel):
+            return 'primary'
+        policy.call(primary, mock.Mock(), cmd='svcinfo lshost -delim ,')
+        self.assertEqual(1, len(policy.latencies['lshost']))
+
+    def test_budget(self):
+        policy = HedgePolicy(initial_delay=0.01,
+                             budget=RetryBudget(ratio=0, max_tokens=1))
+        secondary = mock.Mock(return_value='secondary')
+
+        def primary(cancel):
+            time.sleep(0.1)
+            return 'primary'
+        self.assertEqual('secondary', policy.call(primary, secondary))
+        # the budget is spent
+        self.assertEqual('primary', policy.call(primary, secondary))
+        self.assertEqual(1, secondary.call_count)
+
+
+class TestHedgedClient(TestCase):
+
+    def setUp(self):
+        self.conn = UnifiedSSHClient()
+        self.conn.hedge_policy = HedgePolicy(initial_delay=0.05)
+        self.conn.transport = mock.Mock()
+        self.conn.hedge_transport = mock.Mock()
+        self.cancels = []
+
+        def slow(cmd, cancel=None, **kwargs):
+            self.cancels.append(cancel)
+            deadline = time.time() + 5
+            while not cancel.cancelled and time.time() < deadline:
+                time.sleep(0.01)
+            return None, b'truncated', b''
+        self.conn.transport.send_command.side_effect = slow
+        self.conn.hedge_transport.send_command.return_value = \
+            (None, b'output', b'')
+
+    def test_hedge_wins(self):
+        start = time.time()
+        self.assertEqual((b'output', b''),
+                         self.conn.send_raw_command('svcinfo lssystem'))
+        self.assertLess(time.time() - start, 1)
+        self.assertTrue(self.cancels[0].cancelled)
+        self.assertEqual(1, self.conn.hedge_policy.wins)
+
+    def test_not_read_only(self):
+        self.conn.transport.send_command.side_effect = None
+        self.conn.transport.send_command.return_value = (None, b'', b'')
+        self.conn.send_raw_command('svctask mkhost -name h1')
+        self.assertEqual(0, self.conn.hedge_transport.send_command.call_count)
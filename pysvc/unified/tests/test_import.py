@@ -0,0 +1,73 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for import time of pysvc'''
+
+import json
+import subprocess
+import sys
+from unittest import TestCase
+
+import pysvc.unified.client as uc
+
+# it is about 0.06 seconds, and 0.3 seconds with eager paramiko and
+# pkg_resources
+MAX_IMPORT_SECONDS = 0.25
+
+SCRIPT = '''
+import json, sys, time, warnings
+filters = len(warnings.filters)
+start = time.perf_counter()
+import %s
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "modules": sorted(set(sys.modules) & {%s}),
+    "filters": len(warnings.filters) - filters,
+}))
+'''
+
+DEFERRED = ('paramiko', 'pkg_resources', 'munch', 'importlib.resources')
+
+
+class TestImport(TestCase):
+
+    def run_import(self, module='pysvc.unified'):
+        script = SCRIPT % (module, ', '.join('"%s"' % m for m in DEFERRED))
+        out = subprocess.check_output([sys.executable, '-c', script])
+        return json.loads(out.decode())
+
+    def test_deferred(self):
+        result = self.run_import()
+        self.assertEqual([], result['modules'])
+        self.assertEqual(0, result['filters'])
+
+    def test_archive_deferred(self):
+        result = self.run_import('pysvc.unified.archive')
+        self.assertEqual([], result['modules'])
+
+    def test_import_time(self):
+        # the best of three runs is robust to a busy machine
+        seconds = min(self.run_import()['seconds'] for _ in range(3))
+        self.assertLess(seconds, MAX_IMPORT_SECONDS)
+
+    def test_munch_class(self):
+        import munch
+        import pysvc.unified.response as ur
+        self.assertTrue(ur.Munch is munch.Munch)
+        self.assertIsInstance(ur.colon2Bunch('a: 1'), ur.Munch)
+
+    def test_bundled_spec(self):
+        with uc.get_cli_spec('xsf', '1.0') as f:
+            self.assertTrue(f.read(5).startswith(b'<'))
@@ -0,0 +1,81 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for instrumentation of CLI calls'''
+
+import os
+from unittest import TestCase
+
+import mock
+import pysvc.instrumentation as ins
+import pysvc.unified.clispec as ucs
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.retry import RetryPolicy, METADATA_RC_BUSY
+from .testdata import RESP_svcinfo_lsvdisk
+
+TEST_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPEC = ucs.parse(os.path.join(TEST_ROOT, 'response', 'svc-6.3.xml'))
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        self.aggregator = ins.HistogramAggregator()
+        ins.add_listener(self.aggregator)
+
+    def tearDown(self):
+        ins.remove_listener(self.aggregator)
+
+    def test_disabled(self):
+        ins.remove_listener(self.aggregator)
+        self.assertTrue(ins.span('command') is ins.NOOP_SPAN)
+
+    def test_command_name(self):
+        self.assertEqual('lsvdisk', ins.command_name(
+            'svcinfo lsvdisk -delim , || echo tag $?'))
+        self.assertEqual('batch', ins.command_name(
+            'echo t 0; svcinfo lsvdisk; echo t 1; svcinfo lshost'))
+
+    def test_client(self):
+        conn = UnifiedSSHClient()
+        conn.specification = SPEC
+        conn.transport = mock.Mock(host='array1')
+        conn.transport.send_command.side_effect = [
+            (None, ('%s %d\n' % (ucs.TAG_ERR, METADATA_RC_BUSY)).encode(),
+             b'CMMVC6527E busy\n'),
+            (None, RESP_svcinfo_lsvdisk.encode(), b'')]
+        conn.retry_policy = RetryPolicy(sleep=mock.Mock())
+        conn.svcinfo.lsvdisk()
+        stats = self.aggregator.stats()
+        self.assertEqual(1, stats[('command', 'lsvdisk')]['count'])
+        self.assertEqual(2, stats[('client.send', 'lsvdisk')]['count'])
+        self.assertEqual(len(RESP_svcinfo_lsvdisk),
+                         stats[('response.parse', 'lsvdisk')]['bytes'])
+        # the first response is an error
+        self.assertEqual(1, stats[('response.parse', 'lsvdisk')]['errors'])
+        self.assertEqual(1, self.aggregator.events[('retry', 'lsvdisk')])
+
+    def test_quantile(self):
+        aggregator = ins.HistogramAggregator(buckets=(1, 2, 4))
+        for i in range(101):
+            sp = ins.Span('command', 'lsvdisk')
+            sp.start, sp.end = 0.0, 0.5 if i < 90 else 3.0
+            sp.error = ValueError() if i == 100 else None
+            aggregator.on_span(sp)
+        stats = aggregator.stats()[('command', 'lsvdisk')]
+        self.assertEqual(101, stats['count'])
+        self.assertEqual(1, stats['errors'])
+        self.assertTrue(0 < stats['p50'] <= 1)
+        self.assertTrue(2 < stats['p95'] <= 3)
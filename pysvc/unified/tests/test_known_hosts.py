@@ -0,0 +1,103 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for the shared known hosts store'''
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import paramiko
+from pysvc.errors import BadHostFingerPrintException
+from pysvc.transports.known_hosts import KnownHostsStore, get_known_hosts
+from pysvc.transports.ssh_transport import SSHTransport
+from pysvc.unified.fakeserver import FakeSVCServer, Inventory
+
+
+class TestKnownHostsStore(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'known_hosts')
+        self.key1 = paramiko.ECDSAKey.generate()
+        self.key2 = paramiko.ECDSAKey.generate()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_batch(self):
+        store = KnownHostsStore(self.path, flush_delay=60)
+        store.add('array1', self.key1)
+        store.add('array2', self.key2)
+        self.assertFalse(os.path.exists(self.path))
+        store.flush()
+        self.assertEqual(1, store.flushes)
+        host_keys = paramiko.HostKeys(self.path)
+        self.assertEqual(['array1', 'array2'], sorted(host_keys.keys()))
+
+    def test_merge(self):
+        store1 = KnownHostsStore(self.path, flush_delay=60)
+        store2 = KnownHostsStore(self.path, flush_delay=60)
+        store1.add('array1', self.key1)
+        store2.add('array2', self.key2)
+        store1.flush()
+        store2.flush()
+        host_keys = paramiko.HostKeys(self.path)
+        self.assertEqual(['array1', 'array2'], sorted(host_keys.keys()))
+        self.assertEqual(self.key1,
+                         store2.lookup('array1', self.key1.get_name()))
+        self.assertEqual(['known_hosts', 'known_hosts.lock'],
+                         sorted(os.listdir(self.root)))
+
+
+class TestKnownHostsTransport(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'xsf_known_hosts')
+        self.server = FakeSVCServer(inventory=Inventory(vdisks=1)).start()
+
+    def tearDown(self):
+        self.server.stop()
+        get_known_hosts(self.path).flush()
+        shutil.rmtree(self.root)
+
+    def connect(self, auto_add=True):
+        s = self.server
+        trans = SSHTransport(s.host, user=s.username, password=s.password,
+                             port=s.port, auto_add=auto_add,
+                             ignore_known_hosts=False,
+                             known_hosts_file=self.path)
+        trans.connect()
+        trans.disconnect()
+        return trans
+
+    def test_shared(self):
+        store = get_known_hosts(self.path)
+        for _ in range(3):
+            self.assertTrue(self.connect().known_hosts is store)
+        self.assertEqual(1, store.loads)
+        store.flush()
+        self.assertEqual(1, store.flushes)
+        self.assertEqual(1, len(paramiko.HostKeys(self.path).keys()))
+        # the known host is accepted without adding
+        self.connect(auto_add=False)
+
+    def test_bad_host_key(self):
+        store = get_known_hosts(self.path)
+        hostname = '[%s]:%d' % (self.server.host, self.server.port)
+        store.add(hostname, paramiko.ECDSAKey.generate())
+        self.assertRaises(BadHostFingerPrintException, self.connect)
@@ -0,0 +1,86 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for admission control of CLI commands'''
+
+import threading
+import time
+from unittest import TestCase
+
+import mock
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.limiter import AdmissionLimiter, AdmissionTimeoutError
+from pysvc.unified.limiter import get_limiter, lane_of
+
+
+class TestAdmissionLimiter(TestCase):
+
+    def test_lane_of(self):
+        self.assertEqual('bulk', lane_of('svcinfo lsvdisk -delim :'))
+        self.assertEqual('interactive', lane_of('svctask mkhost -name h1'))
+        self.assertEqual('interactive', lane_of(
+            'echo X 0; svcinfo lsvdisk; echo X 1; svctask rmhost h1'))
+        self.assertEqual('bulk', lane_of('echo X 0; lsvdisk; echo X 1; lshost'))
+
+    def test_timeout(self):
+        limiter = AdmissionLimiter(max_in_flight=1, timeout=0.05)
+        limiter.acquire('bulk')
+        self.assertRaises(AdmissionTimeoutError, limiter.acquire, 'bulk')
+        limiter.release()
+        stats = limiter.stats()
+        self.assertEqual(1, stats['bulk']['timeouts'])
+        self.assertEqual(1, stats['bulk']['admitted'])
+        self.assertEqual(0, stats['in_flight'])
+
+    def test_priority(self):
+        limiter = AdmissionLimiter(max_in_flight=1)
+        limiter.acquire('bulk')
+        order = []
+
+        def run(lane):
+            with limiter.slot(lane):
+                order.append(lane)
+
+        bulk = threading.Thread(target=run, args=('bulk',))
+        bulk.start()
+        while not limiter.lanes['bulk'].queued:
+            time.sleep(0.001)
+        interactive = threading.Thread(target=run, args=('interactive',))
+        interactive.start()
+        while not limiter.lanes['interactive'].queued:
+            time.sleep(0.001)
+        limiter.release()
+        bulk.join(5)
+        interactive.join(5)
+        self.assertEqual(['interactive', 'bulk'], order)
+        self.assertTrue(limiter.stats()['bulk']['wait_max'] > 0)
+
+    def test_shared(self):
+        self.assertTrue(get_limiter('h1', 2) is get_limiter('h1'))
+        self.assertEqual(3, get_limiter('h1', 3).max_in_flight)
+        self.assertFalse(get_limiter('h1') is get_limiter('h2'))
+
+    def test_client(self):
+        conn = UnifiedSSHClient()
+        conn.transport = mock.Mock()
+        conn.transport.send_command.return_value = (None, b'', b'')
+        conn.limiter = AdmissionLimiter(max_in_flight=1)
+        conn.send_raw_command('svcinfo lsvdisk')
+        conn.send_raw_command('svctask rmhost h1')
+        conn.send_raw_command('svcinfo lshost', {'lane': 'interactive'})
+        stats = conn.limiter.stats()
+        self.assertEqual(1, stats['bulk']['admitted'])
+        self.assertEqual(2, stats['interactive']['admitted'])
+        self.assertEqual(0, stats['in_flight'])
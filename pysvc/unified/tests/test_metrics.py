@@ -0,0 +1,92 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for OpenMetrics exporter'''
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from urllib.request import Request, urlopen
+
+import mock
+import pysvc.unified.clispec as ucs
+from pysvc.metrics import MetricsExporter, CONTENT_TYPE_OPENMETRICS
+from pysvc.unified.cache import CommandCache
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.limiter import AdmissionLimiter
+from pysvc.unified.retry import RetryPolicy, METADATA_RC_BUSY
+from .testdata import RESP_svcinfo_lsvdisk
+
+TEST_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPEC = ucs.parse(os.path.join(TEST_ROOT, 'response', 'svc-6.3.xml'))
+
+
+class TestMetricsExporter(TestCase):
+
+    def setUp(self):
+        self.exporter = MetricsExporter().install()
+        self.conn = UnifiedSSHClient()
+        self.conn.specification = SPEC
+        self.conn.transport = mock.Mock(host='array1')
+        self.conn.transport.send_command.side_effect = [
+            (None, ('%s %d\n' % (ucs.TAG_ERR, METADATA_RC_BUSY)).encode(),
+             b'CMMVC6527E busy\n'),
+            (None, RESP_svcinfo_lsvdisk.encode(), b'')]
+        self.conn.retry_policy = RetryPolicy(sleep=mock.Mock())
+        self.conn.cache = CommandCache()
+        self.conn.limiter = AdmissionLimiter(2)
+        self.exporter.track(self.conn)
+        self.conn.svcinfo.lsvdisk()
+        self.conn.svcinfo.lsvdisk()
+
+    def tearDown(self):
+        self.exporter.close()
+
+    def test_render(self):
+        text = self.exporter.render()
+        labels = 'host="array1",command="lsvdisk",stage="command"'
+        self.assertIn('# TYPE pysvc_cli_duration_seconds histogram', text)
+        self.assertIn('pysvc_cli_duration_seconds_bucket{%s,le="+Inf"} 1'
+                      % labels, text)
+        self.assertIn('pysvc_cli_duration_seconds_count{%s} 1' % labels, text)
+        self.assertIn('pysvc_retries_total{host="array1",command="lsvdisk"}'
+                      ' 1', text)
+        self.assertIn('pysvc_cache_hits_total{host="array1"} 1', text)
+        self.assertIn('pysvc_cache_hit_ratio{host="array1"} 0.5', text)
+        self.assertIn('pysvc_admission_max_in_flight{host="array1"} 2', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+
+    def test_textfile(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'pysvc.prom')
+            self.exporter.write_textfile(path)
+            with open(path) as f:
+                text = f.read()
+            self.assertIn('# TYPE pysvc_retries_total counter', text)
+            self.assertNotIn('# EOF', text)
+            self.assertEqual(['pysvc.prom'], os.listdir(root))
+        finally:
+            shutil.rmtree(root)
+
+    def test_serve(self):
+        port = self.exporter.serve(0)
+        req = Request('http://127.0.0.1:%d/metrics' % port,
+                      headers={'Accept': 'application/openmetrics-text'})
+        resp = urlopen(req, timeout=5)
+        self.assertEqual(CONTENT_TYPE_OPENMETRICS,
+                         resp.headers['Content-Type'])
+        self.assertIn(b'pysvc_cli_bytes_total', resp.read())
@@ -0,0 +1,89 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for bulk provisioning'''
+
+import os
+import threading
+from unittest import TestCase
+
+import mock
+import pysvc.unified.clispec as ucs
+from pysvc.unified.batch import TAG_BATCH
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.provision import provision, AdaptiveBackoff
+
+TEST_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPEC = ucs.parse(os.path.join(TEST_ROOT, 'response', 'svc-6.3.xml'))
+
+
+class TestProvision(TestCase):
+
+    def setUp(self):
+        self.conn = UnifiedSSHClient()
+        self.conn.specification = SPEC
+        self.conn.transport = mock.Mock()
+        self.conn.transport.send_command.side_effect = self.send_command
+        self.lock = threading.Lock()
+        self.seen = []
+
+    def send_command(self, script, **kwargs):
+        stdout, stderr = [], []
+        for i, part in enumerate(script.split('; ')[1::2]):
+            stdout.append('%s %d\n' % (TAG_BATCH, i))
+            with self.lock:
+                self.seen.append(part)
+                busy = 'vbusy' in part and self.seen.count(part) < 3
+            if busy:
+                stdout.append('%s %d\n' % (ucs.TAG_ERR, ucs.METADATA_RC_BUSY))
+                stderr.append('CMMVC6527E busy\n')
+            elif 'vbad' in part:
+                stdout.append('%s 1\n' % ucs.TAG_ERR)
+                stderr.append('CMMVC5707E bad\n')
+            elif 'mkvdisk ' in part:
+                stdout.append('Virtual Disk, id [%d], successfully created\n'
+                              % i)
+        return None, ''.join(stdout).encode(), ''.join(stderr).encode()
+
+    def test_provision(self):
+        names = ['v%d' % i for i in range(20)] + ['vbusy', 'vbad']
+        backoff = AdaptiveBackoff(sleep=mock.Mock())
+        report = provision(
+            self.conn,
+            volumes=[dict(name=n, mdiskgrp='p1', iogrp=0, size=1)
+                     for n in names],
+            mappings=[dict(host='h1', vdisk=n) for n in names],
+            max_workers=3, batch_size=4, backoff=backoff,
+            volume_command='mkvdisk')
+        self.assertEqual(42, len(report.succeeded))
+        self.assertEqual(
+            [('mkvdisk', 'vbad')],
+            [(name, spec['name']) for name, spec, _ in report.failed])
+        self.assertEqual([('mkvdiskhostmap', dict(host='h1', vdisk='vbad'))],
+                         report.skipped)
+        self.assertEqual(4, report.retries)
+        self.assertTrue(backoff.sleep.called)
+        self.assertFalse(report.ok)
+        self.assertTrue(report.ops_per_second > 0)
+
+    def test_backoff(self):
+        backoff = AdaptiveBackoff(initial=1, maximum=3)
+        backoff.on_busy()
+        backoff.on_busy()
+        backoff.on_busy()
+        self.assertEqual(3, backoff.delay)
+        backoff.on_success()
+        backoff.on_success()
+        self.assertEqual(0, backoff.delay)
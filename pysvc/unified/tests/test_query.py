@@ -0,0 +1,127 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for queries with filter pushdown'''
+
+from unittest import TestCase
+
+import mock
+from pysvc.errors import CommandTimeoutError
+import pysvc.unified.query as uq
+from pysvc.unified.client import connect
+from pysvc.unified.clispec import CLISpecError
+from pysvc.unified.fakeserver import FakeSVCServer, Inventory
+
+
+class TestPredicates(TestCase):
+
+    def test_split(self):
+        is_big = lambda c: int(c) > 0
+        expr, remaining = uq.split_predicates(
+            {'name': 'vdisk*', 'IO_group_id': 0, 'status': ['online'],
+             'capacity': is_big, 'vdisk_UID': 'a b', 'nope': 'x'},
+            {'name', 'IO_group_id', 'status', 'capacity', 'vdisk_UID'})
+        self.assertEqual('IO_group_id=0:name=vdisk*', expr)
+        self.assertEqual({'status': ['online'], 'capacity': is_big,
+                          'vdisk_UID': 'a b', 'nope': 'x'}, remaining)
+
+    def test_matches(self):
+        row = {'name': 'vdisk1', 'status': 'online', 'capacity': '10'}
+        self.assertTrue(uq.matches(row, {'name': 'vdisk*',
+                                         'status': ('online', 'degraded'),
+                                         'capacity': lambda c: int(c) > 5}))
+        self.assertFalse(uq.matches(row, {'status': 'offline'}))
+        self.assertFalse(uq.matches(row, {'nope': 'x'}))
+
+
+class TestWhere(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSVCServer(inventory=Inventory(
+            vdisks=20, pools=3, io_groups=2)).start()
+        s = cls.server
+        cls.conn = connect(s.host, port=s.port, username=s.username,
+                           password=s.password)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        cls.server.stop()
+
+    def setUp(self):
+        uq._filter_attributes.clear()
+
+    def test_pushdown(self):
+        conn = self.conn
+        expected = [v.name for v in conn.svcinfo.lsvdisk()
+                    if v.mdisk_grp_name == 'pool1' and
+                    v.name.startswith('vdisk1')]
+        with mock.patch.object(conn, 'send_raw_command',
+                               wraps=conn.send_raw_command) as send:
+            rows = conn.svcinfo.lsvdisk.where(
+                mdisk_grp_name='pool1', name='vdisk1*',
+                capacity=lambda c: c.endswith('GB'))
+            conn.svcinfo.lsvdisk.where(status='online')
+        self.assertEqual(expected, [v.name for v in rows])
+        cmds = [c[0][0] for c in send.call_args_list]
+        # the filter attributes are listed once
+        self.assertEqual(1, sum(1 for c in cmds if 'filtervalue?' in c))
+        self.assertIn("-filtervalue 'mdisk_grp_name=pool1:name=vdisk1*'",
+                      cmds[1])
+
+    def test_failed_probe(self):
+        conn = self.conn
+        send = conn.send_raw_command
+        lsvdisk = conn.svcinfo.lsvdisk.referent
+
+        def fail_probe(cmd, *args, **kwargs):
+            if 'filtervalue?' in cmd:
+                raise CommandTimeoutError(cmd)
+            return send(cmd, *args, **kwargs)
+        with mock.patch.object(conn, 'send_raw_command',
+                               side_effect=fail_probe):
+            self.assertEqual(frozenset(),
+                             uq.filter_attributes(conn, lsvdisk))
+        self.assertEqual(frozenset(), uq.filter_attributes(conn, lsvdisk))
+        # the probe is sent again once the failure expires
+        with mock.patch.object(uq, 'FAILED_PROBE_TTL', 0):
+            uq._filter_attributes.clear()
+            with mock.patch.object(conn, 'send_raw_command',
+                                   side_effect=fail_probe):
+                uq.filter_attributes(conn, lsvdisk)
+            self.assertIn('mdisk_grp_name',
+                          uq.filter_attributes(conn, lsvdisk))
+
+    def test_not_command(self):
+        self.assertRaises(CLISpecError, self.conn.svcinfo.where, name='x')
+
+    def test_partitioned(self):
+        lsvdisk = self.conn.svcinfo.lsvdisk
+        expected = lsvdisk(bytes=True).as_list
+        resp = lsvdisk.partitioned('mdisk_grp_id', bytes=True)
+        self.assertEqual(expected, resp.as_list)
+        # pool0, pool1, pool2 and "many"
+        self.assertEqual(4, len(resp.response))
+        resp = lsvdisk.partitioned('IO_group_id', values=[0, 1],
+                                   filtervalue='name=vdisk1*')
+        self.assertEqual(lsvdisk(filtervalue='name=vdisk1*').as_list,
+                         resp.as_list)
+
+    def test_not_partition(self):
+        self.assertRaises(CLISpecError, self.conn.svcinfo.lsvdisk.partitioned,
+                          'nope')
+        self.assertRaises(CLISpecError, self.conn.svcinfo.lsvdisk.partitioned,
+                          'IO_group_id', values=['0:name=x'])
@@ -0,0 +1,116 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for retry policies'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import mock
+import pysvc.unified.clispec as ucs
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.response import CLIFailureError
+from pysvc.unified.retry import RetryPolicy, RetryBudget, METADATA_RC_BUSY
+from .testdata import RESP_svcinfo_lsvdisk
+
+TEST_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPEC = ucs.parse(os.path.join(TEST_ROOT, 'response', 'svc-6.3.xml'))
+
+
+def busy():
+    return CLIFailureError('CMMVC6527E busy', returnCode=METADATA_RC_BUSY)
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_call(self):
+        sleep = mock.Mock()
+        policy = RetryPolicy(max_attempts=3, base_delay=1, jitter=0,
+                             sleep=sleep)
+        fn = mock.Mock(side_effect=[busy(), busy(), 'ok'])
+        self.assertEqual('ok', policy.call(fn))
+        self.assertEqual([mock.call(1), mock.call(2)], sleep.call_args_list)
+        self.assertEqual(2, policy.retries)
+
+        fn = mock.Mock(side_effect=CLIFailureError('CMMVC5707E bad',
+                                                   returnCode=1))
+        self.assertRaises(CLIFailureError, policy.call, fn)
+        self.assertEqual(1, fn.call_count)
+
+    def test_retryable_error_id(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable(
+            CLIFailureError('CMMVC5786E The action failed', returnCode=1)))
+        self.assertFalse(policy.is_retryable(ValueError('CMMVC5786E')))
+
+    def test_deadline(self):
+        policy = RetryPolicy(base_delay=5, jitter=0, sleep=mock.Mock(),
+                             clock=lambda: 100)
+        fn = mock.Mock(side_effect=busy())
+        self.assertRaises(CLIFailureError, policy.call, fn, deadline=102)
+        self.assertEqual(1, fn.call_count)
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, max_tokens=1)
+        policy = RetryPolicy(max_attempts=5, sleep=mock.Mock(), budget=budget)
+        fn = mock.Mock(side_effect=busy())
+        self.assertRaises(CLIFailureError, policy.call, fn)
+        # one retry is paid by the initial token
+        self.assertEqual(2, fn.call_count)
+        self.assertEqual(1, budget.exhausted)
+
+    def test_submit(self):
+        policy = RetryPolicy(base_delay=0.01, jitter=0)
+        fn = mock.Mock(side_effect=[busy(), 'ok'])
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual('ok', policy.submit(fn, executor).result(5))
+        self.assertEqual(2, fn.call_count)
+
+    def test_submit_after_shutdown(self):
+        policy = RetryPolicy(base_delay=0.1, jitter=0)
+        fn = mock.Mock(side_effect=[busy(), 'ok'])
+        with ThreadPoolExecutor(1) as executor:
+            future = policy.submit(fn, executor)
+        # the executor is shut down before the retry timer fires
+        self.assertEqual('ok', future.result(5))
+        self.assertEqual(2, fn.call_count)
+
+
+class TestClientRetry(TestCase):
+
+    def setUp(self):
+        self.conn = UnifiedSSHClient()
+        self.conn.specification = SPEC
+        self.conn.transport = mock.Mock()
+        self.conn.transport.send_command.side_effect = [
+            (None, ('%s %d\n' % (ucs.TAG_ERR, METADATA_RC_BUSY)).encode(),
+             b'CMMVC6527E busy\n'),
+            (None, RESP_svcinfo_lsvdisk.encode(), b'')]
+
+    def test_retry_policy(self):
+        sleep = mock.Mock()
+        self.conn.retry_policy = RetryPolicy(sleep=sleep)
+        resp = self.conn.svcinfo.lsvdisk()
+        self.assertEqual(4, len(resp.as_list))
+        self.assertEqual(1, sleep.call_count)
+
+    def test_submit(self):
+        self.conn.retry_policy = RetryPolicy(base_delay=0.01)
+        with ThreadPoolExecutor(1) as executor:
+            resp = self.conn.submit(executor,
+                                    self.conn.svcinfo.lsvdisk).result(5)
+        self.assertEqual(4, len(resp.as_list))
+        self.assertEqual(2, self.conn.transport.send_command.call_count)
@@ -0,0 +1,71 @@
+##############################################################################
+# Copyright 2025 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##############################################################################
+'''Test for coalescing of identical concurrent commands'''
+
+import threading
+import time
+from unittest import TestCase
+
+import mock
+from pysvc.unified.client import UnifiedSSHClient
+from pysvc.unified.singleflight import SingleFlight
+
+
+class TestSingleFlight(TestCase):
+
+    def setUp(self):
+        self.conn = UnifiedSSHClient()
+        self.conn.single_flight = SingleFlight()
+        self.conn.transport = mock.Mock()
+        self.release = threading.Event()
+
+        def send_command(cmd, **kwargs):
+            self.release.wait(5)
+            return None, cmd.encode(), b''
+        self.conn.transport.send_command.side_effect = send_command
+
+    def run_threads(self, cmds):
+        results = [None] * len(cmds)
+
+        def run(i):
+            results[i] = self.conn.send_raw_command(cmds[i])
+        threads = [threading.Thread(target=run, args=(i,))
+                   for i in range(len(cmds))]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        self.release.set()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_coalesce_read_only(self):
+        cmds = ['svcinfo lssystem'] * 8 + ['svcinfo lsvdisk'] * 2
+        results = self.run_threads(cmds)
+        self.assertEqual([(c.encode(), b'') for c in cmds], results)
+        self.assertEqual(2, self.conn.transport.send_command.call_count)
+        self.assertEqual(8, self.conn.single_flight.coalesced)
+        self.assertFalse(self.conn.single_flight.calls)
+
+    def test_not_coalesce_mutation(self):
+        self.run_threads(['svctask rmvdisk 1'] * 3)
+        self.assertEqual(3, self.conn.transport.send_command.call_count)
+
+    def test_share_error(self):
+        self.conn.transport.send_command.side_effect = RuntimeError('x')
+        self.assertRaises(RuntimeError, self.conn.send_raw_command,
+                          'svcinfo lssystem')
+        self.assertFalse(self.conn.single_flight.calls)
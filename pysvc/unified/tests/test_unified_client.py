@@ -28,6 +28,7 @@ except ImportError:
 import mock
 from nose.plugins.attrib import attr
 from pysvc.unified import connect
+import pysvc.errors as ce
 import pysvc.unified.client as uc
 import pysvc.unified.clispec as ucs
 import pysvc.unified.response as ucr
@@ -562,6 +563,32 @@ class TestMisc(TestCase):
         self.assertRaises(IOError, uc.get_cli_spec, 'svc', '5.2')
         self.assertRaises(IOError, uc.get_cli_spec, 'svc', '7.1')
 
+    def test_proxy_cache(self):
+        conn = UnifiedSSHClient()
+        conn.specification = ucs.parse(getpath('response/svc-6.3.xml'))
+        lsvdisk = conn.svcinfo.lsvdisk
+        self.assertTrue(lsvdisk is conn.svcinfo.lsvdisk)
+        self.assertEqual(lsvdisk.referent.__doc__, lsvdisk.__doc__)
+        self.assertEqual(dir(conn.specification.svcinfo), dir(conn.svcinfo))
+        self.assertRaises(AttributeError, getattr, conn.svcinfo, 'notexists')
+        conn.specification = ucs.parse(getpath('response/svc-6.2.xml'))
+        self.assertFalse(lsvdisk is conn.svcinfo.lsvdisk)
+
+    def test_replay(self):
+        conn = UnifiedSSHClient()
+        conn.specification = ucs.parse(getpath('response/svc-6.3.xml'))
+        conn.transport = mock.Mock(auto_reconnect=True)
+        conn.transport.ensure_alive.return_value = True
+        dead = ce.UnableToConnectException('Socket is closed')
+        conn.transport.send_command.side_effect = [
+            dead, (None, RESP_svcinfo_lsvdisk.encode(), b'')]
+        self.assertEqual(4, len(conn.svcinfo.lsvdisk().as_list))
+
+        conn.transport.send_command.side_effect = [dead, (None, b'', b'')]
+        self.assertRaises(ce.UnableToConnectException,
+                          conn.svctask.rmvdisk, vdisk_id='1')
+        self.assertEqual(2, conn.transport.ensure_alive.call_count)
+
     def test_escape_shell_arg(self):
         self.assertEqual('a12bZ', ucs.escape_shell_arg('a12bZ'))
         self.assertEqual("'a12 bZ'", ucs.escape_shell_arg('a12 bZ'))